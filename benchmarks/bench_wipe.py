@@ -0,0 +1,46 @@
+"""
+Benchmark of the wipe throughput of :func:`pyaescbc.wipe_bytearray` and :func:`pyaescbc.delete_bytearray`.
+
+Run it from the root of the repository:
+
+.. code-block:: console
+
+    python benchmarks/bench_wipe.py
+"""
+import os
+import time
+
+import pyaescbc
+
+SIZES = [1_024, 1_048_576, 16_777_216, 104_857_600]
+METHODS = ["random", "zero", "multipass"]
+REPEAT = 3
+
+def legacy_delete_bytearray(barray: bytearray) -> None:
+    """ The per-byte overwrite used before the wipe engine, kept as a reference. """
+    for index in range(len(barray)):
+        barray[index] = os.urandom(1)[0]
+    barray.clear()
+
+def best_time(function, size: int) -> float:
+    """ Returns the best wall-clock time of ``function`` over ``REPEAT`` fresh buffers of ``size`` bytes. """
+    best = float("inf")
+    for _ in range(REPEAT):
+        barray = bytearray(size)
+        start = time.perf_counter()
+        function(barray)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    print(f"{'method':<12}{'size':>14}{'time [s]':>12}{'GB/s':>10}")
+    for size in SIZES:
+        for method in METHODS:
+            elapsed = best_time(lambda barray: pyaescbc.delete_bytearray(barray, method=method), size)
+            print(f"{method:<12}{size:>14}{elapsed:>12.6f}{size / elapsed / 1e9:>10.3f}")
+        if size <= 1_048_576:
+            elapsed = best_time(legacy_delete_bytearray, size)
+            print(f"{'legacy':<12}{size:>14}{elapsed:>12.6f}{size / elapsed / 1e9:>10.3f}")
+
+if __name__ == "__main__":
+    main()
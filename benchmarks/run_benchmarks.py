@@ -0,0 +1,245 @@
+"""
+Benchmark suite of the ``pyaescbc`` bundle pipeline.
+
+Each stage of the pipeline is timed on its own (package import in a fresh interpreter, key derivation, AES-CBC, HMAC, wipe, bundle assembly and extraction)
+and together (full ``encrypt``/``decrypt`` round trips). The best time over ``--repeat`` runs is kept for each case.
+The results can be saved as JSON and compared with a previous run to detect regressions.
+
+Run it from the root of the repository, once the package is installed (``pip install -e .``):
+
+.. code-block:: console
+
+    # Quick run (payloads up to 16 MiB) saved as JSON
+    python benchmarks/run_benchmarks.py --output bench_0.1.5.json
+
+    # Full run up to 1 GiB, compared with a previous release, failing on a slowdown of more than 20 %
+    python benchmarks/run_benchmarks.py --max-size 1G --compare bench_0.1.5.json --threshold 0.2
+
+The exit code is 1 if at least one case is slower than the baseline by more than the threshold.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pyaescbc
+
+SIZES = [16, 1_024, 65_536, 1_048_576, 16_777_216, 268_435_456, 1_073_741_824]
+ITERATIONS = [1_000, 10_000, 100_000, 1_000_000]
+ROUND_TRIP_ITERATIONS = 1_000  # Low on purpose, the KDF cost is measured by the derive_key cases
+
+def parse_size(text: str) -> int:
+    """ Parses a size such as ``4096``, ``64K``, ``16M`` or ``1G`` (powers of 1024). """
+    units = {"K": 1_024, "M": 1_048_576, "G": 1_073_741_824}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def best_time(setup: Callable[[], tuple], function: Callable, repeat: int) -> float:
+    """ Returns the best wall-clock time of ``function(*setup())`` over ``repeat`` runs, the setup being excluded. """
+    best = float("inf")
+    for _ in range(repeat):
+        arguments = setup()
+        start = time.perf_counter()
+        function(*arguments)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def import_time(module: str) -> float:
+    """ Returns the cumulative import time of ``module`` in a fresh interpreter, read from ``python -X importtime``. """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        self_time, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1e6
+    raise RuntimeError(f"{module} not found in the import times.")
+
+def bench_import(repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    yield "import[pyaescbc]", lambda: min(import_time("pyaescbc") for _ in range(repeat)), None
+
+def bench_derive_key(iterations_list: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    password, salt = pyaescbc.random_bytearray(32), pyaescbc.random_salt()
+    for iterations in iterations_list:
+        yield f"derive_key[iterations={iterations}]", lambda: best_time(lambda: (password, salt, iterations), pyaescbc.derive_key, repeat), None
+        yield f"derive_key_v2[iterations={iterations}]", lambda: best_time(lambda: (password, salt, iterations), pyaescbc.derive_key_v2, repeat), None
+
+def bench_pbkdf2_blocks(iterations_list: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    """ PBKDF2-SHA256 by number of 32-byte output blocks, derive_key computes 2 blocks. """
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    password, salt = bytes(pyaescbc.random_bytearray(32)), bytes(pyaescbc.random_salt())
+    for iterations in iterations_list:
+        for blocks in (1, 2):
+            derive = lambda: PBKDF2HMAC(hashes.SHA256(), 32 * blocks, salt, iterations).derive(password)
+            yield f"pbkdf2[blocks={blocks},iterations={iterations}]", lambda: best_time(tuple, derive, repeat), None
+
+def bench_aes(sizes: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    aes_key, iv = pyaescbc.random_bytearray(32), pyaescbc.random_iv()
+    for size in sizes:
+        cleardata = pyaescbc.random_bytearray(size)
+        yield f"encrypt_AES_CBC[size={size}]", lambda: best_time(lambda: (cleardata, aes_key, iv), pyaescbc.encrypt_AES_CBC, repeat), size
+        cipherdata = pyaescbc.encrypt_AES_CBC(cleardata, aes_key, iv)
+        del cleardata
+        yield f"decrypt_AES_CBC[size={size}]", lambda: best_time(lambda: (cipherdata, aes_key, iv), pyaescbc.decrypt_AES_CBC, repeat), size
+        workers = os.cpu_count() or 1
+        yield (
+            f"decrypt_AES_CBC[workers={workers},size={size}]",
+            lambda: best_time(lambda: (cipherdata, aes_key, iv, workers), pyaescbc.decrypt_AES_CBC, repeat),
+            size,
+        )
+        del cipherdata
+
+def bench_hmac(sizes: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    hmac_key, iv = pyaescbc.random_bytearray(32), pyaescbc.random_iv()
+    for size in sizes:
+        cipherdata = pyaescbc.random_bytearray(size)
+        yield f"create_hmac[size={size}]", lambda: best_time(lambda: (hmac_key, iv, cipherdata), pyaescbc.create_hmac, repeat), size
+        del cipherdata
+
+def bench_delete_bytearray(sizes: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    for size in sizes:
+        for method in ("random", "zero"):
+            yield (
+                f"delete_bytearray[method={method},size={size}]",
+                lambda: best_time(lambda: (bytearray(size),), lambda barray: pyaescbc.delete_bytearray(barray, method=method), repeat),
+                size,
+            )
+
+def bench_bundle(sizes: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    iv, salt, expected_hmac = pyaescbc.random_iv(), pyaescbc.random_salt(), pyaescbc.random_bytearray(32)
+    for size in sizes:
+        cipherdata = pyaescbc.random_bytearray(size)
+        yield f"create_encrypted_bundle[size={size}]", lambda: best_time(lambda: (iv, salt, expected_hmac, cipherdata), pyaescbc.create_encrypted_bundle, repeat), size
+        encrypted_bundle = pyaescbc.create_encrypted_bundle(iv, salt, expected_hmac, cipherdata)
+        del cipherdata
+        yield f"extract_cryptography_components[size={size}]", lambda: best_time(lambda: (encrypted_bundle,), pyaescbc.extract_cryptography_components, repeat), size
+        del encrypted_bundle
+
+def bench_chunked(sizes: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    """ Chunked encryption in 1 MiB chunks, by the calling thread and on a pool of one thread per CPU. """
+    import io
+    workers = os.cpu_count() or 1
+    for size in sizes:
+        cleardata = bytes(pyaescbc.random_bytearray(size))
+        setup = lambda: (io.BytesIO(cleardata), io.BytesIO(), bytearray(b"password"), ROUND_TRIP_ITERATIONS)
+        for max_workers in (None, workers):
+            yield (
+                f"encrypt_chunked_stream[workers={max_workers or 0},size={size}]",
+                lambda: best_time(setup, lambda *args: pyaescbc.encrypt_chunked_stream(*args, chunk_size=1_048_576, max_workers=max_workers), repeat),
+                size,
+            )
+        del cleardata
+
+def bench_log(sizes: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    """ Append of one record to an encrypted log opened once, and replay of 100 records. """
+    import tempfile
+    directory = tempfile.mkdtemp()
+    for size in sizes:
+        log = pyaescbc.EncryptedLog(os.path.join(directory, f"log-{size}.aes"), bytearray(b"password"), ROUND_TRIP_ITERATIONS)
+        cleardata = pyaescbc.random_bytearray(size)
+        yield f"EncryptedLog.append[size={size}]", lambda: best_time(lambda: (cleardata.copy(),), log.append, repeat), size
+        if size <= 1_048_576:
+            for _ in range(100 - len(log)):
+                log.append(cleardata.copy())
+            yield f"EncryptedLog.replay[records=100,size={size}]", lambda: best_time(tuple, lambda: sum(1 for _ in log.replay()), repeat), 100 * size
+        log.close()
+        os.remove(log.path)
+    os.rmdir(directory)
+
+def bench_round_trip(sizes: List[int], repeat: int) -> Iterator[Tuple[str, Callable[[], float], Optional[int]]]:
+    for size in sizes:
+        cleardata = pyaescbc.random_bytearray(size)
+        setup = lambda: (cleardata.copy(), bytearray(b"password"), ROUND_TRIP_ITERATIONS)
+        yield f"encrypt[size={size}]", lambda: best_time(setup, pyaescbc.encrypt, repeat), size
+        encrypted_bundle = pyaescbc.encrypt(cleardata, bytearray(b"password"), ROUND_TRIP_ITERATIONS)
+        setup = lambda: (encrypted_bundle.copy(), bytearray(b"password"), ROUND_TRIP_ITERATIONS)
+        yield f"decrypt[size={size}]", lambda: best_time(setup, pyaescbc.decrypt, repeat), size
+        del encrypted_bundle
+
+def run(sizes: List[int], iterations_list: List[int], repeat: int, pattern: str) -> Dict[str, dict]:
+    """ Runs all the benchmarks whose name matches ``pattern`` and returns the results by name. """
+    benchmarks = [
+        bench_import(repeat),
+        bench_derive_key(iterations_list, repeat),
+        bench_pbkdf2_blocks(iterations_list, repeat),
+        bench_aes(sizes, repeat),
+        bench_hmac(sizes, repeat),
+        bench_delete_bytearray(sizes, repeat),
+        bench_bundle(sizes, repeat),
+        bench_chunked(sizes, repeat),
+        bench_log(sizes, repeat),
+        bench_round_trip(sizes, repeat),
+    ]
+    results = {}
+    for benchmark in benchmarks:
+        for name, measure, size in benchmark:
+            if not fnmatch.fnmatch(name, pattern):
+                continue
+            seconds = measure()
+            result = {"seconds": seconds}
+            if size is not None:
+                result["bytes"] = size
+                result["MB_per_s"] = size / seconds / 1e6 if seconds > 0 else float("inf")
+            results[name] = result
+            throughput = f"{result['MB_per_s']:12.1f} MB/s" if size is not None else ""
+            print(f"{name:<55}{seconds:>14.6f} s{throughput}", flush=True)
+    return results
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """ Returns the names of the cases slower than the baseline by more than ``threshold`` (0.2 = 20 %). """
+    regressions = []
+    print(f"\n{'case':<55}{'baseline [s]':>14}{'current [s]':>14}{'ratio':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["seconds"] / baseline[name]["seconds"] if baseline[name]["seconds"] > 0 else 1.0
+        flag = "  REGRESSION" if ratio > 1.0 + threshold else ""
+        print(f"{name:<55}{baseline[name]['seconds']:>14.6f}{result['seconds']:>14.6f}{ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite of the pyaescbc bundle pipeline.")
+    parser.add_argument("--max-size", default="16M", help="Largest payload size, from 16 B up to 1G. Default is 16M.")
+    parser.add_argument("--iterations", type=int, nargs="+", default=ITERATIONS[:3], help="PBKDF2 iteration counts for derive_key.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs per case, the best time is kept. Default is 3.")
+    parser.add_argument("--filter", default="*", help="Glob pattern on the case names, for example 'derive_key*'.")
+    parser.add_argument("--output", help="Path of the JSON file receiving the results.")
+    parser.add_argument("--compare", help="Path of a JSON file of a previous run to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown ratio before failing. Default is 0.2 (20 %%).")
+    args = parser.parse_args(argv)
+
+    max_size = parse_size(args.max_size)
+    sizes = [size for size in SIZES if size <= max_size]
+    results = run(sizes, args.iterations, args.repeat, args.filter)
+
+    if args.output:
+        report = {
+            "pyaescbc": pyaescbc.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}.", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,46 +12,175 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
+import sys
+import types
+from typing import Any, List
+
 from .__version__ import __version__
 
-from .decrypt_AES_CBC import decrypt_AES_CBC
-from .derive_key import derive_key
-from .encrypt_AES_CBC import encrypt_AES_CBC
+# The public names are imported on first access, so ``import pyaescbc`` does not load the cryptography backend
+# Name -> (submodule, attribute of the submodule)
+_LAZY_NAMES = {
+    "decrypt_AES_CBC": ("decrypt_AES_CBC", "decrypt_AES_CBC"),
+    "derive_key": ("derive_key", "derive_key"),
+    "derive_key_v2": ("derive_key_v2", "derive_key_v2"),
+    "KeyCache": ("key_cache", "KeyCache"),
+    "encrypt_AES_CBC": ("encrypt_AES_CBC", "encrypt_AES_CBC"),
+    "encrypt_AES_CBC_into": ("encrypt_AES_CBC_into", "encrypt_AES_CBC_into"),
+    "decrypt_AES_CBC_into": ("decrypt_AES_CBC_into", "decrypt_AES_CBC_into"),
+    "encrypt_AES_CBC_HMAC_into": ("encrypt_AES_CBC_HMAC_into", "encrypt_AES_CBC_HMAC_into"),
+    "decrypt_AES_CBC_HMAC_into": ("decrypt_AES_CBC_HMAC_into", "decrypt_AES_CBC_HMAC_into"),
+
+    "cleardata_to_encrypted_bundle": ("cleardata_to_encrypted_bundle", "cleardata_to_encrypted_bundle"),
+    "encrypt": ("cleardata_to_encrypted_bundle", "cleardata_to_encrypted_bundle"),
+    "encrypted_bundle_to_cleardata": ("encrypted_bundle_to_cleardata", "encrypted_bundle_to_cleardata"),
+    "decrypt": ("encrypted_bundle_to_cleardata", "encrypted_bundle_to_cleardata"),
+    "derive_key_hkdf": ("derive_key_hkdf", "derive_key_hkdf"),
+    "cleardata_to_encrypted_bundle_with_key": ("cleardata_to_encrypted_bundle_with_key", "cleardata_to_encrypted_bundle_with_key"),
+    "encrypted_bundle_to_cleardata_with_key": ("encrypted_bundle_to_cleardata_with_key", "encrypted_bundle_to_cleardata_with_key"),
+
+    "Session": ("session", "Session"),
+    "EncryptedLog": ("encrypted_log", "EncryptedLog"),
+
+    "async_encrypt": ("async_encrypt", "async_encrypt"),
+    "async_decrypt": ("async_decrypt", "async_decrypt"),
+
+    "encrypt_many": ("encrypt_many", "encrypt_many"),
+    "decrypt_many": ("decrypt_many", "decrypt_many"),
+
+    "encrypt_stream": ("encrypt_stream", "encrypt_stream"),
+    "decrypt_stream": ("decrypt_stream", "decrypt_stream"),
+    "verify_stream": ("verify_stream", "verify_stream"),
+    "verify_bundle": ("verify_bundle", "verify_bundle"),
+    "audit_bundles": ("audit_bundles", "audit_bundles"),
+    "encrypt_file": ("encrypt_file", "encrypt_file"),
+    "decrypt_file": ("decrypt_file", "decrypt_file"),
+    "open_bundle": ("open_bundle", "open_bundle"),
+    "encrypt_path": ("encrypt_path", "encrypt_path"),
+    "decrypt_path": ("decrypt_path", "decrypt_path"),
+    "encrypt_tree": ("encrypt_tree", "encrypt_tree"),
+    "decrypt_tree": ("decrypt_tree", "decrypt_tree"),
+    "encrypt_chunked_stream": ("encrypt_chunked_stream", "encrypt_chunked_stream"),
+    "decrypt_chunked_stream": ("decrypt_chunked_stream", "decrypt_chunked_stream"),
+    "decrypt_range": ("decrypt_range", "decrypt_range"),
+
+    "create_encrypted_bundle": ("create_encrypted_bundle", "create_encrypted_bundle"),
+    "extract_cryptography_components": ("extract_cryptography_components", "extract_cryptography_components"),
+    "allocate_encrypted_bundle": ("allocate_encrypted_bundle", "allocate_encrypted_bundle"),
+    "extract_cryptography_views": ("extract_cryptography_views", "extract_cryptography_views"),
+    "BundleHeader": ("bundle_header", "BundleHeader"),
+    "KDF_PBKDF2_SHA256": ("bundle_header", "KDF_PBKDF2_SHA256"),
+    "KDF_HKDF_SHA256": ("bundle_header", "KDF_HKDF_SHA256"),
+    "KDF_PBKDF2_HKDF_SHA256": ("bundle_header", "KDF_PBKDF2_HKDF_SHA256"),
+    "FLAG_CHUNKED": ("bundle_header", "FLAG_CHUNKED"),
+    "FLAG_LOG": ("bundle_header", "FLAG_LOG"),
+    "read_bundle_header": ("read_bundle_header", "read_bundle_header"),
+
+    "generate_random_iterations": ("generate_random_iterations", "generate_random_iterations"),
+    "generate_pin_iterations": ("generate_pin_iterations", "generate_pin_iterations"),
+    "calibrate_iterations": ("calibrate_iterations", "calibrate_iterations"),
+
+    "random_bytearray": ("random_bytearray", "random_bytearray"),
+    "random_iv": ("random_iv", "random_iv"),
+    "random_salt": ("random_salt", "random_salt"),
+
+    "create_hmac": ("create_hmac", "create_hmac"),
+    "check_hmac": ("check_hmac", "check_hmac"),
+    "AuthError": ("auth_error", "AuthError"),
+
+    "delete_bytearray": ("delete_bytearray", "delete_bytearray"),
+    "wipe_bytearray": ("wipe_bytearray", "wipe_bytearray"),
+
+    "StageEvent": ("instrumentation", "StageEvent"),
+    "StageCollector": ("instrumentation", "StageCollector"),
+    "register_stage_hook": ("instrumentation", "register_stage_hook"),
+    "unregister_stage_hook": ("instrumentation", "unregister_stage_hook"),
+    "enable_counters": ("instrumentation", "enable_counters"),
+    "get_counters": ("instrumentation", "get_counters"),
+    "reset_counters": ("instrumentation", "reset_counters"),
+}
 
-from .cleardata_to_encrypted_bundle import cleardata_to_encrypted_bundle
-encrypt = cleardata_to_encrypted_bundle
-from .encrypted_bundle_to_cleardata import encrypted_bundle_to_cleardata
-decrypt = encrypted_bundle_to_cleardata
+def __getattr__(name: str) -> Any:
+    """ Imports the submodule of a public name on first access and caches the name in the package. """
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _LAZY_NAMES[name]
+    value = getattr(importlib.import_module(f".{module}", __name__), attribute)
+    globals()[name] = value
+    return value
 
-from .create_encrypted_bundle import create_encrypted_bundle
-from .extract_cryptography_components import extract_cryptography_components
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
 
-from .generate_random_iterations import generate_random_iterations
-from .generate_pin_iterations import generate_pin_iterations
+class _LazyModule(types.ModuleType):
+    """
+    Module type of the package, keeping the public functions visible when their submodule is imported.
 
-from .random_bytearray import random_bytearray
-from .random_iv import random_iv
-from .random_salt import random_salt
+    Importing the submodule ``pyaescbc.derive_key`` binds the attribute ``derive_key`` of the package to the submodule,
+    which would hide the function of the same name. These bindings are dropped, so the function is resolved by ``__getattr__``.
+    """
 
-from .create_hmac import create_hmac
-from .check_hmac import check_hmac
-from .auth_error import AuthError
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _LAZY_NAMES and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
 
-from .delete_bytearray import delete_bytearray
+sys.modules[__name__].__class__ = _LazyModule
 
 __all__ = [
     "__version__",
     "decrypt_AES_CBC",
     "derive_key",
+    "derive_key_v2",
+    "KeyCache",
     "encrypt_AES_CBC",
+    "encrypt_AES_CBC_into",
+    "decrypt_AES_CBC_into",
+    "encrypt_AES_CBC_HMAC_into",
+    "decrypt_AES_CBC_HMAC_into",
     "cleardata_to_encrypted_bundle",
     "encrypt",
     "encrypted_bundle_to_cleardata",
     "decrypt",
+    "derive_key_hkdf",
+    "cleardata_to_encrypted_bundle_with_key",
+    "encrypted_bundle_to_cleardata_with_key",
+    "Session",
+    "EncryptedLog",
+    "async_encrypt",
+    "async_decrypt",
+    "encrypt_many",
+    "decrypt_many",
+    "encrypt_stream",
+    "decrypt_stream",
+    "verify_stream",
+    "verify_bundle",
+    "audit_bundles",
+    "encrypt_file",
+    "decrypt_file",
+    "open_bundle",
+    "encrypt_path",
+    "decrypt_path",
+    "encrypt_tree",
+    "decrypt_tree",
+    "encrypt_chunked_stream",
+    "decrypt_chunked_stream",
+    "decrypt_range",
     "create_encrypted_bundle",
     "extract_cryptography_components",
+    "allocate_encrypted_bundle",
+    "extract_cryptography_views",
+    "BundleHeader",
+    "KDF_PBKDF2_SHA256",
+    "KDF_HKDF_SHA256",
+    "KDF_PBKDF2_HKDF_SHA256",
+    "FLAG_CHUNKED",
+    "FLAG_LOG",
+    "read_bundle_header",
     "generate_random_iterations",
     "generate_pin_iterations",
+    "calibrate_iterations",
     "random_bytearray",
     "random_iv",
     "random_salt",
@@ -59,6 +188,14 @@ __all__ = [
     "check_hmac",
     "AuthError",
     "delete_bytearray",
+    "wipe_bytearray",
+    "StageEvent",
+    "StageCollector",
+    "register_stage_hook",
+    "unregister_stage_hook",
+    "enable_counters",
+    "get_counters",
+    "reset_counters",
 ]
 
 
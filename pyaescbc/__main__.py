@@ -12,18 +12,372 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import argparse
+import contextlib
+import getpass
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .__version__ import __version__
+from .encrypt_stream import encrypt_stream
+from .decrypt_stream import decrypt_stream
+from .verify_stream import verify_stream
+from .derive_key import derive_key
+from .encrypt_AES_CBC import encrypt_AES_CBC
+from .decrypt_AES_CBC import decrypt_AES_CBC
+from .create_hmac import create_hmac
+from .calibrate_iterations import calibrate_iterations
+from .random_bytearray import random_bytearray
+from .random_iv import random_iv
+from .random_salt import random_salt
+from .delete_bytearray import delete_bytearray
+from .instrumentation import StageCollector
+from .auth_error import AuthError
+from ._atomic import atomic_output
+from .encrypt_tree import encrypt_tree
+from .decrypt_tree import decrypt_tree
+
+PASSWORD_ENV = "PYAESCBC_PASSWORD"  # Environment variable read when no password source is given
+SUFFIX = ".aes"
+
+class _CountingReader:
+    """ Wrapper of a binary stream counting the bytes read through ``read`` and ``readinto``. """
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.count += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        size = self.stream.readinto(buffer) or 0
+        self.count += size
+        return size
+
+    def seekable(self) -> bool:
+        return self.stream.seekable()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self.stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.stream.tell()
+
+def _parse_size(text: str) -> int:
+    """ Parses a size such as ``4096``, ``64K``, ``16M`` or ``1G`` (powers of 1024). """
+    units = {"K": 1_024, "M": 1_048_576, "G": 1_073_741_824}
+    text = text.strip().upper()
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}") from None
+
+def _read_password(args: argparse.Namespace) -> bytearray:
+    """ Reads the password from a file descriptor, an environment variable or the terminal (in this order). """
+    if args.password_fd is not None:
+        # Read up to the first newline, so the fd can be a pipe shared with other data
+        password = bytearray()
+        while True:
+            byte = os.read(args.password_fd, 1)
+            if byte in (b"", b"\n"):
+                break
+            password += byte
+        if password.endswith(b"\r"):
+            del password[-1:]
+    elif args.password_env is not None or PASSWORD_ENV in os.environ:
+        name = args.password_env if args.password_env is not None else PASSWORD_ENV
+        if name not in os.environ:
+            raise ValueError(f"The environment variable {name} is not set.")
+        password = bytearray(os.environ[name], 'utf-8')
+    elif sys.stdin.isatty():
+        password = bytearray(getpass.getpass("Password: "), 'utf-8')
+    else:
+        raise ValueError(f"No password given, use --password-fd, --password-env or the {PASSWORD_ENV} environment variable.")
+    if len(password) == 0:
+        raise ValueError("The password must not be empty.")
+    return password
+
+@contextlib.contextmanager
+def _open_input(source: str, seekable: bool) -> Iterator[BinaryIO]:
+    """ Opens an input file, ``-`` being the standard input (spooled to a temporary file if it must be seekable). """
+    if source != "-":
+        with open(source, "rb") as stream:
+            yield stream
+    elif not seekable:
+        yield sys.stdin.buffer
+    else:
+        # Only encrypted data is spooled, so no clear data is written on the disk
+        with tempfile.TemporaryFile() as stream:
+            shutil.copyfileobj(sys.stdin.buffer, stream)
+            stream.seek(0)
+            yield stream
+
+@contextlib.contextmanager
+def _open_output(target: str, seekable: bool, force: bool) -> Iterator[BinaryIO]:
+    """
+    Opens an output file written atomically: the data goes to a temporary file of the same directory,
+    which replaces the target only on success. ``-`` is the standard output (through a temporary file if it must be seekable).
+    """
+    if target == "-":
+        if not seekable:
+            yield sys.stdout.buffer
+            sys.stdout.buffer.flush()
+        else:
+            # Only encrypted data is spooled, so no clear data is written on the disk
+            with tempfile.TemporaryFile() as stream:
+                yield stream
+                stream.seek(0)
+                shutil.copyfileobj(stream, sys.stdout.buffer)
+                sys.stdout.buffer.flush()
+        return
+    try:
+        with atomic_output(target, overwrite=force) as stream:
+            yield stream
+    except FileExistsError:
+        raise FileExistsError(f"{target} already exists, use --force to overwrite it.") from None
+
+def _targets(parser: argparse.ArgumentParser, args: argparse.Namespace) -> List[Tuple[str, Optional[str]]]:
+    """ Returns the (input, output) pairs of the command, the output being None for ``verify``. """
+    if args.inputs.count("-") > 1:
+        parser.error("the standard input '-' can only be given once")
+    if args.command == "verify":
+        return [(source, None) for source in args.inputs]
+    if args.output is not None:
+        if len(args.inputs) != 1:
+            parser.error("--output requires a single input")
+        return [(args.inputs[0], args.output)]
+    pairs = []
+    for source in args.inputs:
+        if source == "-":
+            pairs.append((source, "-"))
+        elif args.command == "encrypt":
+            pairs.append((source, source + args.suffix))
+        elif source.endswith(args.suffix) and len(source) > len(args.suffix):
+            pairs.append((source, source[:-len(args.suffix)]))
+        else:
+            parser.error(f"{source} does not end with {args.suffix}, use --output or --suffix")
+    return pairs
+
+# Stages printed by --timings, with the instrumented stages they aggregate
+TIMED_STAGES = (("kdf", ("derive_key", "derive_key_v2")), ("aes", ("stream_AES_CBC",)), ("hmac", ("stream_HMAC",)), ("io", ("stream_io",)))
+
+def _run_one(args: argparse.Namespace, password: bytearray, source: str, target: Optional[str]) -> Tuple[int, Dict[str, float], float]:
+    """ Runs the command on one input and returns the number of clear (or encrypted for verify) bytes, the seconds of each stage and the total time. """
+    start = time.perf_counter()
+    with StageCollector() as collector:
+        if args.command == "encrypt":
+            with _open_input(source, seekable=False) as input_stream, _open_output(target, seekable=True, force=args.force) as output_stream:
+                reader = _CountingReader(input_stream)
+                encrypt_stream(reader, output_stream, password, args.iterations, chunk_size=args.chunk_size, delete_keys=False, versioned=not args.legacy)
+                size = reader.count
+        elif args.command == "decrypt":
+            with _open_input(source, seekable=True) as input_stream, _open_output(target, seekable=False, force=args.force) as output_stream:
+                size = decrypt_stream(input_stream, output_stream, password, args.iterations, chunk_size=args.chunk_size, delete_keys=False)
+        else:
+            with _open_input(source, seekable=False) as input_stream:
+                reader = _CountingReader(input_stream)
+                if not verify_stream(reader, password, args.iterations, chunk_size=args.chunk_size, delete_keys=False):
+                    raise AuthError("The HMAC is not valid. The data has been tampered with or the password is incorrect.")
+                size = reader.count
+    summary = collector.summary()
+    stages = {name: sum(summary[stage]["seconds"] for stage in names if stage in summary) for name, names in TIMED_STAGES}
+    return size, stages, time.perf_counter() - start
+
+def _print_timings(name: str, size: int, stages: Dict[str, float], total: float) -> None:
+    """ Prints the time of each stage of one input (one line per stage) on the standard error. """
+    for stage, seconds in stages.items():
+        # The key derivation does not depend on the size of the data
+        throughput = "" if stage == "kdf" or seconds <= 0 else f" ({size / seconds / 1e6:.1f} MB/s)"
+        print(f"{name}: {stage:<5} {seconds:>10.6f} s{throughput}", file=sys.stderr)
+    print(f"{name}: {'total':<5} {total:>10.6f} s ({size / max(total, 1e-9) / 1e6:.1f} MB/s, {size} bytes)", file=sys.stderr)
+
+def _command_files(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """ Runs the encrypt, decrypt and verify commands. """
+    pairs = _targets(parser, args)
+    password = _read_password(args)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    failures = 0
+    total_size = 0
+    total_stages = {name: 0.0 for name, _ in TIMED_STAGES}
+    start = time.perf_counter()
+    try:
+        # The cryptography backend releases the GIL during the OpenSSL calls, so threads run the inputs in parallel
+        with ThreadPoolExecutor(max_workers=min(jobs, len(pairs))) as executor:
+            futures = [(source, executor.submit(_run_one, args, password, source, target)) for source, target in pairs]
+            for source, future in futures:
+                name = "<stdin>" if source == "-" else source
+                try:
+                    size, stages, total = future.result()
+                except AuthError:
+                    failures += 1
+                    print(f"{name}: FAILED (the HMAC is not valid, wrong password or tampered data)", file=sys.stderr)
+                    continue
+                except Exception as e:
+                    failures += 1
+                    print(f"{name}: FAILED ({e})", file=sys.stderr)
+                    continue
+                total_size += size
+                for stage, seconds in stages.items():
+                    total_stages[stage] += seconds
+                if args.command == "verify":
+                    print(f"{name}: OK", file=sys.stderr)
+                if args.timings:
+                    _print_timings(name, size, stages, total)
+    finally:
+        delete_bytearray(password)
+    if args.timings and len(pairs) > 1:
+        _print_timings(f"all ({len(pairs)} inputs, {jobs} jobs)", total_size, total_stages, time.perf_counter() - start)
+    return 1 if failures else 0
+
+def _command_tree(args: argparse.Namespace) -> int:
+    """ Runs the encrypt-tree and decrypt-tree commands. """
+    function = encrypt_tree if args.command == "encrypt-tree" else decrypt_tree
+    password = _read_password(args)
+    options = {"versioned": not args.legacy} if args.command == "encrypt-tree" else {}
+    manifest = function(args.source, args.target, password, args.iterations, suffix=args.suffix, max_workers=args.jobs or None,
+                        chunk_size=args.chunk_size, overwrite=args.force, manifest_path=args.manifest, delete_keys=True, **options)
+    for entry in manifest["entries"]:
+        if entry["status"] == "failed":
+            print(f"{entry['path']}: FAILED ({entry['error']})", file=sys.stderr)
+    print(f"{manifest['files']} processed, {manifest['failed']} failed, {manifest['skipped']} skipped, "
+          f"{manifest['bytes']} bytes in {manifest['seconds']:.3f} s ({manifest['MB_per_s']:.1f} MB/s, kdf {manifest['kdf_seconds']:.3f} s)", file=sys.stderr)
+    return 1 if manifest["failed"] else 0
+
+def _command_bench(args: argparse.Namespace) -> int:
+    """ Runs the bench command: PBKDF2 and AES/HMAC throughput of the host. """
+    password, salt = random_bytearray(32), random_salt()
+    aes_key, hmac_key, iv = random_bytearray(32), random_bytearray(32), random_iv()
+    cleardata = random_bytearray(args.size)
+    try:
+        start = time.perf_counter()
+        delete_bytearray(derive_key(password, salt, args.iterations))
+        elapsed = time.perf_counter() - start
+        print(f"{'derive_key':<16}{elapsed:>10.3f} s{args.iterations / elapsed:>14.0f} iterations/s ({args.iterations} iterations)")
+
+        start = time.perf_counter()
+        cipherdata = encrypt_AES_CBC(cleardata, aes_key, iv)
+        elapsed = time.perf_counter() - start
+        print(f"{'encrypt_AES_CBC':<16}{elapsed:>10.3f} s{args.size / elapsed / 1e6:>14.1f} MB/s")
+
+        start = time.perf_counter()
+        delete_bytearray(create_hmac(hmac_key, iv, cipherdata))
+        elapsed = time.perf_counter() - start
+        print(f"{'create_hmac':<16}{elapsed:>10.3f} s{args.size / elapsed / 1e6:>14.1f} MB/s")
+
+        start = time.perf_counter()
+        delete_bytearray(decrypt_AES_CBC(cipherdata, aes_key, iv))
+        elapsed = time.perf_counter() - start
+        print(f"{'decrypt_AES_CBC':<16}{elapsed:>10.3f} s{args.size / elapsed / 1e6:>14.1f} MB/s")
+        delete_bytearray(cipherdata)
+
+        if args.target_latency is not None:
+            Nmin, Nmax = calibrate_iterations(args.target_latency)
+            print(f"iterations for {args.target_latency * 1000:.0f} ms +/- 10 %: {Nmin} - {Nmax}")
+    finally:
+        for barray in (password, salt, aes_key, hmac_key, iv, cleardata):
+            delete_bytearray(barray)
+    return 0
+
+def _parser() -> argparse.ArgumentParser:
+    """ Creates the parser of the command line. """
+    parser = argparse.ArgumentParser(prog="pyaescbc", description="AES-CBC + HMAC-SHA256 encryption of files and streams.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command, help in (("encrypt", "encrypt files or the standard input"), ("decrypt", "decrypt files or the standard input"), ("verify", "check the HMAC of encrypted files without decrypting them")):
+        subparser = subparsers.add_parser(command, help=help)
+        subparser.add_argument("inputs", nargs="+", metavar="INPUT", help="input files, '-' for the standard input")
+        if command.startswith("encrypt"):
+            subparser.add_argument("-n", "--iterations", type=int, required=True, help="number of PBKDF2 iterations")
+            subparser.add_argument("--legacy", action="store_true", help="write bundles without the versioned header (their decryption needs -n)")
+        else:
+            subparser.add_argument("-n", "--iterations", type=int, help="number of PBKDF2 iterations (default: read from the header of versioned files)")
+        subparser.add_argument("--password-fd", type=int, metavar="FD", help="read the password from this file descriptor (up to the first newline)")
+        subparser.add_argument("--password-env", metavar="VAR", help=f"read the password from this environment variable (default: {PASSWORD_ENV} if set)")
+        subparser.add_argument("-j", "--jobs", type=int, default=1, help="number of inputs processed in parallel, 0 for the number of CPUs (default: 1)")
+        subparser.add_argument("--chunk-size", type=_parse_size, default=1_048_576, help="size of the chunks read from the inputs (default: 1M)")
+        subparser.add_argument("-t", "--timings", action="store_true", help="print the time of each stage and the throughput on the standard error")
+        if command != "verify":
+            subparser.add_argument("-o", "--output", help="output file for a single input, '-' for the standard output")
+            subparser.add_argument("--suffix", default=SUFFIX, help=f"suffix added to (or removed from) the inputs to name the outputs (default: {SUFFIX})")
+            subparser.add_argument("-f", "--force", action="store_true", help="overwrite the existing outputs")
+
+    for command, help in (("encrypt-tree", "encrypt all the files of a directory tree"), ("decrypt-tree", "decrypt all the files of a directory tree")):
+        subparser = subparsers.add_parser(command, help=help)
+        subparser.add_argument("source", help="directory to walk")
+        subparser.add_argument("target", help="directory receiving the outputs (can be the source directory)")
+        if command.startswith("encrypt"):
+            subparser.add_argument("-n", "--iterations", type=int, required=True, help="number of PBKDF2 iterations")
+            subparser.add_argument("--legacy", action="store_true", help="write bundles without the versioned header (their decryption needs -n)")
+        else:
+            subparser.add_argument("-n", "--iterations", type=int, help="number of PBKDF2 iterations (default: read from the header of versioned files)")
+        subparser.add_argument("--password-fd", type=int, metavar="FD", help="read the password from this file descriptor (up to the first newline)")
+        subparser.add_argument("--password-env", metavar="VAR", help=f"read the password from this environment variable (default: {PASSWORD_ENV} if set)")
+        subparser.add_argument("-j", "--jobs", type=int, default=0, help="number of threads, 0 for the number of CPUs (default: 0)")
+        subparser.add_argument("--chunk-size", type=_parse_size, default=1_048_576, help="size of the chunks read from the files (default: 1M)")
+        subparser.add_argument("--suffix", default=SUFFIX, help=f"suffix of the encrypted files (default: {SUFFIX})")
+        subparser.add_argument("-f", "--force", action="store_true", help="overwrite the existing outputs instead of skipping them")
+        subparser.add_argument("--manifest", metavar="PATH", help="write the JSON summary manifest to this file")
+
+    subparser = subparsers.add_parser("bench", help="measure the PBKDF2 and AES/HMAC throughput of the host")
+    subparser.add_argument("-n", "--iterations", type=int, default=100_000, help="number of PBKDF2 iterations (default: 100000)")
+    subparser.add_argument("--size", type=_parse_size, default=67_108_864, help="size of the data encrypted (default: 64M)")
+    subparser.add_argument("--target-latency", type=float, metavar="SECONDS", help="also print the iterations matching this derivation time")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """ Runs the command line and returns the exit code (0 on success, 1 on failure, 2 on usage error). """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "iterations", None) is not None and args.iterations <= 0:
+        parser.error("--iterations must be a positive integer")
+    if args.command == "bench":
+        return _command_bench(args)
+    try:
+        if args.command.endswith("-tree"):
+            return _command_tree(args)
+        return _command_files(parser, args)
+    except ValueError as e:
+        print(f"pyaescbc: error: {e}", file=sys.stderr)
+        return 2
+
 def __main__() -> None:
     r"""
     Main entry point of the package.
 
-    This method contains the script to run if the user enter the name of the package on the command line. 
+    This method contains the script to run if the user enter the name of the package on the command line.
+    The password is read from a file descriptor (``--password-fd``), an environment variable (``--password-env``,
+    ``PYAESCBC_PASSWORD`` by default) or the terminal, so it never appears in the command line.
 
     .. code-block:: console
 
-        pyaescbc
-        
+        # Encrypt two files in parallel (creates dump.sql.aes and logs.tar.aes)
+        PYAESCBC_PASSWORD=... pyaescbc encrypt -n 2000000 -j 2 --timings dump.sql logs.tar
+
+        # Decrypt in a pipeline, the password being read from the file descriptor 3
+        cat dump.sql.aes | pyaescbc decrypt -n 2000000 --password-fd 3 - 3< password.txt | psql
+
+        # Check the HMAC of the encrypted files without decrypting them
+        pyaescbc verify -n 2000000 --password-env BACKUP_PASSWORD *.aes
+
+        # Encrypt a directory tree on all the CPUs with a summary manifest
+        pyaescbc encrypt-tree -n 2000000 --manifest manifest.json exports/ exports-encrypted/
+
+        # Measure the throughput of the host
+        pyaescbc bench --target-latency 0.25
+
+    The files are processed chunk by chunk in constant memory, and the outputs are written atomically.
     """
-    raise NotImplementedError("The main entry point is not implemented yet.")
+    sys.exit(main())
 
 def __main_gui__() -> None:
     r"""
@@ -32,9 +386,11 @@ def __main_gui__() -> None:
     This method contains the script to run if the user enter the name of the package on the command line with the ``gui`` extension.
 
     .. code-block:: console
-    
+
         pyaescbc-gui
-        
+
     """
     raise NotImplementedError("The graphical user interface entry point is not implemented yet.")
 
+if __name__ == "__main__":
+    __main__()
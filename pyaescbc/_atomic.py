@@ -0,0 +1,47 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import os
+import tempfile
+from typing import BinaryIO, Iterator
+
+@contextlib.contextmanager
+def atomic_output(path: str, overwrite: bool = False) -> Iterator[BinaryIO]:
+    """
+    Opens a binary output file written atomically.
+
+    The data is written in a temporary file of the same directory, which is flushed to the disk and renamed to `path`
+    only if the block succeeds. Otherwise the temporary file is removed, so `path` is either untouched or complete.
+    The stream is also readable, so the data written can be read back (see :func:`pyaescbc.encrypt_stream`).
+
+    Raises
+    ------
+    FileExistsError
+        If `path` already exists and `overwrite` is False.
+    """
+    if os.path.exists(path) and not overwrite:
+        raise FileExistsError(f"{path} already exists.")
+    directory, name = os.path.split(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(descriptor, "w+b") as stream:
+            yield stream
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary)
+        raise
@@ -0,0 +1,52 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+
+def byte_view(obj: Any, name: str) -> memoryview:
+    """
+    Returns a flat memoryview of unsigned bytes on an object supporting the buffer protocol.
+
+    The caller must release the view (or use it as a context manager), otherwise a bytearray
+    can not be resized (and so can not be deleted with :func:`pyaescbc.delete_bytearray`) while the view is alive.
+
+    Raises
+    ------
+    TypeError
+        If `obj` does not support the buffer protocol or is not C-contiguous.
+    """
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        raise TypeError(f'Parameter {name} does not support the buffer protocol.') from None
+    if view.format == 'B' and view.ndim == 1:
+        return view
+    try:
+        return view.cast('B')
+    except TypeError:
+        raise TypeError(f'Parameter {name} is not a C-contiguous buffer.') from None
+    finally:
+        view.release()
+
+def buffer_nbytes(obj: Any, name: str) -> int:
+    """
+    Returns the length in bytes of an object supporting the buffer protocol.
+
+    Raises
+    ------
+    TypeError
+        If `obj` does not support the buffer protocol or is not C-contiguous.
+    """
+    with byte_view(obj, name) as view:
+        return view.nbytes
@@ -0,0 +1,208 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Layout of a seekable chunked bundle:
+#
+#   header (24 bytes)        BundleHeader with FLAG_CHUNKED, payload_length being the length of the clear data
+#   chunk_size (4 bytes)     big-endian, multiple of 16
+#   salt (32 bytes)
+#   header_hmac (32 bytes)   HMAC(hmac_key, header + chunk_size + salt + authdata)
+#   records                  iv (16 bytes) | hmac (32 bytes) | cipherdata, one record per chunk of clear data
+#
+# Each chunk of clear data is encrypted with encrypt_AES_CBC (PKCS7 padding, its own random IV), so all the records but the last one
+# are ``48 + chunk_size + 16`` bytes long: the index of the records is computed from the chunk index without reading the file.
+# The HMAC of a record is create_hmac(hmac_key, iv, cipherdata, index (8 bytes) + last (1 byte) + authdata), so a record can not be
+# moved to another position, and the bundle can not be truncated on a record boundary without the last record failing.
+# The chunks are independent CBC chains, so they can be encrypted on several threads and written in order.
+
+import hmac
+import hashlib
+from typing import Optional, Tuple, BinaryIO
+
+from .bundle_header import BundleHeader, HEADER_STRUCT, HEADER_LENGTH, BUNDLE_MAGIC, BUNDLE_VERSION, KDF_PBKDF2_SHA256, FLAG_CHUNKED
+from .derive_key import derive_key
+from .random_iv import random_iv
+from .encrypt_AES_CBC import encrypt_AES_CBC
+from .decrypt_AES_CBC import decrypt_AES_CBC
+from .create_hmac import create_hmac
+from .check_hmac import check_hmac
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .auth_error import AuthError
+
+PREAMBLE_LENGTH = HEADER_LENGTH + 4 + 32 + 32  # 92 bytes
+
+def chunk_count(payload_length: int, chunk_size: int) -> int:
+    """ Returns the number of records of a chunked bundle (an empty payload has one empty record). """
+    return max(1, -(-payload_length // chunk_size))
+
+def record_length(clear_length: int) -> int:
+    """ Returns the length of the record of a chunk of ``clear_length`` bytes. """
+    return 48 + 16 * (clear_length // 16 + 1)
+
+def chunked_length(payload_length: int, chunk_size: int) -> int:
+    """ Returns the total length of a chunked bundle. """
+    count = chunk_count(payload_length, chunk_size)
+    return PREAMBLE_LENGTH + (count - 1) * record_length(chunk_size) + record_length(payload_length - (count - 1) * chunk_size)
+
+def read_full(input_stream: BinaryIO, buffer: bytearray) -> int:
+    """ Fills the buffer from the stream, reading several times if needed, and returns the number of bytes read (less only at the end of the stream). """
+    total = 0
+    with memoryview(buffer) as view:
+        while total < len(buffer):
+            # The slice is released even if the read fails, so the buffer can still be deleted by the caller
+            with view[total:] as part:
+                size = input_stream.readinto(part)
+            if not size:
+                break
+            total += size
+    return total
+
+def header_hmac(hmac_key: bytearray, preamble: bytearray, authdata: Optional[bytearray]) -> bytearray:
+    """ Computes the HMAC of the preamble (header, chunk size and salt) and the authdata. """
+    mac = hmac.new(hmac_key, memoryview(preamble)[:PREAMBLE_LENGTH - 32], hashlib.sha256)
+    if authdata is not None:
+        mac.update(authdata)
+    return bytearray(mac.digest())
+
+def chunk_authdata(index: int, last: bool, authdata: Optional[bytearray]) -> bytearray:
+    """ Returns the position data authenticated with a record: its index, whether it is the last one, and the authdata. """
+    position = bytearray(index.to_bytes(8, 'big') + (b'\x01' if last else b'\x00'))
+    if authdata is not None:
+        position += authdata
+    return position
+
+def encrypt_chunk(
+    cleardata: memoryview,
+    aes_key: bytearray,
+    hmac_key: bytearray,
+    index: int,
+    last: bool,
+    authdata: Optional[bytearray]
+) -> Tuple[bytearray, bytearray, bytearray]:
+    """ Encrypts and authenticates the chunk ``index`` with its own random IV, and returns the IV, the HMAC and the cipherdata of its record. """
+    position = bytearray()
+    try:
+        iv = random_iv()
+        cipherdata = encrypt_AES_CBC(cleardata, aes_key, iv)
+        position = chunk_authdata(index, last, authdata)
+        expected_hmac = create_hmac(hmac_key, iv, cipherdata, authdata=position)
+    finally:
+        delete_bytearray(position)
+    return iv, expected_hmac, cipherdata
+
+def open_chunked(
+    input_stream: BinaryIO,
+    password: bytearray,
+    iterations: Optional[int],
+    authdata: Optional[bytearray],
+    key_cache: Optional[KeyCache]
+) -> Tuple[int, BundleHeader, int, bytearray]:
+    """
+    Reads and authenticates the preamble of a chunked bundle at the current position of the stream.
+
+    Returns the start position of the bundle, its header, its chunk size and the 64-byte derived key (to be deleted by the caller).
+    """
+    start = input_stream.tell()
+    preamble = bytearray(input_stream.read(PREAMBLE_LENGTH))
+    salt = bytearray()
+    expected_hmac = bytearray()
+    given_hmac = bytearray()
+    derived_key = bytearray()
+    try:
+        if len(preamble) != PREAMBLE_LENGTH or preamble[0:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            raise ValueError('input_stream does not contain a chunked bundle.')
+        magic, version, kdf, flags, header_iterations, payload_length = HEADER_STRUCT.unpack(preamble[0:HEADER_LENGTH])
+        if version != BUNDLE_VERSION:
+            raise ValueError(f'Bundle version {version} is not supported.')
+        if not flags & FLAG_CHUNKED:
+            raise ValueError('input_stream does not contain a chunked bundle.')
+        if kdf != KDF_PBKDF2_SHA256:
+            raise ValueError('input_stream is not a password-based bundle.')
+        if iterations is None:
+            iterations = header_iterations
+        elif iterations != header_iterations:
+            raise ValueError('Parameter iterations does not match the header of the bundle.')
+        chunk_size = int.from_bytes(preamble[HEADER_LENGTH:HEADER_LENGTH + 4], 'big')
+        if chunk_size == 0 or chunk_size % 16 != 0:
+            raise ValueError('The chunk size of the bundle is not a strictly positive multiple of 16.')
+
+        # Check the length of the bundle before reading any record
+        end = input_stream.seek(0, 2)
+        if end - start < chunked_length(payload_length, chunk_size):
+            raise ValueError('The chunked bundle is truncated.')
+
+        # Authenticate the preamble
+        salt = preamble[HEADER_LENGTH + 4:HEADER_LENGTH + 36]
+        expected_hmac = preamble[HEADER_LENGTH + 36:PREAMBLE_LENGTH]
+        if key_cache is not None:
+            derived_key = key_cache.derive_key(password, salt, iterations)
+        else:
+            derived_key = derive_key(password, salt, iterations)
+        given_hmac = header_hmac(derived_key[32:], preamble, authdata)
+        if not check_hmac(given_hmac, expected_hmac):
+            raise AuthError('The HMAC is not valid. The data has been tampered with or the password is incorrect.')
+        header = BundleHeader(version, kdf, header_iterations, payload_length, flags)
+    except Exception as e:
+        delete_bytearray(derived_key)
+        raise e
+    finally:
+        delete_bytearray(preamble)
+        delete_bytearray(salt)
+        delete_bytearray(expected_hmac)
+        delete_bytearray(given_hmac)
+    return start, header, chunk_size, derived_key
+
+def read_chunk(
+    input_stream: BinaryIO,
+    start: int,
+    header: BundleHeader,
+    chunk_size: int,
+    derived_key: bytearray,
+    index: int,
+    authdata: Optional[bytearray]
+) -> bytearray:
+    """ Reads, authenticates and decrypts the chunk ``index`` of a chunked bundle opened with :func:`open_chunked`. """
+    count = chunk_count(header.payload_length, chunk_size)
+    last = index == count - 1
+    clear_length = header.payload_length - index * chunk_size if last else chunk_size
+    input_stream.seek(start + PREAMBLE_LENGTH + index * record_length(chunk_size))
+    record = bytearray(input_stream.read(record_length(clear_length)))
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    position = bytearray()
+    given_hmac = bytearray()
+    views = ()
+    try:
+        if len(record) != record_length(clear_length):
+            raise ValueError('The chunked bundle is truncated.')
+        aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+        with memoryview(record) as view:
+            views = iv, expected_hmac, cipherdata = view[0:16], view[16:48], view[48:]
+        position = chunk_authdata(index, last, authdata)
+        given_hmac = create_hmac(hmac_key, iv, cipherdata, authdata=position)
+        if not check_hmac(given_hmac, expected_hmac):
+            raise AuthError('The HMAC is not valid. The data has been tampered with or the password is incorrect.')
+        cleardata = decrypt_AES_CBC(cipherdata, aes_key, iv)
+    finally:
+        # Releasing the views so the record can be deleted
+        for view in views:
+            view.release()
+        delete_bytearray(record)
+        delete_bytearray(aes_key)
+        delete_bytearray(hmac_key)
+        delete_bytearray(position)
+        delete_bytearray(given_hmac)
+    return cleardata
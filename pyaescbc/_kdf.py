@@ -0,0 +1,30 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+from .derive_key import derive_key
+from .derive_key_v2 import derive_key_v2
+from .key_cache import KeyCache
+from .bundle_header import KDF_PBKDF2_SHA256, KDF_PBKDF2_HKDF_SHA256
+
+def derive_password_key(password: bytearray, salt: bytearray, iterations: int, kdf: int, key_cache: Optional[KeyCache]) -> bytearray:
+    """ Derives the 64-byte key of a password-based bundle with the KDF of its header, through the cache if given. """
+    if key_cache is not None:
+        return key_cache.derive_key(password, salt, iterations, kdf=kdf)
+    if kdf == KDF_PBKDF2_HKDF_SHA256:
+        return derive_key_v2(password, salt, iterations)
+    if kdf == KDF_PBKDF2_SHA256:
+        return derive_key(password, salt, iterations)
+    raise ValueError(f'Bundle KDF {kdf} is not a password-based KDF.')
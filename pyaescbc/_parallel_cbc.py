@@ -0,0 +1,77 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# CBC decryption of a block only needs the block and the previous cipherdata block, so the cipherdata can be cut at
+# block-aligned boundaries and each segment decrypted on its own with the last cipherdata block before it as IV.
+# The output is identical to a single pass. The cryptography backend releases the GIL, so the segments run in parallel on threads.
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import ciphers
+from cryptography.hazmat.backends import default_backend
+
+MIN_SEGMENT_SIZE = 1_048_576  # Smaller segments do not pay for the thread hand-off
+
+def segment_bounds(full_length: int, max_workers: int) -> List[Tuple[int, int]]:
+    """ Cuts ``[0, full_length[`` into block-aligned segments, about 4 per worker and at least MIN_SEGMENT_SIZE bytes each. """
+    count = max(1, min(4 * max_workers, full_length // MIN_SEGMENT_SIZE))
+    segment_size = -(-full_length // count)
+    segment_size += -segment_size % 16
+    return [(start, min(start + segment_size, full_length)) for start in range(0, full_length, segment_size)]
+
+def decrypt_segments_into(
+    cipher_view: memoryview,
+    aes_key: Any,
+    iv: Any,
+    out_view: memoryview,
+    full_length: int,
+    max_workers: int,
+    mac: Optional[Any] = None,
+    chunk_size: int = 65_536
+) -> None:
+    """
+    Decrypts the first ``full_length`` bytes of the cipherdata into ``out_view`` on a thread pool of ``max_workers`` threads.
+
+    ``out_view`` must contain at least ``full_length + 15`` bytes. If ``mac`` is given, it is fed with the same bytes
+    ``chunk_size`` bytes at a time by the calling thread while the segments are decrypted.
+    """
+    def decrypt_segment(start: int, stop: int) -> None:
+        segment_iv = bytes(iv) if start == 0 else bytes(cipher_view[start - 16:start])  # A copy, the cipher must not hold a view on the caller's buffer
+        decryptor = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(segment_iv), backend=default_backend()).decryptor()
+        decryptor.update_into(cipher_view[start:stop], out_view[start:])
+
+    bounds = segment_bounds(full_length, max_workers)
+    if len(bounds) == 1 or max_workers == 1:
+        for start, stop in bounds:
+            decrypt_segment(start, stop)
+        if mac is not None:
+            for start in range(0, full_length, chunk_size):
+                mac.update(cipher_view[start:min(start + chunk_size, full_length)])
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(decrypt_segment, start, stop) for start, stop in bounds]
+        if mac is not None:
+            for start in range(0, full_length, chunk_size):
+                mac.update(cipher_view[start:min(start + chunk_size, full_length)])
+        for future in futures:
+            future.result()
+
+def last_block_iv(cipher_view: memoryview, iv: Any, full_length: int) -> Any:
+    """
+    Returns a copy of the IV of the last block of the cipherdata: the previous cipherdata block, or the IV for a single block.
+
+    The IV is copied, so the cipher does not keep a view on the caller's buffer alive (the buffer could not be deleted on an error path).
+    """
+    return bytes(iv) if full_length == 0 else bytes(cipher_view[full_length - 16:full_length])
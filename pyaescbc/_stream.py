@@ -0,0 +1,78 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+from typing import Optional, Tuple, BinaryIO
+
+from ._chunked import read_full
+from .bundle_header import BundleHeader, HEADER_STRUCT, HEADER_LENGTH, BUNDLE_MAGIC, BUNDLE_VERSION, PASSWORD_KDF_IDS, FLAG_CHUNKED
+from .delete_bytearray import delete_bytearray
+
+def read_stream_preamble(input_stream: BinaryIO, iterations: Optional[int]) -> Tuple[Optional[BundleHeader], int, bytearray, bytearray, bytearray]:
+    """
+    Reads the optional versioned header, then the iv, the salt and the expected HMAC of a bundle at the current position of the stream.
+
+    The stream is only read forward, so it does not need to be seekable. The header is checked as in :func:`pyaescbc.decrypt`,
+    but its payload length can only be checked once the cipherdata has been read.
+    Returns the header (None for a legacy bundle), the iterations (read from the header if None), the iv, the salt and the expected HMAC.
+    """
+    head = bytearray(HEADER_LENGTH)
+    components = bytearray()
+    try:
+        head_size = read_full(input_stream, head)
+        bundle_header = None
+        if head_size == HEADER_LENGTH and head[0:len(BUNDLE_MAGIC)] == BUNDLE_MAGIC:
+            magic, version, kdf, flags, header_iterations, payload_length = HEADER_STRUCT.unpack(head)
+            if version != BUNDLE_VERSION:
+                raise ValueError(f'Bundle version {version} is not supported.')
+            if flags & FLAG_CHUNKED:
+                raise ValueError('input_stream is a chunked bundle, use pyaescbc.decrypt_chunked_stream or pyaescbc.decrypt_range.')
+            if kdf not in PASSWORD_KDF_IDS or flags != 0:
+                raise ValueError('input_stream is not a password-based bundle.')
+            if iterations is None:
+                iterations = header_iterations
+            elif iterations != header_iterations:
+                raise ValueError('Parameter iterations does not match the header of the bundle.')
+            bundle_header = BundleHeader(version, kdf, header_iterations, payload_length, flags)
+            components = bytearray(80)
+            size = read_full(input_stream, components)
+        else:
+            # Legacy bundle: the bytes read are the beginning of the iv
+            if iterations is None:
+                raise ValueError('Parameter iterations is required for a bundle without header.')
+            components = bytearray(80)
+            components[0:head_size] = head[0:head_size]
+            size = head_size
+            if head_size == HEADER_LENGTH:
+                with memoryview(components) as view, view[HEADER_LENGTH:] as part:
+                    size += read_full(input_stream, part)
+        if size != 80:
+            raise ValueError('input_stream does not contain at least 80 bytes.')
+        iv, salt, expected_hmac = components[0:16], components[16:48], components[48:80]
+    finally:
+        delete_bytearray(head)
+        delete_bytearray(components)
+    return bundle_header, iterations, iv, salt, expected_hmac
+
+def remaining_length(input_stream: BinaryIO) -> Optional[int]:
+    """ Returns the number of bytes left after the current position of a seekable stream, None if the stream is not seekable. """
+    try:
+        if not input_stream.seekable():
+            return None
+        position = input_stream.tell()
+        end = input_stream.seek(0, io.SEEK_END)
+        input_stream.seek(position)
+    except (AttributeError, OSError):
+        return None
+    return max(end - position, 0)
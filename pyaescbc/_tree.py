@@ -0,0 +1,197 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional, Tuple
+
+from .encrypt_stream import encrypt_stream
+from .decrypt_stream import decrypt_stream
+from .random_salt import random_salt
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .auth_error import AuthError
+from ._atomic import atomic_output
+from .bundle_header import KDF_PBKDF2_SHA256
+
+def check_tree_parameters(encrypt, source_dir, target_dir, password, iterations, authdata, suffix, max_workers, chunk_size, overwrite, manifest_path, delete_keys) -> None:
+    """ Checks the parameters shared by :func:`pyaescbc.encrypt_tree` and :func:`pyaescbc.decrypt_tree` (the iterations can be None to decrypt). """
+    # Check the types of the parameters
+    if not isinstance(source_dir, (str, os.PathLike)):
+        raise TypeError("Parameter source_dir is not a path.")
+    if not isinstance(target_dir, (str, os.PathLike)):
+        raise TypeError("Parameter target_dir is not a path.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if (encrypt or iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(suffix, str):
+        raise TypeError("Parameter suffix is not str instance.")
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError("Parameter max_workers is not integer")
+    if not isinstance(chunk_size, int):
+        raise TypeError("Parameter chunk_size is not integer")
+    if not isinstance(overwrite, bool):
+        raise TypeError("Parameter overwrite is not a boolean.")
+    if (manifest_path is not None) and (not isinstance(manifest_path, (str, os.PathLike))):
+        raise TypeError("Parameter manifest_path is not a path.")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+
+    # Check the values of the parameters
+    if not os.path.isdir(source_dir):
+        raise ValueError(f"Parameter source_dir is not a directory: {source_dir}")
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if (iterations is not None) and (iterations <= 0):
+        raise ValueError('Parameter iterations must be a positive integer.')
+    if len(suffix) == 0:
+        raise ValueError('Parameter suffix must not be empty.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a positive integer.')
+    if chunk_size <= 0:
+        raise ValueError('Parameter chunk_size must be a positive integer.')
+
+def _list_tree(encrypt: bool, source_dir: str, target_dir: str, suffix: str, overwrite: bool, manifest_path: Optional[str]) -> Tuple[List[Tuple[str, str]], List[Dict]]:
+    """ Walks the source tree and returns the (source, target) relative paths to process and the skipped entries. """
+    same_tree = source_dir == target_dir
+    pairs, skipped = [], []
+    for root, dirs, files in os.walk(source_dir):
+        # The target tree is not walked if it is inside the source tree
+        dirs[:] = sorted(name for name in dirs if same_tree or os.path.realpath(os.path.join(root, name)) != target_dir)
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, source_dir)
+            if manifest_path is not None and os.path.realpath(path) == manifest_path:
+                continue
+            if os.path.islink(path) or not os.path.isfile(path):
+                skipped.append({"path": relative, "status": "skipped", "reason": "not a regular file"})
+                continue
+            if encrypt:
+                if same_tree and name.endswith(suffix):
+                    skipped.append({"path": relative, "status": "skipped", "reason": "already encrypted"})
+                    continue
+                target = relative + suffix
+            else:
+                if not name.endswith(suffix) or name == suffix:
+                    skipped.append({"path": relative, "status": "skipped", "reason": f"no {suffix} suffix"})
+                    continue
+                target = relative[:-len(suffix)]
+            if not overwrite and os.path.exists(os.path.join(target_dir, target)):
+                skipped.append({"path": relative, "status": "skipped", "reason": "output already exists"})
+                continue
+            pairs.append((relative, target))
+    return pairs, skipped
+
+def process_tree(
+    encrypt: bool,
+    source_dir,
+    target_dir,
+    password: bytearray,
+    iterations: Optional[int],
+    authdata: Optional[bytearray],
+    suffix: str,
+    max_workers: Optional[int],
+    chunk_size: int,
+    overwrite: bool,
+    manifest_path,
+    delete_keys: bool,
+    versioned: bool = False,
+    kdf: int = KDF_PBKDF2_SHA256,
+) -> Dict:
+    """ Encrypts or decrypts a directory tree on a thread pool, the parameters are already checked. """
+    source_dir = os.path.realpath(source_dir)
+    target_dir = os.path.realpath(target_dir)
+    manifest_path = None if manifest_path is None else os.path.realpath(manifest_path)
+    max_workers = max_workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    key_cache = KeyCache(max_size=64, ttl=None)
+    salt = bytearray()
+    kdf_seconds = 0.0
+    entries = []
+    try:
+        pairs, skipped = _list_tree(encrypt, source_dir, target_dir, suffix, overwrite, manifest_path)
+        if encrypt and pairs:
+            # All the files of the run share the salt, so the key is derived once (each file has its own random IV)
+            salt = random_salt()
+            kdf_start = time.perf_counter()
+            delete_bytearray(key_cache.derive_key(password, salt, iterations, kdf=kdf))
+            kdf_seconds = time.perf_counter() - kdf_start
+
+        def process_file(source: str, target: str) -> int:
+            source_path = os.path.join(source_dir, source)
+            target_path = os.path.join(target_dir, target)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            with open(source_path, 'rb') as input_stream, atomic_output(target_path, overwrite=overwrite) as output_stream:
+                if encrypt:
+                    encrypt_stream(input_stream, output_stream, password, iterations, authdata=authdata, chunk_size=chunk_size, delete_keys=False, key_cache=key_cache, salt=salt, versioned=versioned, kdf=kdf)
+                    return os.fstat(input_stream.fileno()).st_size
+                return decrypt_stream(input_stream, output_stream, password, iterations, authdata=authdata, chunk_size=chunk_size, delete_keys=False, key_cache=key_cache)
+
+        # The cryptography backend releases the GIL during the OpenSSL calls, so the files are processed in parallel.
+        # At most 2 * max_workers files are in flight, so the futures of a large tree are not all created at once.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = {}
+            iterator = iter(pairs)
+            while True:
+                for source, target in iterator:
+                    in_flight[executor.submit(process_file, source, target)] = (source, target)
+                    if len(in_flight) >= 2 * max_workers:
+                        break
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, target = in_flight.pop(future)
+                    try:
+                        entries.append({"path": source, "status": "ok", "output": target, "bytes": future.result()})
+                    except AuthError:
+                        entries.append({"path": source, "status": "failed", "error": "The HMAC is not valid. The data has been tampered with or the password is incorrect."})
+                    except Exception as e:
+                        entries.append({"path": source, "status": "failed", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        # Deleting from memory all critical data for security
+        key_cache.clear()
+        delete_bytearray(salt)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+
+    # Build the summary manifest
+    seconds = time.perf_counter() - start
+    processed = sum(entry["bytes"] for entry in entries if entry["status"] == "ok")
+    manifest = {
+        "operation": "encrypt" if encrypt else "decrypt",
+        "source_dir": source_dir,
+        "target_dir": target_dir,
+        "max_workers": max_workers,
+        "files": sum(1 for entry in entries if entry["status"] == "ok"),
+        "failed": sum(1 for entry in entries if entry["status"] == "failed"),
+        "skipped": len(skipped),
+        "bytes": processed,
+        "seconds": seconds,
+        "kdf_seconds": kdf_seconds,
+        "MB_per_s": processed / seconds / 1e6 if seconds > 0 else 0.0,
+        "entries": sorted(entries + skipped, key=lambda entry: entry["path"]),
+    }
+    if manifest_path is not None:
+        with atomic_output(manifest_path, overwrite=True) as stream:
+            stream.write(json.dumps(manifest, indent=2).encode('utf-8'))
+    return manifest
@@ -0,0 +1,89 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Tuple, Optional
+
+from .bundle_header import BundleHeader, HEADER_LENGTH
+
+def allocate_encrypted_bundle(cipherdata_length: int, header: Optional[BundleHeader] = None) -> Tuple[bytearray, memoryview, memoryview, memoryview, memoryview]:
+    """
+    Preallocates an encrypted bundle and returns writable memoryviews on its components.
+
+    The components are written in place through the views, so the bundle is built in a single allocation
+    without the intermediate copies of :func:`pyaescbc.create_encrypted_bundle`.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        encrypted_bundle, iv, salt, expected_hmac, cipherdata = aes.allocate_encrypted_bundle(len(ciphertext))
+        iv[:] = ...
+        salt[:] = ...
+        expected_hmac[:] = ...
+        cipherdata[:] = ...
+        for view in (iv, salt, expected_hmac, cipherdata):
+            view.release()
+
+    .. warning::
+
+        The bundle can not be resized (and so can not be deleted with :func:`pyaescbc.delete_bytearray`) until all the views are released.
+
+    .. seealso::
+
+        - function :func:`pyaescbc.extract_cryptography_views` to get the views on an existing bundle.
+
+    Parameters
+    ----------
+    cipherdata_length : int
+        The length of the cipherdata in bytes. Must be a positive integer.
+
+    header : Optional[BundleHeader]
+        The header of a versioned bundle, written at the beginning of the bundle. Default is None (legacy bundle).
+        Its payload length must be equal to `cipherdata_length`.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the encrypted bundle of ``80 + cipherdata_length`` bytes (plus 24 bytes with a header),
+        and the views on its IV (16 bytes), salt (32 bytes), expected HMAC (32 bytes) and cipherdata.
+
+    Raises
+    ------
+    TypeError
+        If `cipherdata_length` is not an integer or `header` is not a BundleHeader.
+    ValueError
+        If `cipherdata_length` is negative or does not match the payload length of the header.
+    """
+    # Check the types of the parameters
+    if not isinstance(cipherdata_length, int):
+        raise TypeError('Parameter cipherdata_length is not int instance.')
+    if (header is not None) and (not isinstance(header, BundleHeader)):
+        raise TypeError('Parameter header is not BundleHeader instance.')
+
+    # Check the values of the parameters
+    if cipherdata_length < 0:
+        raise ValueError('Parameter cipherdata_length must be a positive integer.')
+    if (header is not None) and (header.payload_length != cipherdata_length):
+        raise ValueError('The payload length of the header does not match cipherdata_length.')
+
+    # Allocate the bundle and create the views
+    if header is None:
+        encrypted_bundle = bytearray(80 + cipherdata_length)
+        offset = 0
+    else:
+        encrypted_bundle = bytearray(HEADER_LENGTH + 80 + cipherdata_length)
+        encrypted_bundle[0:HEADER_LENGTH] = header.to_bytearray()
+        offset = HEADER_LENGTH
+    view = memoryview(encrypted_bundle)[offset:]
+    return encrypted_bundle, view[0:16], view[16:48], view[48:80], view[80:]
@@ -0,0 +1,98 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .encrypted_bundle_to_cleardata import encrypted_bundle_to_cleardata
+from .key_cache import KeyCache
+from .async_encrypt import _run_in_executor
+
+async def async_decrypt(
+    encrypted_bundle: bytearray,
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> bytearray:
+    """
+    async_decrypt is the coroutine version of :func:`pyaescbc.encrypted_bundle_to_cleardata`.
+
+    The key derivation, the HMAC check and the AES decryption run in an executor, so the event loop keeps serving other tasks while PBKDF2 runs.
+    By default, the bounded default executor of the running loop is used (see ``loop.set_default_executor``).
+
+    If the awaiting task is cancelled, ``asyncio.CancelledError`` is raised.
+    A decryption that has not started yet is dropped (and the inputs are deleted if delete_keys is True),
+    a decryption that has already started completes in the executor and its result is deleted from memory.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        async def handler(encrypted_bundle, password, iterations):
+            return await aes.async_decrypt(encrypted_bundle, password, iterations, delete_keys=True)
+
+    Parameters
+    ----------
+    encrypted_bundle : bytearray
+        The encrypted bundle to decrypt using AES in CBC mode. Must contain at least 80 bytes.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None for a versioned bundle, the iterations of the header are then used. Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+
+    delete_keys : bool
+        Delete the encrypted_bundle, the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+
+    executor : Optional[ThreadPoolExecutor]
+        The thread pool running the decryption. Default is None, the default executor of the running loop.
+        A process pool is not accepted: the inputs are deleted and the key_cache is filled in the memory of the calling process.
+
+    Returns
+    -------
+    cleardata : bytearray
+        The decrypted message using AES in CBC mode.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If `password` is empty, `iterations` is not a strictly positive integer, or `encrypted_bundle` does not contain more than 80 bytes.
+        If `iterations` is None for a legacy bundle or does not match the header, or if the header is not a password-based one.
+    AuthError
+        If the HMAC is not valid.
+    """
+    # Check the types of the parameters
+    if (executor is not None) and (not isinstance(executor, ThreadPoolExecutor)):
+        raise TypeError("Parameter executor is not ThreadPoolExecutor instance.")
+
+    # The bytearrays deleted by the call if it is dropped before starting
+    owned = []
+    if delete_keys is True:
+        owned = [barray for barray in (encrypted_bundle, password, authdata) if isinstance(barray, bytearray)]
+
+    function = lambda: encrypted_bundle_to_cleardata(encrypted_bundle, password, iterations, authdata=authdata, delete_keys=delete_keys, key_cache=key_cache)
+    return await _run_in_executor(executor, function, owned)
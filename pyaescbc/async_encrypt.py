@@ -0,0 +1,137 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, List
+
+from .cleardata_to_encrypted_bundle import cleardata_to_encrypted_bundle
+from .key_cache import KeyCache
+from .delete_bytearray import delete_bytearray
+
+async def _run_in_executor(executor: Optional[ThreadPoolExecutor], function: Callable[[], bytearray], owned: List[bytearray]) -> bytearray:
+    """
+    Runs ``function`` in the executor and propagates the cancellation of the awaiting task.
+
+    If the task is cancelled before ``function`` starts, the call is dropped and the ``owned`` bytearrays are deleted,
+    as ``function`` would have done. If ``function`` is already running, it completes in the executor and deletes them itself,
+    and its result (the cleardata or the encrypted bundle), which nobody receives, is deleted too.
+    """
+    lock = threading.Lock()
+    state = {"started": False, "cancelled": False, "result": None}
+
+    def job() -> Optional[bytearray]:
+        with lock:
+            if state["cancelled"]:
+                return None
+            state["started"] = True
+        result = function()
+        with lock:
+            if state["cancelled"]:
+                # The task was cancelled while the function was running, the result is dropped
+                delete_bytearray(result)
+                return None
+            state["result"] = result
+        return result
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, job)
+    except asyncio.CancelledError:
+        with lock:
+            state["cancelled"] = True
+            started = state["started"]
+            result = state["result"]
+        if not started:
+            for barray in owned:
+                delete_bytearray(barray)
+        elif result is not None:
+            # The function ended before the cancellation reached the task, the result is dropped
+            delete_bytearray(result)
+        raise
+
+async def async_encrypt(
+    cleardata: bytearray,
+    password: bytearray,
+    iterations: int,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> bytearray:
+    """
+    async_encrypt is the coroutine version of :func:`pyaescbc.cleardata_to_encrypted_bundle`.
+
+    The key derivation and the AES encryption run in an executor, so the event loop keeps serving other tasks while PBKDF2 runs.
+    By default, the bounded default executor of the running loop is used (see ``loop.set_default_executor``).
+
+    If the awaiting task is cancelled, ``asyncio.CancelledError`` is raised.
+    An encryption that has not started yet is dropped (and the inputs are deleted if delete_keys is True),
+    an encryption that has already started completes in the executor and its result is deleted from memory.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        async def handler(cleardata, password, iterations):
+            return await aes.async_encrypt(cleardata, password, iterations, delete_keys=True)
+
+    Parameters
+    ----------
+    cleardata : bytearray
+        The clear message to encrypt using AES in CBC mode.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : int
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+
+    delete_keys : bool
+        Delete the cleardata, the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+
+    executor : Optional[ThreadPoolExecutor]
+        The thread pool running the encryption. Default is None, the default executor of the running loop.
+        A process pool is not accepted: the inputs are deleted and the key_cache is filled in the memory of the calling process.
+
+    Returns
+    -------
+    encrypted_bundle : bytearray
+        The encrypted bundle.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty or if iterations is not a strictly positive integer.
+    """
+    # Check the types of the parameters
+    if (executor is not None) and (not isinstance(executor, ThreadPoolExecutor)):
+        raise TypeError("Parameter executor is not ThreadPoolExecutor instance.")
+
+    # The bytearrays deleted by the call if it is dropped before starting
+    owned = []
+    if delete_keys is True:
+        owned = [barray for barray in (cleardata, password, authdata) if isinstance(barray, bytearray)]
+
+    function = lambda: cleardata_to_encrypted_bundle(cleardata, password, iterations, authdata=authdata, delete_keys=delete_keys, key_cache=key_cache)
+    return await _run_in_executor(executor, function, owned)
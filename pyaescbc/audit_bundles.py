@@ -0,0 +1,161 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+from .open_bundle import open_bundle
+from .verify_bundle import verify_bundle
+from .key_cache import KeyCache
+from .delete_bytearray import delete_bytearray
+from ._buffer import buffer_nbytes
+
+def audit_bundles(
+    bundles: Iterable[Any],
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    max_workers: Optional[int] = None,
+    delete_keys: bool = True
+) -> Dict:
+    """
+    audit_bundles checks the integrity of many stored bundles in parallel, without decrypting them.
+
+    Each item is verified with :func:`pyaescbc.verify_bundle`: a path is mapped with :func:`pyaescbc.open_bundle`,
+    and a buffer (bytearray, bytes, mmap, ...) is verified in place and never deleted.
+    The keys are derived through a shared :class:`pyaescbc.KeyCache`, so the bundles sharing a salt
+    (for example the files of one :func:`pyaescbc.encrypt_tree` run) cost a single PBKDF2 run.
+    The HMAC computations release the GIL, so the items are verified in parallel by ``max_workers`` threads.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import glob
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        report = aes.audit_bundles(glob.glob("archive/**/*.aes", recursive=True), password, iterations, max_workers=8)
+        print(report["passed"], report["failed"], report["errors"], report["MB_per_s"])
+        for entry in report["entries"]:
+            if entry["status"] != "ok":
+                print(entry["item"], entry["status"], entry.get("error"))
+
+    Parameters
+    ----------
+    bundles : Iterable[Any]
+        The paths (str or os.PathLike) of the bundle files, or the bundles themselves (objects supporting the buffer protocol).
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. Default is None, the iterations of the header of each versioned bundle are used.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC of every bundle. Default is None.
+
+    max_workers : Optional[int]
+        The number of threads. Default is None, the number of CPUs.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    Returns
+    -------
+    report : dict
+        The numbers of `items`, of `passed` bundles, of `failed` bundles (invalid HMAC), of `errors` (unreadable or malformed items),
+        the `bytes` verified, the `seconds` of the audit, the throughput `MB_per_s`,
+        and the `entries` in the order of the items, with the `item` (path or index), its `status` (`ok`, `failed` or `error`), its `bytes` and its `error`.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty or if iterations or max_workers is not a strictly positive integer.
+    """
+    # Check the types of the parameters
+    bundles = list(bundles)
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if (iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError("Parameter max_workers is not integer")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if (iterations is not None) and (iterations <= 0):
+        raise ValueError('Parameter iterations must be a positive integer.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a positive integer.')
+
+    max_workers = max_workers or os.cpu_count() or 1
+    key_cache = KeyCache(max_size=max(len(bundles), 1), ttl=None)
+    start = time.perf_counter()
+
+    def audit_item(index: int, bundle: Any) -> Dict:
+        is_path = isinstance(bundle, (str, os.PathLike))
+        entry = {"item": os.fspath(bundle) if is_path else index}
+        try:
+            if is_path:
+                with open_bundle(bundle) as encrypted_bundle:
+                    entry["bytes"] = len(encrypted_bundle)
+                    valid = verify_bundle(encrypted_bundle, password, iterations, authdata=authdata, delete_keys=False, key_cache=key_cache)
+            else:
+                entry["bytes"] = buffer_nbytes(bundle, 'bundle')
+                valid = verify_bundle(bundle, password, iterations, authdata=authdata, delete_keys=False, key_cache=key_cache)
+            entry["status"] = "ok" if valid else "failed"
+            if not valid:
+                entry["error"] = "The HMAC is not valid. The data has been tampered with or the password is incorrect."
+        except Exception as e:
+            entry["status"] = "error"
+            entry["error"] = f"{type(e).__name__}: {e}"
+        return entry
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            entries = list(executor.map(audit_item, range(len(bundles)), bundles))
+    finally:
+        # Deleting from memory all critical data for security
+        key_cache.clear()
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+
+    # Build the report
+    seconds = time.perf_counter() - start
+    verified = sum(entry.get("bytes", 0) for entry in entries if entry["status"] != "error")
+    return {
+        "items": len(entries),
+        "passed": sum(1 for entry in entries if entry["status"] == "ok"),
+        "failed": sum(1 for entry in entries if entry["status"] == "failed"),
+        "errors": sum(1 for entry in entries if entry["status"] == "error"),
+        "bytes": verified,
+        "seconds": seconds,
+        "MB_per_s": verified / seconds / 1e6 if seconds > 0 else 0.0,
+        "entries": entries,
+    }
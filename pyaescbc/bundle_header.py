@@ -0,0 +1,103 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+from typing import NamedTuple
+
+# Layout of the header: magic (8 bytes) | version (1 byte) | kdf (1 byte) | flags (2 bytes) | iterations (4 bytes) | payload_length (8 bytes)
+HEADER_STRUCT = struct.Struct(">8sBBHIQ")
+HEADER_LENGTH = HEADER_STRUCT.size  # 24 bytes
+BUNDLE_MAGIC = b"PYAESCBC"
+BUNDLE_VERSION = 1
+
+# Identifiers of the key derivation functions
+KDF_PBKDF2_SHA256 = 1  # Password-based bundles, see pyaescbc.derive_key
+KDF_HKDF_SHA256 = 2  # Raw-key bundles, see pyaescbc.derive_key_hkdf
+KDF_PBKDF2_HKDF_SHA256 = 3  # Password-based bundles with one PBKDF2 block expanded by HKDF, see pyaescbc.derive_key_v2
+KDF_IDS = (KDF_PBKDF2_SHA256, KDF_HKDF_SHA256, KDF_PBKDF2_HKDF_SHA256)
+PASSWORD_KDF_IDS = (KDF_PBKDF2_SHA256, KDF_PBKDF2_HKDF_SHA256)
+
+# Flags of the header
+FLAG_CHUNKED = 0x0001  # Seekable chunked bundle, see pyaescbc.encrypt_chunked_stream
+FLAG_LOG = 0x0002  # Append-only encrypted log, see pyaescbc.EncryptedLog
+
+class BundleHeader(NamedTuple):
+    """
+    Versioned header of a self-describing encrypted bundle.
+
+    A versioned bundle is the header followed by the legacy layout:
+
+    .. code-block:: console
+
+        header (24 bytes) | iv (16 bytes) | salt (32 bytes) | hmac (32 bytes) | cipherdata
+
+    The header is covered by the HMAC, so it can not be modified without the decryption failing.
+    It is read with :func:`pyaescbc.read_bundle_header`, and skipped by :func:`pyaescbc.extract_cryptography_components`.
+
+    .. warning::
+
+        The header is only authenticated once the HMAC is checked. The iterations read from an untrusted bundle
+        can be very large, check them before deriving the key if the bundle comes from an untrusted source.
+
+    Parameters
+    ----------
+    version : int
+        The format version. The current version is 1.
+
+    kdf : int
+        The identifier of the key derivation function: 1 for PBKDF2-SHA256 (password), 2 for HKDF-SHA256 (raw key),
+        3 for one PBKDF2-SHA256 block expanded with HKDF-SHA256 (password, see :func:`pyaescbc.derive_key_v2`).
+
+    iterations : int
+        The number of iterations for PBKDF2, 0 if the KDF does not use iterations.
+
+    payload_length : int
+        The length of the cipherdata in bytes.
+
+    flags : int
+        The 16 bits of options of the bundle. ``FLAG_CHUNKED`` (0x0001) marks a seekable chunked bundle
+        (see :func:`pyaescbc.encrypt_chunked_stream`), whose payload length is the length of the clear data.
+        ``FLAG_LOG`` (0x0002) marks an append-only encrypted log (see :class:`pyaescbc.EncryptedLog`), whose payload length is 0.
+    """
+    version: int
+    kdf: int
+    iterations: int
+    payload_length: int
+    flags: int = 0
+
+    def to_bytearray(self) -> bytearray:
+        """
+        Serializes the header in its 24-byte binary form.
+
+        Returns
+        -------
+        header : bytearray
+            The 24-byte header.
+
+        Raises
+        ------
+        ValueError
+            If a field is out of range or if the version or the KDF is unknown.
+        """
+        if self.version != BUNDLE_VERSION:
+            raise ValueError(f'Bundle version {self.version} is not supported.')
+        if self.kdf not in KDF_IDS:
+            raise ValueError(f'Bundle KDF {self.kdf} is not supported.')
+        if not 0 <= self.iterations < 2**32:
+            raise ValueError('Header iterations must fit in 32 bits.')
+        if not 0 <= self.payload_length < 2**64:
+            raise ValueError('Header payload_length must fit in 64 bits.')
+        if not 0 <= self.flags < 2**16:
+            raise ValueError('Header flags must fit in 16 bits.')
+        return bytearray(HEADER_STRUCT.pack(BUNDLE_MAGIC, self.version, self.kdf, self.flags, self.iterations, self.payload_length))
@@ -0,0 +1,135 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from typing import Optional, Tuple
+
+from .random_bytearray import random_bytearray
+from .random_salt import random_salt
+from .delete_bytearray import delete_bytearray
+
+# PBKDF2-SHA256 throughput of the host in iterations per second, measured once per process
+_throughput: Optional[float] = None
+_throughput_lock = threading.Lock()
+
+def _measure_throughput(min_duration: float = 0.05, repeat: int = 3) -> float:
+    """
+    Measures the PBKDF2-SHA256 throughput of the host (iterations per second) with :func:`pyaescbc.derive_key`.
+
+    The number of iterations is doubled until a single derivation lasts at least ``min_duration`` seconds,
+    then the best of ``repeat`` derivations is kept to reduce the noise of the other processes.
+    """
+    from .derive_key import derive_key  # Imported on first use, the iterations can be generated without loading the cryptography backend
+
+    password = random_bytearray(32)
+    salt = random_salt()
+    try:
+        iterations = 10_000
+        while True:
+            start = time.perf_counter()
+            delete_bytearray(derive_key(password, salt, iterations))
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_duration:
+                break
+            iterations *= 2
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            delete_bytearray(derive_key(password, salt, iterations))
+            elapsed = min(elapsed, time.perf_counter() - start)
+    finally:
+        delete_bytearray(password)
+        delete_bytearray(salt)
+    return iterations / elapsed
+
+def calibrate_iterations(target_latency: float = 0.25, tolerance: float = 0.1, refresh: bool = False) -> Tuple[int, int]:
+    """
+    Computes the range of PBKDF2 iterations matching a derivation latency on the current host.
+
+    The PBKDF2-SHA256 throughput of the host is measured the first time the function is called (about 0.2 seconds),
+    and the result is cached for the lifetime of the process. The range is then given by:
+
+    .. code-block:: console
+
+        Nmin = throughput * target_latency * (1 - tolerance)
+        Nmax = throughput * target_latency * (1 + tolerance)
+
+    The range can be given to :func:`pyaescbc.generate_random_iterations` and :func:`pyaescbc.generate_pin_iterations`
+    in place of their hard-coded defaults, or directly with their ``target_latency`` parameter.
+
+    .. code-block:: python
+
+        import pyaescbc
+
+        Nmin, Nmax = pyaescbc.calibrate_iterations(target_latency=0.25, tolerance=0.1)  # 250 ms +/- 10 %
+        iterations = pyaescbc.generate_random_iterations(Nmin, Nmax)
+
+    .. warning::
+
+        The calibrated range depends on the host. An encrypted bundle must be decrypted with the same number of iterations,
+        so the iterations must be stored or transmitted with the bundle, and a calibrated range must not be used with
+        :func:`pyaescbc.generate_pin_iterations` if the bundle can be decrypted on another computer.
+
+    Parameters
+    ----------
+    target_latency : float
+        The targeted duration of one key derivation in seconds. It must be strictly positive. Default is 0.25.
+
+    tolerance : float
+        The relative half-width of the range. It must be in ]0, 1[. Default is 0.1 (+/- 10 %).
+
+    refresh : bool
+        Measure the throughput of the host again instead of using the cached value. Default is False.
+
+    Returns
+    -------
+    Nmin : int
+        The minimum number of iterations.
+
+    Nmax : int
+        The maximum number of iterations.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If target_latency is not strictly positive or if tolerance is not in ]0, 1[.
+    """
+    global _throughput
+
+    # Check the types of the parameters
+    if isinstance(target_latency, bool) or not isinstance(target_latency, (int, float)):
+        raise TypeError('Parameter target_latency is not float instance.')
+    if isinstance(tolerance, bool) or not isinstance(tolerance, (int, float)):
+        raise TypeError('Parameter tolerance is not float instance.')
+    if not isinstance(refresh, bool):
+        raise TypeError('Parameter refresh is not a boolean.')
+
+    # Check the values of the parameters
+    if not target_latency > 0:
+        raise ValueError('Parameter target_latency must be strictly positive.')
+    if not 0 < tolerance < 1:
+        raise ValueError('Parameter tolerance must be in ]0, 1[.')
+
+    # Measure the throughput of the host once per process
+    with _throughput_lock:
+        if refresh or _throughput is None:
+            _throughput = _measure_throughput()
+        throughput = _throughput
+
+    # Map the latency budget to the range of iterations
+    Nmin = max(1, int(throughput * target_latency * (1 - tolerance)))
+    Nmax = max(Nmin + 1, int(throughput * target_latency * (1 + tolerance)))
+    return Nmin, Nmax
@@ -13,17 +13,22 @@
 # limitations under the License.
 
 import hmac
+from typing import Any
 
-def check_hmac(given_hmac: bytearray, expected_hmac: bytearray) -> bool:
+from ._buffer import buffer_nbytes
+from .instrumentation import instrumented
+
+@instrumented("check_hmac", auth=True)
+def check_hmac(given_hmac: Any, expected_hmac: Any) -> bool:
     """
     Verifies if the derived 32-byte given HMAC matches the expected HMAC.
 
     Parameters
     ----------
-    given_hmac : bytearray
+    given_hmac : buffer
         The 32-byte long HMAC to verify.
 
-    expected_hmac : bytearray
+    expected_hmac : buffer
         The 32-byte long expected HMAC.
 
     Returns
@@ -34,20 +39,18 @@ def check_hmac(given_hmac: bytearray, expected_hmac: bytearray) -> bool:
     Raises
     ------
     TypeError
-        If any argument is not a `bytearray` instance.
+        If any argument does not support the buffer protocol.
     ValueError
         If the given_hmac or expected_hmac isn't 32 bytes.
     """
     # Check the types of the parameters
-    if not isinstance(given_hmac, bytearray):
-        raise TypeError('Parameter given_hmac is not bytearray instance.')
-    if not isinstance(expected_hmac, bytearray):
-        raise TypeError('Parameter expected_hmac is not bytearray instance.')
+    given_hmac_length = buffer_nbytes(given_hmac, 'given_hmac')
+    expected_hmac_length = buffer_nbytes(expected_hmac, 'expected_hmac')
 
     # Check the value of the parameters
-    if len(given_hmac) != 32:
+    if given_hmac_length != 32:
         raise ValueError(f'{given_hmac=} is not 32 bytes long.') 
-    if len(expected_hmac) != 32:
+    if expected_hmac_length != 32:
         raise ValueError(f'{expected_hmac=} is not 32 bytes long.') 
 
     # Compare the HMACs
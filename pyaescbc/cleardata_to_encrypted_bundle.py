@@ -16,18 +16,24 @@ from typing import Optional
 
 from .random_salt import random_salt
 from .random_iv import random_iv
-from .derive_key import derive_key
-from .encrypt_AES_CBC import encrypt_AES_CBC
-from .create_hmac import create_hmac
-from .create_encrypted_bundle import create_encrypted_bundle
+from ._kdf import derive_password_key
+from .encrypt_AES_CBC_HMAC_into import encrypt_AES_CBC_HMAC_into
+from .allocate_encrypted_bundle import allocate_encrypted_bundle
 from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .bundle_header import BundleHeader, BUNDLE_VERSION, KDF_PBKDF2_SHA256, PASSWORD_KDF_IDS
+from .instrumentation import instrumented
 
+@instrumented("cleardata_to_encrypted_bundle", nbytes="cleardata", iterations="iterations")
 def cleardata_to_encrypted_bundle(
     cleardata: bytearray, 
     password: bytearray, 
     iterations: int,
     authdata: Optional[bytearray] = None,
-    delete_keys: bool = True
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None,
+    versioned: bool = False,
+    kdf: int = KDF_PBKDF2_SHA256
 ) -> bytearray: 
     """
     cleardata_to_encrypted_bundle encrypts the clear data to generate the encrypted bundle.
@@ -39,6 +45,12 @@ def cleardata_to_encrypted_bundle(
         The cleardata, the password and the authdata are deleted from memory at the end of the function if delete_keys is True.
         Otherwise, they need to be deleted after dealing with Exception.
 
+    .. note::
+
+        With ``versioned=True``, the bundle starts with a header carrying the KDF and the iterations (see :class:`pyaescbc.BundleHeader`),
+        so it can be decrypted without giving the iterations again. The header is covered by the HMAC.
+        A versioned bundle can use the faster KDF ``KDF_PBKDF2_HKDF_SHA256`` (see :func:`pyaescbc.derive_key_v2`).
+
     .. note::
 
         An alias for this function is ``encrypt``
@@ -71,6 +83,17 @@ def cleardata_to_encrypted_bundle(
     delete_keys : bool
         Delete the cleardata, the password and authdata from memory at the end of the function. Default is True.
 
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    versioned : bool
+        Create a versioned bundle starting with a header (see :class:`pyaescbc.BundleHeader`). Default is False (legacy bundle).
+
+    kdf : int
+        The key derivation function recorded in the header: ``KDF_PBKDF2_SHA256`` (:func:`pyaescbc.derive_key`, default)
+        or ``KDF_PBKDF2_HKDF_SHA256`` (:func:`pyaescbc.derive_key_v2`, versioned bundles only).
+
     Returns
     -------
     encrypted_bundle : bytearray
@@ -81,7 +104,8 @@ def cleardata_to_encrypted_bundle(
     TypeError
         If an argument is of the wrong type.
     ValueError
-        If password is empty or if iterations is not a strictly positive integer.
+        If password is empty or if iterations is not a strictly positive integer (lower than 2**32 for a versioned bundle).
+        If kdf is not a password-based KDF, or is not ``KDF_PBKDF2_SHA256`` for a legacy bundle.
     """
     # Check the types of the parameters
     if (not isinstance(cleardata, bytearray)) or (not isinstance(password, bytearray)):
@@ -92,20 +116,51 @@ def cleardata_to_encrypted_bundle(
         raise TypeError("Parameter authdata is not bytearray")
     if not isinstance(delete_keys, bool):
         raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+    if not isinstance(versioned, bool):
+        raise TypeError("Parameter versioned is not a boolean.")
+    if not isinstance(kdf, int):
+        raise TypeError("Parameter kdf is not integer")
+
+    # Check the values of the parameters
+    if versioned and not (0 < iterations < 2**32):
+        raise ValueError("Parameter iterations must be a positive integer lower than 2**32 for a versioned bundle.")
+    if kdf not in PASSWORD_KDF_IDS:
+        raise ValueError(f"Parameter kdf {kdf} is not a password-based KDF.")
+    if (not versioned) and kdf != KDF_PBKDF2_SHA256:
+        raise ValueError("Parameter kdf requires a versioned bundle, a legacy bundle can not record it.")
 
     # Encryption
+    salt = bytearray()
+    iv = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    expected_hmac = bytearray()
+    views = []
     try:
         salt = random_salt()
         iv = random_iv()
-        derived_key = derive_key(password, salt, iterations)
+        derived_key = derive_password_key(password, salt, iterations, kdf, key_cache)
         aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
         hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
-        cipherdata = encrypt_AES_CBC(cleardata, aes_key, iv)
-        expected_hmac = create_hmac(hmac_key, iv, cipherdata, authdata=authdata)
-        encrypted_bundle = create_encrypted_bundle(iv, salt, expected_hmac, cipherdata)
+        # Build the bundle in place: the cipherdata is encrypted and authenticated directly into the bundle in a single pass
+        cipherdata_length = 16 * (len(cleardata) // 16 + 1)
+        bundle_header = BundleHeader(BUNDLE_VERSION, kdf, iterations, cipherdata_length) if versioned else None
+        encrypted_bundle, *views = allocate_encrypted_bundle(cipherdata_length, header=bundle_header)
+        iv_view, salt_view, hmac_view, cipherdata_view = views
+        iv_view[:] = iv
+        salt_view[:] = salt
+        header = None if bundle_header is None else bundle_header.to_bytearray()  # The header is authenticated with the cipherdata
+        expected_hmac = encrypt_AES_CBC_HMAC_into(cleardata, aes_key, hmac_key, iv, cipherdata_view, authdata=authdata, header=header)
+        hmac_view[:] = expected_hmac
     except Exception as e:
         raise e
     finally:
+        # Releasing the views on the bundle
+        for view in views:
+            view.release()
         # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
         if delete_keys:
             delete_bytearray(cleardata)
@@ -117,7 +172,6 @@ def cleardata_to_encrypted_bundle(
         delete_bytearray(derived_key)
         delete_bytearray(aes_key)
         delete_bytearray(hmac_key)
-        delete_bytearray(cipherdata)
         delete_bytearray(expected_hmac)
 
     # Return the encrypted bundle
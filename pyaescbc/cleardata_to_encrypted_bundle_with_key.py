@@ -0,0 +1,147 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+from .random_salt import random_salt
+from .random_iv import random_iv
+from .derive_key_hkdf import derive_key_hkdf
+from .encrypt_AES_CBC_HMAC_into import encrypt_AES_CBC_HMAC_into
+from .allocate_encrypted_bundle import allocate_encrypted_bundle
+from .delete_bytearray import delete_bytearray
+from .bundle_header import BundleHeader, BUNDLE_VERSION, KDF_HKDF_SHA256
+
+def cleardata_to_encrypted_bundle_with_key(
+    cleardata: bytearray,
+    master_key: bytearray,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+    versioned: bool = False,
+) -> bytearray:
+    """
+    cleardata_to_encrypted_bundle_with_key encrypts the clear data with a high-entropy master key to generate the encrypted bundle.
+
+    This is the raw-key mode of :func:`pyaescbc.cleardata_to_encrypted_bundle`: the AES and HMAC keys are derived from the master key
+    and the random salt of the bundle with HKDF (see :func:`pyaescbc.derive_key_hkdf`) instead of PBKDF2, so no iterations are needed
+    and the cost per message is dominated by AES and HMAC. The encrypted bundle has the same layout.
+
+    .. warning::
+
+        The master key must be a random key (for example a 256-bit key from a secrets manager).
+        A password must be used with :func:`pyaescbc.cleardata_to_encrypted_bundle`, whose PBKDF2 iterations slow down brute force attacks.
+
+    .. note::
+
+        The cleardata, the master key and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc
+
+        master_key = pyaescbc.random_bytearray(32)
+        cleardata = bytearray("Hello, World!", 'utf-8')
+        encrypted_bundle = pyaescbc.cleardata_to_encrypted_bundle_with_key(cleardata, master_key, delete_keys=False)
+
+    Parameters
+    ----------
+    cleardata : bytearray
+        The clear message to encrypt using AES in CBC mode.
+
+    master_key : bytearray
+        The master key. It must be at least 32 bytes long.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+        If not None, it will be used to create the HMAC.
+
+    delete_keys : bool
+        Delete the cleardata, the master key and authdata from memory at the end of the function. Default is True.
+
+    versioned : bool
+        Create a versioned bundle starting with a header (see :class:`pyaescbc.BundleHeader`). Default is False (legacy bundle).
+
+    Returns
+    -------
+    encrypted_bundle : bytearray
+        The encrypted bundle.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If master_key is shorter than 32 bytes.
+    """
+    # Check the types of the parameters
+    if not isinstance(cleardata, bytearray):
+        raise TypeError("Parameter cleardata is not bytearray instance.")
+    if not isinstance(master_key, bytearray):
+        raise TypeError("Parameter master_key is not bytearray instance.")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray instance.")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if not isinstance(versioned, bool):
+        raise TypeError("Parameter versioned is not a boolean.")
+
+    # Check the values of the parameters
+    if len(master_key) < 32:
+        raise ValueError('Parameter master_key must be at least 32 bytes long.')
+
+    # Encryption
+    salt = bytearray()
+    iv = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    expected_hmac = bytearray()
+    views = []
+    try:
+        salt = random_salt()
+        iv = random_iv()
+        derived_key = derive_key_hkdf(master_key, salt)
+        aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+        # Build the bundle in place: the cipherdata is encrypted and authenticated directly into the bundle in a single pass
+        cipherdata_length = 16 * (len(cleardata) // 16 + 1)
+        bundle_header = BundleHeader(BUNDLE_VERSION, KDF_HKDF_SHA256, 0, cipherdata_length) if versioned else None
+        encrypted_bundle, *views = allocate_encrypted_bundle(cipherdata_length, header=bundle_header)
+        iv_view, salt_view, hmac_view, cipherdata_view = views
+        iv_view[:] = iv
+        salt_view[:] = salt
+        header = None if bundle_header is None else bundle_header.to_bytearray()  # The header is authenticated with the cipherdata
+        expected_hmac = encrypt_AES_CBC_HMAC_into(cleardata, aes_key, hmac_key, iv, cipherdata_view, authdata=authdata, header=header)
+        hmac_view[:] = expected_hmac
+    except Exception as e:
+        raise e
+    finally:
+        # Releasing the views on the bundle
+        for view in views:
+            view.release()
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(cleardata)
+            delete_bytearray(master_key)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(salt)
+        delete_bytearray(iv)
+        delete_bytearray(derived_key)
+        delete_bytearray(aes_key)
+        delete_bytearray(hmac_key)
+        delete_bytearray(expected_hmac)
+
+    # Return the encrypted bundle
+    return encrypted_bundle
@@ -12,59 +12,78 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-def create_encrypted_bundle(iv: bytearray, salt: bytearray, expected_hmac: bytearray, cipherdata: bytearray) -> bytearray:
+from typing import Any, Optional
+
+from ._buffer import buffer_nbytes
+from .bundle_header import BundleHeader, HEADER_LENGTH
+
+def create_encrypted_bundle(iv: Any, salt: Any, expected_hmac: Any, cipherdata: Any, header: Optional[BundleHeader] = None) -> bytearray:
     """
     Creates a bytearray containing all the information needed to decrypt the data.
 
     The encrypted bundle is composed by the initialization vector (IV), the salt, the expected HMAC and the cipherdata.
+    If a header is given, the bundle is a versioned bundle starting with the header (see :class:`pyaescbc.BundleHeader`).
+    In that case, the expected HMAC must have been computed over the header (see :func:`pyaescbc.create_hmac`).
 
     .. seealso::
 
         - function :func:`pyaescbc.extract_cryptography_components` to extract the components from the encrypted bundle.
+        - function :func:`pyaescbc.allocate_encrypted_bundle` to build the encrypted bundle in place.
 
     Parameters
     ----------
-    iv : bytearray
+    iv : buffer
         The 16-byte initialization vector used for encryption.
 
-    salt : bytearray
+    salt : buffer
         The 32-byte salt used to generate the derived key.
 
-    expected_hmac : bytearray
+    expected_hmac : buffer
         The 32-byte expected HMAC.
 
-    cipherdata : bytearray
+    cipherdata : buffer
         The encrypted message.
 
+    header : Optional[BundleHeader]
+        The header of a versioned bundle. Default is None (legacy bundle).
+
     Returns
     -------
     encrypted_bundle : bytearray
-        The concatenated bytearray containing `iv + salt + expected_hmac + cipherdata`.
+        The concatenated bytearray containing `iv + salt + expected_hmac + cipherdata` (`header + iv + salt + expected_hmac + cipherdata` with a header).
 
     Raises
     ------
     TypeError
-        If any argument is not a `bytearray` instance.
+        If any argument does not support the buffer protocol or if header is not a BundleHeader.
     ValueError
-        If any of the components (salt, iv, hmac) are not the correct length.
+        If any of the components (salt, iv, hmac) are not the correct length or if the payload length of the header does not match the cipherdata.
     """
     # Check the types of the parameters
-    if not isinstance(iv, bytearray):
-        raise TypeError('Parameter iv is not bytearray instance.')
-    if not isinstance(salt, bytearray):
-        raise TypeError('Parameter salt is not bytearray instance.')
-    if not isinstance(expected_hmac, bytearray):
-        raise TypeError('Parameter expected_hmac is not bytearray instance.')
-    if not isinstance(cipherdata, bytearray):
-        raise TypeError('Parameter cipherdata is not bytearray instance.')
+    iv_length = buffer_nbytes(iv, 'iv')
+    salt_length = buffer_nbytes(salt, 'salt')
+    expected_hmac_length = buffer_nbytes(expected_hmac, 'expected_hmac')
+    cipherdata_length = buffer_nbytes(cipherdata, 'cipherdata')
+    if (header is not None) and (not isinstance(header, BundleHeader)):
+        raise TypeError('Parameter header is not BundleHeader instance.')
     
     # Check the values of the parameters
-    if len(iv) != 16:
+    if iv_length != 16:
         raise ValueError(f'{iv=} is not 16 bytes long.') 
-    if len(salt) != 32:
+    if salt_length != 32:
         raise ValueError(f'{salt=} is not 32 bytes long.') 
-    if len(expected_hmac) != 32:
+    if expected_hmac_length != 32:
         raise ValueError(f'{expected_hmac=} is not 32 bytes long.')
+    if (header is not None) and (header.payload_length != cipherdata_length):
+        raise ValueError('The payload length of the header does not match the length of cipherdata.')
 
-    # Create the encrypted bundle
-    return iv + salt + expected_hmac + cipherdata
+    # Create the encrypted bundle in a single allocation
+    offset = 0 if header is None else HEADER_LENGTH
+    encrypted_bundle = bytearray(offset + 80 + cipherdata_length)
+    if header is not None:
+        encrypted_bundle[0:offset] = header.to_bytearray()
+    encrypted_bundle[offset:offset + 16] = iv
+    encrypted_bundle[offset + 16:offset + 48] = salt
+    encrypted_bundle[offset + 48:offset + 80] = expected_hmac
+    encrypted_bundle[offset + 80:] = cipherdata
+    return encrypted_bundle
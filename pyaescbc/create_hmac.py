@@ -14,9 +14,13 @@
 
 import hmac
 import hashlib
-from typing import Optional
+from typing import Optional, Any
 
-def create_hmac(hmac_key: bytearray, iv: bytearray, cipherdata: bytearray, authdata: Optional[bytearray] = None) -> bytearray:
+from ._buffer import buffer_nbytes
+from .instrumentation import instrumented
+
+@instrumented("create_hmac", nbytes="cipherdata")
+def create_hmac(hmac_key: Any, iv: Any, cipherdata: Any, authdata: Optional[Any] = None, header: Optional[Any] = None) -> bytearray:
     """
     Creates the expected HMAC using the hmac_key on the iv, cipherdata, and optional auth_data.
     The HMAC is created using the SHA-256 hash function. The HMAC is used to verify the integrity of the encrypted message.
@@ -25,6 +29,10 @@ def create_hmac(hmac_key: bytearray, iv: bytearray, cipherdata: bytearray, authd
     .. code-block:: console
 
         HMAC = HMAC(key, SHA256(iv + cipherdata + authdata))
+        HMAC = HMAC(key, SHA256(header + iv + cipherdata + authdata))  # Versioned bundles
+
+    The components are fed one after the other to the HMAC, so they are never concatenated in memory.
+    They can be any object supporting the buffer protocol (bytearray, bytes, memoryview, mmap, ...).
 
     .. seealso::
 
@@ -32,18 +40,21 @@ def create_hmac(hmac_key: bytearray, iv: bytearray, cipherdata: bytearray, authd
 
     Parameters
     ----------
-    hmac_key : bytearray
+    hmac_key : buffer
         The 32-byte long key used to create the HMAC. It is extracted from the derived key.
 
-    iv : bytearray
+    iv : buffer
         The 16-byte long initialization vector used for encryption.
 
-    cipherdata : bytearray
+    cipherdata : buffer
         The encrypted message.
 
-    authdata : Optional[bytearray]
+    authdata : Optional[buffer]
         Optional additional authentication data. If provided, it is prepended to the HMAC input.
 
+    header : Optional[buffer]
+        Optional header of a versioned bundle (see :class:`pyaescbc.BundleHeader`), prepended to the HMAC input. Default is None.
+
     Returns
     -------
     expected_hmac : bytearray
@@ -52,30 +63,34 @@ def create_hmac(hmac_key: bytearray, iv: bytearray, cipherdata: bytearray, authd
     Raises
     ------
     TypeError
-        If any argument is not a `bytearray` instance.
+        If any argument does not support the buffer protocol.
 
     ValueError
         If the hmac_key isn't 32 bytes, the IV isn't 16 bytes.
     """
     # Check the types of the parameters
-    if not isinstance(hmac_key, bytearray):
-        raise TypeError('Parameter hmac_key is not bytearray instance.')
-    if not isinstance(iv, bytearray):
-        raise TypeError('Parameter iv is not bytearray instance.')
-    if not isinstance(cipherdata, bytearray):
-        raise TypeError('Parameter cipherdata is not bytearray instance.')
-    if authdata is not None and not isinstance(authdata, bytearray):
-        raise TypeError('Parameter authdata is not bytearray instance.')
+    hmac_key_length = buffer_nbytes(hmac_key, 'hmac_key')
+    iv_length = buffer_nbytes(iv, 'iv')
+    buffer_nbytes(cipherdata, 'cipherdata')
+    if authdata is not None:
+        buffer_nbytes(authdata, 'authdata')
+    if header is not None:
+        buffer_nbytes(header, 'header')
     
     # Check the value of the parameters
-    if len(hmac_key) != 32:
-        raise ValueError(f'{hmac_key=} is not 32 bytes long.') 
-    if len(iv) != 16:
-        raise ValueError(f'{iv=} is not 16 bytes long.')
+    if hmac_key_length != 32:
+        raise ValueError('Parameter hmac_key is not 32 bytes long.')
+    if iv_length != 16:
+        raise ValueError('Parameter iv is not 16 bytes long.')
 
     # Create the HMAC
-    if authdata is None:
-        authdata = bytearray()
-    expected_hmac = bytearray(hmac.new(hmac_key, iv + cipherdata + authdata, hashlib.sha256).digest())
+    mac = hmac.new(hmac_key, digestmod=hashlib.sha256)
+    if header is not None:
+        mac.update(header)
+    mac.update(iv)
+    mac.update(cipherdata)
+    if authdata is not None:
+        mac.update(authdata)
+    expected_hmac = bytearray(mac.digest())
 
     return expected_hmac
@@ -12,35 +12,46 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from cryptography.hazmat.primitives import padding, ciphers
-from cryptography.hazmat.backends import default_backend
+from typing import Any, Optional
 
-def decrypt_AES_CBC(cipherdata: bytearray, aes_key: bytearray, iv: bytearray) -> bytearray:
+from .decrypt_AES_CBC_into import decrypt_AES_CBC_into
+from ._buffer import buffer_nbytes
+from .instrumentation import instrumented
+
+@instrumented("decrypt_AES_CBC", nbytes="cipherdata")
+def decrypt_AES_CBC(cipherdata: Any, aes_key: Any, iv: Any, max_workers: Optional[int] = None) -> bytearray:
     """
     Decrypts a cipherdata message using AES in CBC mode.
 
     The data is unpadded using PKCS7 padding and then decrypted using AES in CBC mode.
     The aes_key is the first 32 bytes of the derived key, and the iv is the initialization vector.
 
+    The cleardata is decrypted into a single bytearray by :func:`pyaescbc.decrypt_AES_CBC_into`, which is then shrunk to the unpadded length.
+    With ``max_workers``, large cipherdata is decrypted in parallel segments on a thread pool, with an identical output.
+
     .. seealso::
 
         function :func:`pyaescbc.derive_key` to create the derived key.
 
     .. note::
 
-        The cipherdata, aes_key and iv must be bytearrays.
+        The cipherdata, aes_key and iv can be any object supporting the buffer protocol (bytearray, bytes, memoryview, mmap, ...),
+        for example views on an encrypted bundle (see :func:`pyaescbc.extract_cryptography_views`).
 
     Parameters
     ----------
-    cipherdata : bytearray
+    cipherdata : buffer
         The encrypted message to decrypt using AES in CBC mode.
 
-    aes_key : bytearray
+    aes_key : buffer
         The 32-byte AES key derived from the password, salt and iterations.
 
-    iv : bytearray
+    iv : buffer
         The 16-byte initialization vector (IV) to use in AES-CBC mode.
 
+    max_workers : Optional[int]
+        The number of threads decrypting the cipherdata in parallel. Default is None, the cipherdata is decrypted in a single pass.
+
     Returns
     -------
     cleardata : bytearray
@@ -49,30 +60,17 @@ def decrypt_AES_CBC(cipherdata: bytearray, aes_key: bytearray, iv: bytearray) ->
     Raises
     ------
     TypeError
-        If a given argument is not a `bytearray` instance.
+        If a given argument does not support the buffer protocol.
     ValueError
-        If the `aes_key` isn't 32 bytes long or the `iv` isn't 16 bytes long.
+        If the `aes_key` isn't 32 bytes long, the `iv` isn't 16 bytes long, the cipherdata is not valid or max_workers is not strictly positive.
     """
     # Check the types of the parameters
-    if not isinstance(cipherdata, bytearray):
-        raise TypeError('Parameter cipherdata is not bytearray instance.')
-    if not isinstance(aes_key, bytearray):
-        raise TypeError('Parameter aes_key is not bytearray instance.')
-    if not isinstance(iv, bytearray):
-        raise TypeError('Parameter iv is not bytearray instance.')
-
-    # Check the values of the parameters
-    if len(aes_key) != 32:
-        raise ValueError(f'{aes_key=} is not 64 bytes long.') 
-    if len(iv) != 16:
-        raise ValueError(f'{iv=} is not 16 bytes long.')
-    
+    cipherdata_length = buffer_nbytes(cipherdata, 'cipherdata')
+
     # Decrypt the data using AES in CBC mode
-    cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(iv), backend=default_backend())
-    decryptor = cipher.decryptor()
-    unpadder = padding.PKCS7(128).unpadder()  
-    decrypted_data = decryptor.update(cipherdata) + decryptor.finalize() 
-    unpadded_data = bytearray(unpadder.update(decrypted_data) + unpadder.finalize())
+    cleardata = bytearray(cipherdata_length)
+    size = decrypt_AES_CBC_into(cipherdata, aes_key, iv, cleardata, max_workers=max_workers)
+    del cleardata[size:]
 
     # Returning the decrypted clear data
-    return unpadded_data
+    return cleardata
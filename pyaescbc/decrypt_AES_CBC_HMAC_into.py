@@ -0,0 +1,174 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hmac
+import hashlib
+from typing import Any, Optional
+
+from cryptography.hazmat.primitives import padding, ciphers
+from cryptography.hazmat.backends import default_backend
+
+from ._buffer import byte_view, buffer_nbytes
+from ._parallel_cbc import decrypt_segments_into, last_block_iv
+from .check_hmac import check_hmac
+from .delete_bytearray import delete_bytearray
+from .auth_error import AuthError
+from .instrumentation import instrumented
+
+@instrumented("decrypt_AES_CBC_HMAC_into", nbytes="cipherdata")
+def decrypt_AES_CBC_HMAC_into(
+    cipherdata: Any,
+    aes_key: Any,
+    hmac_key: Any,
+    iv: Any,
+    expected_hmac: Any,
+    out: Any,
+    authdata: Optional[Any] = None,
+    chunk_size: int = 65_536,
+    header: Optional[Any] = None,
+    max_workers: Optional[int] = None
+) -> int:
+    """
+    Checks the HMAC of a cipherdata message and decrypts it using AES in CBC mode into a caller-provided buffer in the same pass.
+
+    This is the fused version of :func:`pyaescbc.create_hmac`, :func:`pyaescbc.check_hmac` and :func:`pyaescbc.decrypt_AES_CBC_into`:
+    the cipherdata is processed ``chunk_size`` bytes at a time, each chunk being fed to the HMAC and then decrypted while it is still in the CPU cache.
+    The last block is unpadded and written only once the HMAC is checked.
+    If the HMAC is not valid, the part of ``out`` already written is overwritten with zeros before :class:`pyaescbc.AuthError` is raised.
+
+    With ``max_workers``, the cipherdata is cut at block-aligned boundaries and the segments are decrypted on a thread pool
+    (each one with the last cipherdata block before it as IV), while the calling thread computes the HMAC. The output is identical.
+
+    Parameters
+    ----------
+    cipherdata : buffer
+        The encrypted message. Its length must be a strictly positive multiple of 16 bytes.
+
+    aes_key : buffer
+        The 32-byte AES key derived from the password, salt and iterations.
+
+    hmac_key : buffer
+        The 32-byte HMAC key derived from the password, salt and iterations.
+
+    iv : buffer
+        The 16-byte initialization vector (IV) to use in AES-CBC mode.
+
+    expected_hmac : buffer
+        The 32-byte expected HMAC.
+
+    out : buffer
+        The writable buffer receiving the cleardata. It must contain at least ``len(cipherdata) - 1`` bytes.
+
+    authdata : Optional[buffer]
+        Optional additional authentication data appended to the HMAC input. Default is None.
+
+    chunk_size : int
+        The number of bytes processed at each step. It must be a strictly positive multiple of 16. Default is 64 KiB.
+
+    header : Optional[buffer]
+        Optional header of a versioned bundle (see :class:`pyaescbc.BundleHeader`), prepended to the HMAC input. Default is None.
+
+    max_workers : Optional[int]
+        The number of threads decrypting the cipherdata in parallel. Default is None, the cipherdata is decrypted in a single pass by the calling thread.
+
+    Returns
+    -------
+    size : int
+        The number of bytes written at the beginning of ``out``.
+
+    Raises
+    ------
+    TypeError
+        If a given argument is of the wrong type or if out is read-only.
+    ValueError
+        If a key, the iv or the expected HMAC has a wrong length, if the cipherdata length is not valid, if `out` is too small or if `chunk_size` or `max_workers` is not valid.
+    AuthError
+        If the HMAC is not valid.
+    """
+    # Check the types of the parameters
+    cipherdata_length = buffer_nbytes(cipherdata, 'cipherdata')
+    aes_key_length = buffer_nbytes(aes_key, 'aes_key')
+    hmac_key_length = buffer_nbytes(hmac_key, 'hmac_key')
+    iv_length = buffer_nbytes(iv, 'iv')
+    buffer_nbytes(expected_hmac, 'expected_hmac')
+    out_length = buffer_nbytes(out, 'out')
+    if authdata is not None:
+        buffer_nbytes(authdata, 'authdata')
+    if header is not None:
+        buffer_nbytes(header, 'header')
+    if not isinstance(chunk_size, int):
+        raise TypeError('Parameter chunk_size is not int instance.')
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError('Parameter max_workers is not int instance.')
+
+    # Check the values of the parameters
+    if aes_key_length != 32:
+        raise ValueError('Parameter aes_key is not 32 bytes long.')
+    if hmac_key_length != 32:
+        raise ValueError('Parameter hmac_key is not 32 bytes long.')
+    if iv_length != 16:
+        raise ValueError('Parameter iv is not 16 bytes long.')
+    if chunk_size <= 0 or chunk_size % 16 != 0:
+        raise ValueError('Parameter chunk_size must be a strictly positive multiple of 16.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a strictly positive integer.')
+    if cipherdata_length == 0 or cipherdata_length % 16 != 0:
+        raise ValueError('The length of cipherdata must be a strictly positive multiple of 16 bytes.')
+    if out_length < cipherdata_length - 1:
+        raise ValueError(f'Parameter out must contain at least {cipherdata_length - 1} bytes.')
+
+    # Authenticate and decrypt all the blocks but the last one chunk by chunk
+    cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(iv), backend=default_backend())
+    decryptor = cipher.decryptor()
+    unpadder = padding.PKCS7(128).unpadder()
+    mac = hmac.new(hmac_key, digestmod=hashlib.sha256)
+    if header is not None:
+        mac.update(header)
+    mac.update(iv)
+    full_length = cipherdata_length - 16
+    given_hmac = bytearray()
+    with byte_view(cipherdata, 'cipherdata') as cipher_view, byte_view(out, 'out') as out_view:
+        if out_view.readonly:
+            raise TypeError('Parameter out is a read-only buffer.')
+        try:
+            if max_workers is not None and full_length > 0:
+                # Decrypt the segments on the thread pool while the HMAC is computed, then the last block with the previous cipherdata block as IV
+                decrypt_segments_into(cipher_view, aes_key, iv, out_view, full_length, max_workers, mac=mac, chunk_size=chunk_size)
+                cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(last_block_iv(cipher_view, iv, full_length)), backend=default_backend())
+                decryptor = cipher.decryptor()
+            else:
+                for start in range(0, full_length, chunk_size):
+                    stop = min(start + chunk_size, full_length)
+                    mac.update(cipher_view[start:stop])
+                    decryptor.update_into(cipher_view[start:stop], out_view[start:])
+            mac.update(cipher_view[full_length:])
+            if authdata is not None:
+                mac.update(authdata)
+            given_hmac = bytearray(mac.digest())
+            if not check_hmac(given_hmac, expected_hmac):
+                raise AuthError('The HMAC is not valid. The data has been tampered with or the password is incorrect.')
+        except Exception as e:
+            # Overwrite the unauthenticated cleardata already written
+            zeros = bytes(min(chunk_size, full_length))
+            for start in range(0, full_length, chunk_size):
+                stop = min(start + chunk_size, full_length)
+                out_view[start:stop] = zeros[:stop - start]
+            raise e
+        finally:
+            delete_bytearray(given_hmac)
+
+        # Unpad the last block once the data is authenticated
+        last_block = bytes(unpadder.update(decryptor.update(cipher_view[full_length:]) + decryptor.finalize())) + unpadder.finalize()
+        out_view[full_length:full_length + len(last_block)] = last_block
+    return full_length + len(last_block)
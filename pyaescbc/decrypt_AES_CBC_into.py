@@ -0,0 +1,113 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Optional
+
+from cryptography.hazmat.primitives import padding, ciphers
+from cryptography.hazmat.backends import default_backend
+
+from ._buffer import byte_view, buffer_nbytes
+from ._parallel_cbc import decrypt_segments_into, last_block_iv
+from .instrumentation import instrumented
+
+@instrumented("decrypt_AES_CBC_into", nbytes="cipherdata")
+def decrypt_AES_CBC_into(cipherdata: Any, aes_key: Any, iv: Any, out: Any, max_workers: Optional[int] = None) -> int:
+    """
+    Decrypts a cipherdata message using AES in CBC mode and writes the cleardata into a caller-provided buffer.
+
+    This is the version of :func:`pyaescbc.decrypt_AES_CBC` without allocation: all the blocks but the last one are decrypted
+    directly into ``out`` with the ``update_into`` method of the cipher context, and only the last block is unpadded.
+    The cleardata is at most ``len(cipherdata) - 1`` bytes long, so a buffer of ``len(cipherdata)`` bytes can be reused across calls.
+
+    With ``max_workers``, the cipherdata is cut at block-aligned boundaries and the segments are decrypted on a thread pool,
+    each one with the last cipherdata block before it as IV (CBC decryption only needs the previous cipherdata block).
+    The output is identical to the single pass. The segments are at least 1 MiB long, so small messages are still decrypted in one pass.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        out = bytearray(len(cipherdata))
+        size = aes.decrypt_AES_CBC_into(cipherdata, aes_key, iv, out)
+        cleardata = out[:size]
+
+    Parameters
+    ----------
+    cipherdata : buffer
+        The encrypted message to decrypt using AES in CBC mode (bytearray, bytes, memoryview, mmap or any object supporting the buffer protocol).
+        Its length must be a strictly positive multiple of 16 bytes.
+
+    aes_key : buffer
+        The 32-byte AES key derived from the password, salt and iterations.
+
+    iv : buffer
+        The 16-byte initialization vector (IV) to use in AES-CBC mode.
+
+    out : buffer
+        The writable buffer receiving the cleardata. It must contain at least ``len(cipherdata) - 1`` bytes.
+
+    max_workers : Optional[int]
+        The number of threads decrypting the cipherdata in parallel. Default is None, the cipherdata is decrypted in a single pass by the calling thread.
+
+    Returns
+    -------
+    size : int
+        The number of bytes written at the beginning of ``out``.
+
+    Raises
+    ------
+    TypeError
+        If a given argument does not support the buffer protocol or if out is read-only.
+    ValueError
+        If the `aes_key` isn't 32 bytes long, the `iv` isn't 16 bytes long, the cipherdata length is not valid, `out` is too small,
+        the padding is not valid or `max_workers` is not strictly positive.
+    """
+    # Check the types of the parameters
+    cipherdata_length = buffer_nbytes(cipherdata, 'cipherdata')
+    aes_key_length = buffer_nbytes(aes_key, 'aes_key')
+    iv_length = buffer_nbytes(iv, 'iv')
+    out_length = buffer_nbytes(out, 'out')
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError('Parameter max_workers is not int instance.')
+
+    # Check the values of the parameters
+    if aes_key_length != 32:
+        raise ValueError('Parameter aes_key is not 32 bytes long.')
+    if iv_length != 16:
+        raise ValueError('Parameter iv is not 16 bytes long.')
+    if cipherdata_length == 0 or cipherdata_length % 16 != 0:
+        raise ValueError('The length of cipherdata must be a strictly positive multiple of 16 bytes.')
+    if out_length < cipherdata_length - 1:
+        raise ValueError(f'Parameter out must contain at least {cipherdata_length - 1} bytes.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a strictly positive integer.')
+
+    # Decrypt all the blocks but the last one in place, then unpad the last block
+    cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(iv), backend=default_backend())
+    decryptor = cipher.decryptor()
+    unpadder = padding.PKCS7(128).unpadder()
+    full_length = cipherdata_length - 16
+    with byte_view(cipherdata, 'cipherdata') as cipher_view, byte_view(out, 'out') as out_view:
+        if out_view.readonly:
+            raise TypeError('Parameter out is a read-only buffer.')
+        if max_workers is not None and full_length > 0:
+            # Decrypt the segments in parallel, then the last block with the previous cipherdata block as IV
+            decrypt_segments_into(cipher_view, aes_key, iv, out_view, full_length, max_workers)
+            cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(last_block_iv(cipher_view, iv, full_length)), backend=default_backend())
+            decryptor = cipher.decryptor()
+        elif full_length > 0:
+            decryptor.update_into(cipher_view[:full_length], out_view)
+        last_block = bytes(unpadder.update(decryptor.update(cipher_view[full_length:]) + decryptor.finalize())) + unpadder.finalize()
+        out_view[full_length:full_length + len(last_block)] = last_block
+    return full_length + len(last_block)
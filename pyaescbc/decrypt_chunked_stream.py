@@ -0,0 +1,139 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional, BinaryIO
+
+from ._chunked import open_chunked, read_chunk, chunk_count
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+
+def decrypt_chunked_stream(
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None
+) -> int:
+    """
+    decrypt_chunked_stream decrypts a chunked bundle created by :func:`pyaescbc.encrypt_chunked_stream` and writes the clear data in the output stream.
+
+    The header MAC is checked first, then each chunk is authenticated before being decrypted and written.
+    The iterations can be omitted: they are read from the header of the bundle.
+    Only one chunk is held in memory.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. warning::
+
+        If a chunk has been tampered with, an AuthError is raised when it is reached,
+        and the chunks before it have already been written in the output stream. Discard the output on error.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        with open("video.mp4.aes", "rb") as input_stream, open("video.mp4", "wb") as output_stream:
+            aes.decrypt_chunked_stream(input_stream, output_stream, password)
+
+    Parameters
+    ----------
+    input_stream : BinaryIO
+        The readable and seekable binary stream containing the chunked bundle.
+
+    output_stream : BinaryIO
+        The writable binary stream receiving the clear data.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. Default is None, the iterations of the header are used.
+
+    authdata : Optional[bytearray]
+        The authentication data used in the HMACs. Default is None.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    Returns
+    -------
+    cleardata_size : int
+        The number of bytes written in the output stream.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations is not a strictly positive integer or does not match the header,
+        or if the stream does not contain a complete chunked bundle.
+    AuthError
+        If the header MAC or the HMAC of a chunk is not valid.
+    """
+    # Check the types of the parameters
+    if (not hasattr(input_stream, 'read')) or (not hasattr(input_stream, 'seek')):
+        raise TypeError("Parameter input_stream is not a readable and seekable binary stream.")
+    if not hasattr(output_stream, 'write'):
+        raise TypeError("Parameter output_stream is not a writable binary stream.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if (iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if (iterations is not None) and (iterations <= 0):
+        raise ValueError('Parameter iterations must be a positive integer.')
+
+    # Decryption
+    derived_key = bytearray()
+    cleardata = bytearray()
+    try:
+        start, header, chunk_size, derived_key = open_chunked(input_stream, password, iterations, authdata, key_cache)
+        cleardata_size = 0
+        for index in range(chunk_count(header.payload_length, chunk_size)):
+            cleardata = read_chunk(input_stream, start, header, chunk_size, derived_key, index, authdata)
+            output_stream.write(cleardata)
+            cleardata_size += len(cleardata)
+            delete_bytearray(cleardata)
+    except Exception as e:
+        raise e
+    finally:
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(derived_key)
+        delete_bytearray(cleardata)
+
+    # Return the size of the clear data
+    return cleardata_size
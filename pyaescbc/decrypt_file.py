@@ -0,0 +1,101 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import Optional, Union
+
+from .decrypt_stream import decrypt_stream
+
+def decrypt_file(
+    input_path: Union[str, os.PathLike],
+    output_path: Union[str, os.PathLike],
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    chunk_size: int = 1_048_576,
+    delete_keys: bool = True
+) -> int:
+    """
+    decrypt_file decrypts an encrypted bundle file and writes the clear data in another file.
+
+    The file is decrypted chunk by chunk with :func:`pyaescbc.decrypt_stream`, so only one buffer of ``chunk_size`` bytes is held in memory.
+    The HMAC is checked on the whole file before any clear data is written.
+    If the decryption fails, the partially written output file is removed.
+    For a versioned bundle (see :class:`pyaescbc.BundleHeader`), the iterations can be omitted: they are read from the header of the bundle.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = ... # The number of iterations used to encrypt the file
+        aes.decrypt_file("dump.sql.aes", "dump.sql", password, iterations, delete_keys=True)
+
+    Parameters
+    ----------
+    input_path : Union[str, os.PathLike]
+        The path of the encrypted bundle file to decrypt.
+
+    output_path : Union[str, os.PathLike]
+        The path of the file receiving the clear data.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None for a versioned bundle, the iterations of the header are then used. Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+        If not None, it will be used to create the HMAC.
+
+    chunk_size : int
+        The number of bytes read from the input file at each step. Default is 1 MiB.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    Returns
+    -------
+    cleardata_size : int
+        The number of bytes written in the output file.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations or chunk_size is not a strictly positive integer, or if the file does not contain at least 80 bytes.
+        If `iterations` is None for a legacy bundle or does not match the header, or if the header is not a password-based one.
+    AuthError
+        If the HMAC is not valid.
+    """
+    # Check the types of the parameters
+    if not isinstance(input_path, (str, os.PathLike)):
+        raise TypeError("Parameter input_path is not a path.")
+    if not isinstance(output_path, (str, os.PathLike)):
+        raise TypeError("Parameter output_path is not a path.")
+
+    # Decryption
+    with open(input_path, 'rb') as input_stream:
+        try:
+            with open(output_path, 'wb') as output_stream:
+                cleardata_size = decrypt_stream(input_stream, output_stream, password, iterations, authdata=authdata, chunk_size=chunk_size, delete_keys=delete_keys)
+        except Exception as e:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise e
+
+    return cleardata_size
@@ -0,0 +1,221 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Optional, Iterable, Iterator, Tuple, Union
+
+from .derive_key import derive_key
+from .derive_key_v2 import derive_key_v2
+from .encrypted_bundle_to_cleardata import encrypted_bundle_to_cleardata
+from .read_bundle_header import read_bundle_header
+from .bundle_header import HEADER_LENGTH, KDF_PBKDF2_SHA256, KDF_PBKDF2_HKDF_SHA256, PASSWORD_KDF_IDS
+from .key_cache import KeyCache
+from .delete_bytearray import delete_bytearray
+from .auth_error import AuthError
+
+def decrypt_many(
+    encrypted_bundles: Iterable[bytearray],
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    delete_keys: bool = True
+) -> Iterator[Union[bytearray, AuthError, ValueError]]:
+    """
+    decrypt_many decrypts a batch of encrypted bundles encrypted with the same password.
+    The iterations can be omitted for versioned bundles (see :class:`pyaescbc.BundleHeader`), they are then read from the header of each bundle.
+
+    The bundles are read lazily through a window of ``2 * max_workers`` bundles, and the bundles of the window sharing a salt
+    share one key derivation. The key derivations are spread over a process pool, and each bundle is decrypted as soon as the key of its salt is available.
+    Each derived key is deleted once the last bundle of the window using it has been decrypted, so at most one key per bundle of the window is kept in memory.
+
+    The results are yielded in the order of the bundles.
+    If a bundle can not be decrypted, the :class:`pyaescbc.AuthError` (wrong password, tampered data) or the ``ValueError`` (malformed bundle)
+    is yielded in place of its cleardata and the batch continues.
+
+    .. warning::
+
+        With the default process pool, the call must be protected by ``if __name__ == "__main__":`` on platforms using the ``spawn`` start method.
+        The password and the salts are sent to the worker processes to derive the keys.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        for result in aes.decrypt_many(encrypted_bundles, password, iterations, max_workers=4):
+            if isinstance(result, Exception):
+                print(f"Failed: {result}")
+            else:
+                process(result)
+
+    Parameters
+    ----------
+    encrypted_bundles : Iterable[bytearray]
+        The encrypted bundles to decrypt.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None for versioned bundles, the iterations of their headers are then used
+        (a legacy bundle then yields a ``ValueError``). Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC of every bundle. Default is None.
+
+    max_workers : Optional[int]
+        The number of processes of the pool deriving the keys. Default is None, the number of processors of the machine.
+        Ignored if `executor` is given, except to bound the number of bundles in flight.
+
+    executor : Optional[Executor]
+        The executor deriving the keys. Default is None, a ``ProcessPoolExecutor`` is created for the batch and shut down at the end.
+
+    delete_keys : bool
+        Delete each encrypted bundle once processed, and the password and the authdata at the end of the batch. Default is True.
+
+    Returns
+    -------
+    results : Iterator[Union[bytearray, AuthError, ValueError]]
+        The cleardata of each bundle, or the error raised while decrypting it.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty or if iterations or max_workers is not a strictly positive integer.
+    """
+    # Check the types of the parameters
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if (iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError("Parameter max_workers is not integer")
+    if (executor is not None) and (not isinstance(executor, Executor)):
+        raise TypeError("Parameter executor is not Executor instance.")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if (iterations is not None) and (iterations <= 0):
+        raise ValueError('Parameter iterations must be a positive integer.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a positive integer.')
+
+    return _decrypt_many(encrypted_bundles, password, iterations, authdata, max_workers, executor, delete_keys)
+
+def _key_id(encrypted_bundle: bytearray, iterations: Optional[int]) -> Optional[Tuple[bytes, int, int]]:
+    """ Returns the salt, the KDF and the iterations deriving the key of a bundle, None if it can not be decrypted (the error is reported when it is decrypted). """
+    if len(encrypted_bundle) < 80:
+        return None
+    try:
+        bundle_header = read_bundle_header(encrypted_bundle)
+    except ValueError:
+        return None
+    offset = 0 if bundle_header is None else HEADER_LENGTH
+    kdf = KDF_PBKDF2_SHA256 if bundle_header is None else bundle_header.kdf
+    bundle_iterations = iterations if (iterations is not None or bundle_header is None) else bundle_header.iterations
+    if kdf not in PASSWORD_KDF_IDS or bundle_iterations is None or bundle_iterations <= 0 or len(encrypted_bundle) < offset + 80:
+        return None
+    return bytes(encrypted_bundle[offset + 16:offset + 48]), kdf, bundle_iterations  # iv (16 bytes) | salt (32 bytes) | hmac (32 bytes)
+
+def _delete_result(future: Future) -> None:
+    """ Deletes the derived key of a finished derivation that was not used. """
+    if not future.cancelled() and future.exception() is None:
+        delete_bytearray(future.result())
+
+def _decrypt_many(encrypted_bundles, password, iterations, authdata, max_workers, executor, delete_keys):
+    """ Generator of :func:`decrypt_many`, the parameters are already checked. """
+    own_executor = executor is None
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    pending = deque()
+    # For each (salt, kdf, iterations) of the window: the derivation future (None once used), the key cache and the number of pending bundles
+    keys = {}
+
+    def decrypt_next() -> Union[bytearray, AuthError, ValueError]:
+        encrypted_bundle, key_id = pending.popleft()
+        key_cache = None
+        try:
+            if key_id is not None:
+                entry = keys[key_id]
+                if entry["future"] is not None:
+                    future, entry["future"] = entry["future"], None
+                    derived_key = future.result()
+                    salt = bytearray(key_id[0])
+                    entry["key_cache"].put(password, salt, key_id[2], derived_key, key_id[1])
+                    delete_bytearray(derived_key)
+                    delete_bytearray(salt)
+                key_cache = entry["key_cache"]
+            try:
+                return encrypted_bundle_to_cleardata(encrypted_bundle, password, iterations, authdata=authdata, delete_keys=False, key_cache=key_cache)
+            except (AuthError, ValueError) as e:
+                return e
+        finally:
+            if key_id is not None:
+                entry["count"] -= 1
+                if entry["count"] == 0:
+                    # The last bundle of the window using this key is decrypted
+                    del keys[key_id]
+                    entry["key_cache"].clear()
+            if delete_keys:
+                delete_bytearray(encrypted_bundle)
+
+    try:
+        for encrypted_bundle in encrypted_bundles:
+            if not isinstance(encrypted_bundle, bytearray):
+                raise TypeError("Parameter encrypted_bundles does not contain only bytearray")
+            key_id = _key_id(encrypted_bundle, iterations)
+            if key_id is not None:
+                entry = keys.get(key_id)
+                if entry is None:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=max_workers)
+                    salt, kdf, bundle_iterations = key_id
+                    function = derive_key_v2 if kdf == KDF_PBKDF2_HKDF_SHA256 else derive_key
+                    # The derivation works on its own copy of the password, deleted once it ends (it can outlive the batch in a given executor)
+                    password_copy = password.copy()
+                    future = executor.submit(function, password_copy, bytearray(salt), bundle_iterations)
+                    future.add_done_callback(lambda future, password_copy=password_copy: delete_bytearray(password_copy))
+                    entry = keys[key_id] = {"future": future, "key_cache": KeyCache(max_size=1, ttl=None), "count": 0}
+                entry["count"] += 1
+            pending.append((encrypted_bundle, key_id))
+            if len(pending) >= max_pending:
+                yield decrypt_next()
+        while pending:
+            yield decrypt_next()
+    finally:
+        for entry in keys.values():
+            if entry["future"] is not None:
+                entry["future"].cancel()
+        if own_executor and executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        # Deleting from memory the keys of the window, including the derivations still running in a given executor
+        for entry in keys.values():
+            if entry["future"] is not None:
+                entry["future"].add_done_callback(_delete_result)
+            entry["key_cache"].clear()
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
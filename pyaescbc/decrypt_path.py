@@ -0,0 +1,187 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mmap
+import os
+from typing import Optional, Union
+
+from ._atomic import atomic_output
+from .open_bundle import open_bundle
+from ._kdf import derive_password_key
+from .decrypt_AES_CBC_HMAC_into import decrypt_AES_CBC_HMAC_into
+from .extract_cryptography_views import extract_cryptography_views
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .bundle_header import KDF_PBKDF2_SHA256, PASSWORD_KDF_IDS
+
+def decrypt_path(
+    input_path: Union[str, os.PathLike],
+    output_path: Union[str, os.PathLike],
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None,
+    max_workers: Optional[int] = None
+) -> int:
+    """
+    decrypt_path decrypts an encrypted bundle file into another file through memory maps.
+
+    The input file is mapped with :func:`pyaescbc.open_bundle`, and the output file is preallocated and mapped too,
+    so :func:`pyaescbc.decrypt_AES_CBC_HMAC_into` reads the cipherdata from the mapped pages of the input and writes the clear data
+    straight into the mapped pages of the output. The page cache replaces the heap: no buffer of the size of the file is allocated.
+    The output is the same as with :func:`pyaescbc.decrypt_file`, which is better suited to pipes and to files larger than the address space.
+
+    The output is written in a temporary file renamed at the end, so the output file is either untouched or complete,
+    and the clear data is never renamed into place if the HMAC is not valid.
+    For a versioned bundle (see :class:`pyaescbc.BundleHeader`), the iterations can be omitted: they are read from the header.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = ... # The number of iterations used to encrypt the file
+        aes.decrypt_path("dump.sql.aes", "dump.sql", password, iterations, delete_keys=True)
+
+    Parameters
+    ----------
+    input_path : Union[str, os.PathLike]
+        The path of the encrypted bundle file to decrypt.
+
+    output_path : Union[str, os.PathLike]
+        The path of the file receiving the clear data. An existing file is replaced.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None for a versioned bundle, the iterations of the header are then used. Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    max_workers : Optional[int]
+        The number of threads decrypting large cipherdata in parallel segments, see :func:`pyaescbc.decrypt_AES_CBC_HMAC_into`.
+        Default is None, the cipherdata is decrypted in a single pass.
+
+    Returns
+    -------
+    cleardata_size : int
+        The number of bytes written in the output file.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations is not a strictly positive integer, or if the file does not contain at least 80 bytes.
+        If `iterations` is None for a legacy bundle or does not match the header, or if the header is not a password-based one.
+    AuthError
+        If the HMAC is not valid.
+    """
+    # Check the types of the parameters
+    if not isinstance(input_path, (str, os.PathLike)):
+        raise TypeError("Parameter input_path is not a path.")
+    if not isinstance(output_path, (str, os.PathLike)):
+        raise TypeError("Parameter output_path is not a path.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if (iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError("Parameter max_workers is not integer")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if (iterations is not None) and (iterations <= 0):
+        raise ValueError('Parameter iterations must be a positive integer.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a positive integer.')
+
+    # Decryption (the components are views on the mapped input, the clear data is written in the mapped output)
+    views = ()
+    salt = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    try:
+        with open_bundle(input_path) as encrypted_bundle:
+            try:
+                *views, bundle_header = extract_cryptography_views(encrypted_bundle, return_header=True)
+                iv, salt_view, expected_hmac, cipherdata = views
+                header = None
+                kdf = KDF_PBKDF2_SHA256
+                if bundle_header is not None:
+                    if bundle_header.kdf not in PASSWORD_KDF_IDS or bundle_header.flags != 0:
+                        raise ValueError('encrypted_bundle is not a password-based bundle.')
+                    if iterations is None:
+                        iterations = bundle_header.iterations
+                    elif iterations != bundle_header.iterations:
+                        raise ValueError('Parameter iterations does not match the header of encrypted_bundle.')
+                    kdf = bundle_header.kdf
+                    header = bundle_header.to_bytearray()  # The header is authenticated with the cipherdata
+                elif iterations is None:
+                    raise ValueError('Parameter iterations is required for a bundle without header.')
+                salt = bytearray(salt_view)
+                derived_key = derive_password_key(password, salt, iterations, kdf, key_cache)
+                aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+                hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+
+                # Preallocate and map the output, then cut it to the length of the clear data
+                with atomic_output(output_path, overwrite=True) as output_stream:
+                    output_stream.truncate(len(cipherdata))
+                    with mmap.mmap(output_stream.fileno(), len(cipherdata), access=mmap.ACCESS_WRITE) as cleardata:
+                        cleardata_size = decrypt_AES_CBC_HMAC_into(cipherdata, aes_key, hmac_key, iv, expected_hmac, cleardata, authdata=authdata, header=header, max_workers=max_workers)
+                        cleardata.flush()
+                    output_stream.truncate(cleardata_size)
+            finally:
+                # Releasing the views so the map can be closed
+                for view in views:
+                    view.release()
+    except Exception as e:
+        raise e
+    finally:
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(salt)
+        delete_bytearray(derived_key)
+        delete_bytearray(aes_key)
+        delete_bytearray(hmac_key)
+
+    # Return the size of the clear data
+    return cleardata_size
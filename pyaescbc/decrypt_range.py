@@ -0,0 +1,153 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional, BinaryIO
+
+from ._chunked import open_chunked, read_chunk
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+
+def decrypt_range(
+    input_stream: BinaryIO,
+    password: bytearray,
+    offset: int,
+    length: int,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None
+) -> bytearray:
+    """
+    decrypt_range decrypts ``length`` bytes of clear data starting at ``offset`` from a chunked bundle created by :func:`pyaescbc.encrypt_chunked_stream`.
+
+    Only the header and the chunks overlapping the range are read, authenticated and decrypted,
+    so the cost of a read does not depend on the size of the bundle (apart from the key derivation).
+    Use a :class:`pyaescbc.KeyCache` to derive the key only once when several ranges of the same bundle are read.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        key_cache = aes.KeyCache()
+        with open("video.mp4.aes", "rb") as input_stream:
+            first = aes.decrypt_range(input_stream, password, 0, 4096, delete_keys=False, key_cache=key_cache)
+            middle = aes.decrypt_range(input_stream, password, 50_000_000, 1_000_000, delete_keys=False, key_cache=key_cache)
+        aes.delete_bytearray(password)
+        key_cache.clear()
+
+    Parameters
+    ----------
+    input_stream : BinaryIO
+        The readable and seekable binary stream whose current position is the start of the chunked bundle.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    offset : int
+        The position of the first byte to decrypt in the clear data. It must be a positive integer.
+
+    length : int
+        The number of bytes to decrypt. It must be a positive integer, and ``offset + length`` must not exceed the length of the clear data.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. Default is None, the iterations of the header are used.
+
+    authdata : Optional[bytearray]
+        The authentication data used in the HMACs. Default is None.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    Returns
+    -------
+    cleardata : bytearray
+        The ``length`` bytes of clear data starting at ``offset``.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations is not a strictly positive integer or does not match the header,
+        if offset or length is negative or the range exceeds the clear data, or if the stream does not contain a complete chunked bundle.
+    AuthError
+        If the header MAC or the HMAC of a chunk of the range is not valid.
+    """
+    # Check the types of the parameters
+    if (not hasattr(input_stream, 'read')) or (not hasattr(input_stream, 'seek')):
+        raise TypeError("Parameter input_stream is not a readable and seekable binary stream.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if not isinstance(offset, int):
+        raise TypeError("Parameter offset is not integer")
+    if not isinstance(length, int):
+        raise TypeError("Parameter length is not integer")
+    if (iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if (iterations is not None) and (iterations <= 0):
+        raise ValueError('Parameter iterations must be a positive integer.')
+    if offset < 0 or length < 0:
+        raise ValueError('Parameters offset and length must be positive integers.')
+
+    # Decryption of the chunks overlapping the range
+    derived_key = bytearray()
+    chunk = bytearray()
+    cleardata = bytearray()
+    try:
+        start, header, chunk_size, derived_key = open_chunked(input_stream, password, iterations, authdata, key_cache)
+        if offset + length > header.payload_length:
+            raise ValueError(f'The range [{offset}, {offset + length}[ exceeds the {header.payload_length} bytes of clear data.')
+        if length > 0:
+            cleardata = bytearray(length)
+            first_index, last_index = offset // chunk_size, (offset + length - 1) // chunk_size
+            for index in range(first_index, last_index + 1):
+                chunk = read_chunk(input_stream, start, header, chunk_size, derived_key, index, authdata)
+                chunk_start = index * chunk_size
+                begin, end = max(offset, chunk_start), min(offset + length, chunk_start + len(chunk))
+                cleardata[begin - offset:end - offset] = chunk[begin - chunk_start:end - chunk_start]
+                delete_bytearray(chunk)
+    except Exception as e:
+        delete_bytearray(cleardata)
+        raise e
+    finally:
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(derived_key)
+        delete_bytearray(chunk)
+
+    # Return the decrypted range
+    return cleardata
@@ -0,0 +1,219 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hmac
+import hashlib
+from typing import Optional, BinaryIO
+
+from cryptography.hazmat.primitives import padding, ciphers
+from cryptography.hazmat.backends import default_backend
+
+from ._kdf import derive_password_key
+from ._stream import read_stream_preamble
+from .bundle_header import HEADER_LENGTH, KDF_PBKDF2_SHA256
+from .check_hmac import check_hmac
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .auth_error import AuthError
+from .instrumentation import _StageTimer
+
+def decrypt_stream(
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    chunk_size: int = 1_048_576,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None
+) -> int:
+    """
+    decrypt_stream decrypts an encrypted bundle stream chunk by chunk and writes the clear data in the output stream.
+
+    The input stream must contain an encrypted bundle created by :func:`pyaescbc.cleardata_to_encrypted_bundle`, :func:`pyaescbc.encrypt_path` or :func:`pyaescbc.encrypt_stream`.
+    For a versioned bundle (see :class:`pyaescbc.BundleHeader`), the iterations can be omitted: they are read from the header of the bundle,
+    the key is derived with the KDF of the header, and the header is authenticated with the cipherdata.
+    The decryption is done in two passes over the input stream:
+
+    1. The HMAC of the whole cipherdata is computed and checked against the expected HMAC of the header.
+    2. The input stream is seeked back and the cipherdata is decrypted and written in the output stream.
+
+    Nothing is written in the output stream if the HMAC is not valid.
+    Only one buffer of ``chunk_size`` bytes is held in memory.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. seealso::
+
+        - function :func:`pyaescbc.encrypt_stream` to encrypt the stream.
+        - function :func:`pyaescbc.decrypt_file` to decrypt a file given its path.
+
+    Parameters
+    ----------
+    input_stream : BinaryIO
+        The readable and seekable binary stream containing the encrypted bundle (must implement ``readinto``).
+
+    output_stream : BinaryIO
+        The writable binary stream receiving the clear data.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None for a versioned bundle, the iterations of the header are then used. Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+        If not None, it will be used to create the HMAC.
+
+    chunk_size : int
+        The number of bytes read from the input stream at each step. Default is 1 MiB.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    Returns
+    -------
+    cleardata_size : int
+        The number of bytes written in the output stream.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations or chunk_size is not a strictly positive integer, or if the stream does not contain at least 80 bytes.
+        If `iterations` is None for a legacy bundle or does not match the header, if the header is not a password-based one,
+        or if the length of the bundle does not match its header.
+    AuthError
+        If the HMAC is not valid.
+    """
+    # Check the types of the parameters
+    if (not hasattr(input_stream, 'readinto')) or (not hasattr(input_stream, 'seek')):
+        raise TypeError("Parameter input_stream is not a readable and seekable binary stream.")
+    if not hasattr(output_stream, 'write'):
+        raise TypeError("Parameter output_stream is not a writable binary stream.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if (iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(chunk_size, int):
+        raise TypeError("Parameter chunk_size is not integer")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+
+    # Check the values of the parameters
+    if chunk_size <= 0:
+        raise ValueError('Parameter chunk_size must be a positive integer.')
+
+    # Decryption
+    header = bytearray()
+    iv = bytearray()
+    salt = bytearray()
+    expected_hmac = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    given_hmac = bytearray()
+    buffer = bytearray(chunk_size)
+    timer = _StageTimer()
+    try:
+        start = input_stream.tell()
+        bundle_header, iterations, iv, salt, expected_hmac = read_stream_preamble(input_stream, iterations)
+        kdf = KDF_PBKDF2_SHA256 if bundle_header is None else bundle_header.kdf
+        offset = 0 if bundle_header is None else HEADER_LENGTH
+        derived_key = derive_password_key(password, salt, iterations, kdf, key_cache)
+        aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+
+        with memoryview(buffer) as view:
+            # First pass: check the HMAC of the header and the cipherdata
+            mac = hmac.new(hmac_key, digestmod=hashlib.sha256)
+            if bundle_header is not None:
+                header = bundle_header.to_bytearray()  # The header is authenticated with the cipherdata
+                mac.update(header)
+            mac.update(iv)
+            cipherdata_length = 0
+            timer.start()
+            while True:
+                size = input_stream.readinto(buffer)
+                timer.lap("stream_io", size or 0)
+                if not size:
+                    break
+                mac.update(view[:size])
+                timer.lap("stream_HMAC", size)
+                cipherdata_length += size
+            if bundle_header is not None and cipherdata_length != bundle_header.payload_length:
+                raise ValueError('input_stream length does not match the payload length of its header.')
+            if authdata is not None:
+                mac.update(authdata)
+            given_hmac = bytearray(mac.digest())
+            if not check_hmac(given_hmac, expected_hmac):
+                raise AuthError('The HMAC is not valid. The data has been tampered with or the password is incorrect.')
+
+            # Second pass: decrypt the cipherdata
+            input_stream.seek(start + offset + 80)
+            cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(iv), backend=default_backend())
+            decryptor = cipher.decryptor()
+            unpadder = padding.PKCS7(128).unpadder()
+            cleardata_size = 0
+            timer.start()
+            while True:
+                size = input_stream.readinto(buffer)
+                timer.lap("stream_io", size or 0)
+                if not size:
+                    break
+                chunk = unpadder.update(decryptor.update(view[:size]))
+                timer.lap("stream_AES_CBC", size)
+                output_stream.write(chunk)
+                timer.lap("stream_io", len(chunk))
+                cleardata_size += len(chunk)
+        chunk = unpadder.update(decryptor.finalize()) + unpadder.finalize()
+        timer.lap("stream_AES_CBC")
+        output_stream.write(chunk)
+        timer.lap("stream_io", len(chunk))
+        cleardata_size += len(chunk)
+    except Exception as e:
+        raise e
+    finally:
+        timer.record()
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(header)
+        delete_bytearray(iv)
+        delete_bytearray(salt)
+        delete_bytearray(expected_hmac)
+        delete_bytearray(derived_key)
+        delete_bytearray(aes_key)
+        delete_bytearray(hmac_key)
+        delete_bytearray(given_hmac)
+        delete_bytearray(buffer)
+
+    # Return the size of the clear data
+    return cleardata_size
@@ -0,0 +1,110 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import Optional, Union, Dict
+
+from ._tree import check_tree_parameters, process_tree
+
+def decrypt_tree(
+    source_dir: Union[str, os.PathLike],
+    target_dir: Union[str, os.PathLike],
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    suffix: str = ".aes",
+    max_workers: Optional[int] = None,
+    chunk_size: int = 1_048_576,
+    overwrite: bool = False,
+    manifest_path: Optional[Union[str, os.PathLike]] = None,
+    delete_keys: bool = True
+) -> Dict:
+    """
+    decrypt_tree decrypts all the files of a directory tree on a bounded thread pool.
+
+    Each file ending with ``suffix`` is decrypted with :func:`pyaescbc.decrypt_stream` into ``<target_dir>/<relative path without suffix>``, the other files are skipped.
+    The derived keys are cached during the run, so a tree encrypted by :func:`pyaescbc.encrypt_tree` is decrypted with a single key derivation.
+    A file whose HMAC is not valid is reported as failed and no output is written for it.
+    The relative paths are kept, the symbolic links and special files are skipped, and the existing outputs are skipped unless ``overwrite`` is True.
+    Each output is written in a temporary file renamed at the end, so an output is either absent or complete.
+
+    The cryptography backend releases the GIL during the OpenSSL calls, so the files are processed in parallel by ``max_workers`` threads.
+    Only ``chunk_size`` bytes per thread are held in memory.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = ... # The number of iterations used to encrypt the tree
+        manifest = aes.decrypt_tree("exports-encrypted", "exports", password, iterations, max_workers=8, manifest_path="manifest.json")
+        print(manifest["files"], manifest["failed"], manifest["skipped"], manifest["MB_per_s"])
+
+    Parameters
+    ----------
+    source_dir : Union[str, os.PathLike]
+        The directory to walk.
+
+    target_dir : Union[str, os.PathLike]
+        The directory receiving the outputs. It can be `source_dir`.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None if all the files are versioned bundles, the iterations of their headers are then used. Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC of every file. Default is None.
+
+    suffix : str
+        The suffix of the encrypted files. Default is ".aes".
+
+    max_workers : Optional[int]
+        The number of threads. Default is None, the number of CPUs.
+
+    chunk_size : int
+        The number of bytes read from the input files at each step. Default is 1 MiB.
+
+    overwrite : bool
+        Overwrite the existing outputs instead of skipping their inputs. Default is False.
+
+    manifest_path : Optional[Union[str, os.PathLike]]
+        The path of the JSON file receiving the summary manifest. Default is None, the manifest is only returned.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    Returns
+    -------
+    manifest : dict
+        The summary of the run: the numbers of processed (`files`), `failed` and `skipped` files, the clear `bytes` processed,
+        the `seconds` of the run and of the key derivation (`kdf_seconds`), the throughput `MB_per_s`,
+        and the `entries` with the status of each file (`ok`, `failed` with its error, or `skipped` with its reason).
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If source_dir is not a directory, if password or suffix is empty, or if iterations, max_workers or chunk_size is not a strictly positive integer.
+    """
+    check_tree_parameters(False, source_dir, target_dir, password, iterations, authdata, suffix, max_workers, chunk_size, overwrite, manifest_path, delete_keys)
+    return process_tree(False, source_dir, target_dir, password, iterations, authdata, suffix, max_workers, chunk_size, overwrite, manifest_path, delete_keys)
@@ -12,12 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
+from .wipe_bytearray import wipe_bytearray
+from .instrumentation import instrumented
 
-def delete_bytearray(barray: bytearray) -> None:
+@instrumented("delete_bytearray", nbytes="barray")
+def delete_bytearray(barray: bytearray, method: str = "random", passes: int = 1) -> None:
     r"""
     Securely overwrites the contents of a bytearray and deletes the object from memory.
 
+    The contents are overwritten in bulk by :func:`pyaescbc.wipe_bytearray` and the bytearray is then cleared.
+
     .. code-block:: python
 
         import pyaescbc as aes
@@ -34,16 +38,24 @@ def delete_bytearray(barray: bytearray) -> None:
     barray : bytearray
         The bytearray to securely delete from memory.
 
+    method : str
+        The overwriting method, one of ``"random"``, ``"zero"`` or ``"multipass"``. Default is ``"random"``.
+        See :func:`pyaescbc.wipe_bytearray` for details.
+
+    passes : int
+        The number of overwriting passes. Default is 1.
+
     Raises
     ------
     TypeError
         If the given argument is not a `bytearray` instance.
+    ValueError
+        If `method` is unknown or if `passes` is not a strictly positive integer.
     """
     # Check if the input is a bytearray
     if not isinstance(barray, bytearray):
         raise TypeError('Parameter barray is not bytearray instance.')
     
-    # Delete the bytearray by overwriting its contents with random data
-    for index in range(len(barray)):
-        barray[index] = os.urandom(1)[0]  # Overwrite with random data
+    # Delete the bytearray by overwriting its contents
+    wipe_bytearray(barray, method=method, passes=passes)
     barray.clear()  # Clear contents
\ No newline at end of file
@@ -12,11 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Any
+
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 
-def derive_key(password: bytearray, salt: bytearray, iterations: int) -> bytearray:
+from ._buffer import buffer_nbytes
+from .instrumentation import instrumented
+
+@instrumented("derive_key", iterations="iterations")
+def derive_key(password: Any, salt: Any, iterations: int) -> bytearray:
     """
     Derives a 64-byte key from a password using PBKDF2HMAC.
     The algorithm used is SHA256.
@@ -27,6 +33,13 @@ def derive_key(password: bytearray, salt: bytearray, iterations: int) -> bytearr
 
     By default, the input parameters are deleted from memory at the end of the function.
 
+    .. note::
+
+        The 64-byte output is made of two PBKDF2 blocks of 32 bytes, each running all the iterations, so a derivation costs twice
+        the iterations. The blocks are independent, but the backends (OpenSSL through ``cryptography`` or ``hashlib``) only compute
+        PBKDF2 from the first block, so the second block can not be computed alone on another core without a Python loop over the
+        iterations, which is slower than the sequential native derivation. Use a :class:`pyaescbc.KeyCache` to avoid repeated derivations.
+
     .. seealso::
 
         -function :func:`pyaescbc.encrypt_AES_CBC` to encrypt the data using AES in CBC mode.
@@ -35,10 +48,10 @@ def derive_key(password: bytearray, salt: bytearray, iterations: int) -> bytearr
 
     Parameters
     ----------
-    password : bytearray
-        The user password. It must not be empty.
+    password : buffer
+        The user password (bytearray or any object supporting the buffer protocol). It must not be empty.
 
-    salt : bytearray
+    salt : buffer
         The 32-byte salt used to generate the derived key.
 
     iterations : int
@@ -57,19 +70,17 @@ def derive_key(password: bytearray, salt: bytearray, iterations: int) -> bytearr
         If `iterations` is not a strictly positive integer, `salt` is not 32 bytes long, or `password` is empty.
     """
     # Check the types of the parameters
-    if not isinstance(password, bytearray):
-        raise TypeError('Parameter password is not bytearray instance.')
-    if not isinstance(salt, bytearray):
-        raise TypeError('Parameter salt is not bytearray instance.')
+    password_length = buffer_nbytes(password, 'password')
+    salt_length = buffer_nbytes(salt, 'salt')
     if not isinstance(iterations, int):
         raise TypeError('Parameter iterations is not int instance.')
 
     # Check the values of the parameters
-    if len(password) == 0:
+    if password_length == 0:
         raise ValueError('Parameter password must not be empty.')
     if iterations <= 0:
         raise ValueError('Parameter iterations must be a positive integer.')
-    if len(salt) != 32:
+    if salt_length != 32:
         raise ValueError(f'{salt=} is not 32 bytes long.') 
 
     # Derive the key using PBKDF2HMAC
@@ -0,0 +1,80 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.backends import default_backend
+
+from ._buffer import buffer_nbytes
+from .instrumentation import instrumented
+
+# Context of the HKDF expansion, it separates the raw-key subkeys from any other use of the master key
+HKDF_INFO = b"pyaescbc raw-key AES-256-CBC HMAC-SHA256"
+
+@instrumented("derive_key_hkdf")
+def derive_key_hkdf(master_key: Any, salt: Any) -> bytearray:
+    """
+    Derives a 64-byte key from a high-entropy master key using HKDF.
+    The algorithm used is SHA256.
+
+    Unlike :func:`pyaescbc.derive_key`, no key stretching is done: the derivation costs a few microseconds.
+    It must only be used with random keys (for example 256-bit keys from a secrets manager), never with passwords.
+
+    The derived key is composed by the AES key and the HMAC key, both 32 bytes long, as for :func:`pyaescbc.derive_key`.
+
+    .. seealso::
+
+        - function :func:`pyaescbc.cleardata_to_encrypted_bundle_with_key` to encrypt data with a master key.
+        - function :func:`pyaescbc.encrypted_bundle_to_cleardata_with_key` to decrypt data with a master key.
+
+    Parameters
+    ----------
+    master_key : buffer
+        The master key. It must be at least 32 bytes long.
+
+    salt : buffer
+        The 32-byte salt of the bundle.
+
+    Returns
+    -------
+    derived_key : bytearray
+        The derived 64-byte key.
+
+    Raises
+    ------
+    TypeError
+        If any argument does not support the buffer protocol.
+    ValueError
+        If `master_key` is shorter than 32 bytes or `salt` is not 32 bytes long.
+    """
+    # Check the types of the parameters
+    master_key_length = buffer_nbytes(master_key, 'master_key')
+    salt_length = buffer_nbytes(salt, 'salt')
+
+    # Check the values of the parameters
+    if master_key_length < 32:
+        raise ValueError('Parameter master_key must be at least 32 bytes long.')
+    if salt_length != 32:
+        raise ValueError(f'{salt=} is not 32 bytes long.')
+
+    # Derive the key using HKDF
+    kdf = HKDF(algorithm=hashes.SHA256(),
+               length=64,  # 32 bytes for AES + 32 bytes for HMAC
+               salt=bytes(salt),
+               info=HKDF_INFO,
+               backend=default_backend())
+    derived_key = bytearray(kdf.derive(master_key))
+    return derived_key
@@ -0,0 +1,104 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDFExpand
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.backends import default_backend
+
+from ._buffer import buffer_nbytes
+from .delete_bytearray import delete_bytearray
+from .instrumentation import instrumented
+
+# Context of the HKDF expansion, it separates the v2 subkeys from any other use of the PBKDF2 output
+HKDF_V2_INFO = b"pyaescbc v2 PBKDF2-SHA256 AES-256-CBC HMAC-SHA256"
+
+@instrumented("derive_key_v2", iterations="iterations")
+def derive_key_v2(password: Any, salt: Any, iterations: int) -> bytearray:
+    """
+    Derives a 64-byte key from a password using one PBKDF2HMAC block expanded with HKDF.
+    The algorithm used is SHA256.
+
+    :func:`pyaescbc.derive_key` asks PBKDF2 for 64 bytes, that is two 32-byte blocks each running all the iterations,
+    while an attacker testing passwords only needs to compute the first block to check a guess against the AES key or the HMAC key.
+    This profile runs PBKDF2 for a single 32-byte block, then expands it into the AES key and the HMAC key with HKDF-SHA256
+    (the PBKDF2 output is already a uniform pseudorandom key, so the HKDF extraction step is skipped).
+    At the same number of iterations, the derivation costs half the CPU time of :func:`pyaescbc.derive_key` for the same attacker cost.
+
+    The bundles using this profile are versioned bundles with the KDF ``KDF_PBKDF2_HKDF_SHA256`` in their header
+    (see :class:`pyaescbc.BundleHeader`), so the decryption functions select the right derivation, and legacy bundles still decrypt.
+
+    .. code-block:: python
+
+        import pyaescbc
+
+        encrypted_bundle = pyaescbc.encrypt(cleardata, password, iterations, versioned=True, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256)
+        cleardata = pyaescbc.decrypt(encrypted_bundle, password)  # The KDF and the iterations are read from the header
+
+    Parameters
+    ----------
+    password : buffer
+        The user password (bytearray or any object supporting the buffer protocol). It must not be empty.
+
+    salt : buffer
+        The 32-byte salt used to generate the derived key.
+
+    iterations : int
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+    Returns
+    -------
+    derived_key : bytearray
+        The derived 64-byte key.
+
+    Raises
+    ------
+    TypeError
+        If the arguments are not of the correct types.
+    ValueError
+        If `iterations` is not a strictly positive integer, `salt` is not 32 bytes long, or `password` is empty.
+    """
+    # Check the types of the parameters
+    password_length = buffer_nbytes(password, 'password')
+    salt_length = buffer_nbytes(salt, 'salt')
+    if not isinstance(iterations, int):
+        raise TypeError('Parameter iterations is not int instance.')
+
+    # Check the values of the parameters
+    if password_length == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if iterations <= 0:
+        raise ValueError('Parameter iterations must be a positive integer.')
+    if salt_length != 32:
+        raise ValueError(f'{salt=} is not 32 bytes long.')
+
+    # Derive one PBKDF2 block, then expand it into the AES key and the HMAC key
+    pseudorandom_key = bytearray()
+    try:
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(),
+                         length=32,  # A single SHA256 block
+                         salt=bytes(salt),
+                         iterations=iterations,
+                         backend=default_backend())
+        pseudorandom_key = bytearray(kdf.derive(password))
+        expand = HKDFExpand(algorithm=hashes.SHA256(),
+                            length=64,  # 32 bytes for AES + 32 bytes for HMAC
+                            info=HKDF_V2_INFO,
+                            backend=default_backend())
+        derived_key = bytearray(expand.derive(bytes(pseudorandom_key)))
+    finally:
+        delete_bytearray(pseudorandom_key)
+    return derived_key
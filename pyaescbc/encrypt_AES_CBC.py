@@ -12,33 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from cryptography.hazmat.primitives import padding, ciphers
-from cryptography.hazmat.backends import default_backend
+from typing import Any
 
-def encrypt_AES_CBC(cleardata: bytearray, aes_key: bytearray, iv: bytearray) -> bytearray:
+from .encrypt_AES_CBC_into import encrypt_AES_CBC_into
+from ._buffer import buffer_nbytes
+from .instrumentation import instrumented
+
+@instrumented("encrypt_AES_CBC", nbytes="cleardata")
+def encrypt_AES_CBC(cleardata: Any, aes_key: Any, iv: Any) -> bytearray:
     r"""
     Encrypts a cleardata message using AES in CBC mode.
 
     The cleardata is padded using PKCS7 padding and then encrypted using AES in CBC mode.
     The aes_key is the first 32 bytes of the derived key, and the iv is the initialization vector.
 
+    The cipherdata is encrypted into a single bytearray of ``16 * (len(cleardata) // 16 + 1)`` bytes by :func:`pyaescbc.encrypt_AES_CBC_into`.
+
     .. seealso::
 
         function :func:`pyaescbc.derive_key` to create the derived key.
 
     .. note::
 
-        The cleardata, aes_key and iv must be bytearrays.
+        The cleardata, aes_key and iv can be any object supporting the buffer protocol (bytearray, bytes, memoryview, mmap, ...).
 
     Parameters
     ----------
-    cleardata : bytearray
+    cleardata : buffer
         The message to encrypt using AES in CBC mode.
 
-    aes_key : bytearray
+    aes_key : buffer
         The 32-byte AES key derived from the password, salt and iterations.
 
-    iv : bytearray
+    iv : buffer
         The 16-byte initialization vector (IV) to use in AES-CBC mode.
 
     Returns
@@ -49,28 +55,14 @@ def encrypt_AES_CBC(cleardata: bytearray, aes_key: bytearray, iv: bytearray) ->
     Raises
     ------
     TypeError
-        If a given argument is not a `bytearray` instance.
+        If a given argument does not support the buffer protocol.
     ValueError
         If the `aes_key` isn't 32 bytes long or the `iv` isn't 16 bytes long.
     """
     # Check the types of the parameters
-    if not isinstance(cleardata, bytearray):
-        raise TypeError('Parameter cleardata is not bytearray instance.')
-    if not isinstance(aes_key, bytearray):
-        raise TypeError('Parameter aes_key is not bytearray instance.')
-    if not isinstance(iv, bytearray):
-        raise TypeError('Parameter iv is not bytearray instance.')
+    cleardata_length = buffer_nbytes(cleardata, 'cleardata')
 
-    # Check the values of the parameters
-    if len(aes_key) != 32:
-        raise ValueError(f'{aes_key=} is not 32 bytes long.') 
-    if len(iv) != 16:
-        raise ValueError(f'{iv=} is not 16 bytes long.')
-    
     # Encrypt the data using AES in CBC mode
-    padder = padding.PKCS7(128).padder()  
-    cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(iv), backend=default_backend())
-    encryptor = cipher.encryptor()
-    padded_data = padder.update(cleardata) + padder.finalize()
-    cipherdata = bytearray(encryptor.update(padded_data) + encryptor.finalize())
+    cipherdata = bytearray(16 * (cleardata_length // 16 + 1))
+    encrypt_AES_CBC_into(cleardata, aes_key, iv, cipherdata)
     return cipherdata
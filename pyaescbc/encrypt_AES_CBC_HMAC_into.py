@@ -0,0 +1,133 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hmac
+import hashlib
+from typing import Any, Optional
+
+from cryptography.hazmat.primitives import padding, ciphers
+from cryptography.hazmat.backends import default_backend
+
+from ._buffer import byte_view, buffer_nbytes
+from .instrumentation import instrumented
+
+@instrumented("encrypt_AES_CBC_HMAC_into", nbytes="cleardata")
+def encrypt_AES_CBC_HMAC_into(
+    cleardata: Any,
+    aes_key: Any,
+    hmac_key: Any,
+    iv: Any,
+    out: Any,
+    authdata: Optional[Any] = None,
+    chunk_size: int = 65_536,
+    header: Optional[Any] = None
+) -> bytearray:
+    r"""
+    Encrypts a cleardata message using AES in CBC mode into a caller-provided buffer and creates its HMAC in the same pass.
+
+    This is the fused version of :func:`pyaescbc.encrypt_AES_CBC_into` followed by :func:`pyaescbc.create_hmac`:
+    the cleardata is encrypted ``chunk_size`` bytes at a time, and each chunk of cipherdata is fed to the HMAC
+    right after being written, while it is still in the CPU cache.
+    The cipherdata and the HMAC are identical to the ones of the separate functions.
+
+    .. code-block:: console
+
+        cipherdata = AES-CBC(aes_key, iv, PKCS7(cleardata))
+        HMAC = HMAC(hmac_key, SHA256(header + iv + cipherdata + authdata))
+
+    Parameters
+    ----------
+    cleardata : buffer
+        The message to encrypt using AES in CBC mode.
+
+    aes_key : buffer
+        The 32-byte AES key derived from the password, salt and iterations.
+
+    hmac_key : buffer
+        The 32-byte HMAC key derived from the password, salt and iterations.
+
+    iv : buffer
+        The 16-byte initialization vector (IV) to use in AES-CBC mode.
+
+    out : buffer
+        The writable buffer receiving the cipherdata. It must contain at least ``16 * (len(cleardata) // 16 + 1)`` bytes.
+
+    authdata : Optional[buffer]
+        Optional additional authentication data appended to the HMAC input. Default is None.
+
+    chunk_size : int
+        The number of bytes processed at each step. It must be a strictly positive multiple of 16. Default is 64 KiB.
+
+    header : Optional[buffer]
+        Optional header of a versioned bundle (see :class:`pyaescbc.BundleHeader`), prepended to the HMAC input. Default is None.
+
+    Returns
+    -------
+    expected_hmac : bytearray
+        The 32-byte expected HMAC value.
+
+    Raises
+    ------
+    TypeError
+        If a given argument is of the wrong type or if out is read-only.
+    ValueError
+        If a key or the iv has a wrong length, if `out` is too small or if `chunk_size` is not valid.
+    """
+    # Check the types of the parameters
+    cleardata_length = buffer_nbytes(cleardata, 'cleardata')
+    aes_key_length = buffer_nbytes(aes_key, 'aes_key')
+    hmac_key_length = buffer_nbytes(hmac_key, 'hmac_key')
+    iv_length = buffer_nbytes(iv, 'iv')
+    out_length = buffer_nbytes(out, 'out')
+    if authdata is not None:
+        buffer_nbytes(authdata, 'authdata')
+    if header is not None:
+        buffer_nbytes(header, 'header')
+    if not isinstance(chunk_size, int):
+        raise TypeError('Parameter chunk_size is not int instance.')
+
+    # Check the values of the parameters
+    if aes_key_length != 32:
+        raise ValueError('Parameter aes_key is not 32 bytes long.')
+    if hmac_key_length != 32:
+        raise ValueError('Parameter hmac_key is not 32 bytes long.')
+    if iv_length != 16:
+        raise ValueError('Parameter iv is not 16 bytes long.')
+    if chunk_size <= 0 or chunk_size % 16 != 0:
+        raise ValueError('Parameter chunk_size must be a strictly positive multiple of 16.')
+    full_length = cleardata_length - cleardata_length % 16
+    if out_length < full_length + 16:
+        raise ValueError(f'Parameter out must contain at least {full_length + 16} bytes.')
+
+    # Encrypt and authenticate the full blocks chunk by chunk, then the padded last block
+    cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(iv), backend=default_backend())
+    encryptor = cipher.encryptor()
+    padder = padding.PKCS7(128).padder()
+    mac = hmac.new(hmac_key, digestmod=hashlib.sha256)
+    if header is not None:
+        mac.update(header)
+    mac.update(iv)
+    with byte_view(cleardata, 'cleardata') as clear_view, byte_view(out, 'out') as out_view:
+        if out_view.readonly:
+            raise TypeError('Parameter out is a read-only buffer.')
+        for start in range(0, full_length, chunk_size):
+            stop = min(start + chunk_size, full_length)
+            encryptor.update_into(clear_view[start:stop], out_view[start:])
+            mac.update(out_view[start:stop])
+        last_block = bytes(padder.update(clear_view[full_length:])) + padder.finalize()
+        out_view[full_length:full_length + 16] = encryptor.update(last_block) + encryptor.finalize()
+        mac.update(out_view[full_length:full_length + 16])
+    if authdata is not None:
+        mac.update(authdata)
+    return bytearray(mac.digest())
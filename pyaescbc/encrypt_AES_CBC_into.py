@@ -0,0 +1,91 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+
+from cryptography.hazmat.primitives import padding, ciphers
+from cryptography.hazmat.backends import default_backend
+
+from ._buffer import byte_view, buffer_nbytes
+from .instrumentation import instrumented
+
+@instrumented("encrypt_AES_CBC_into", nbytes="cleardata")
+def encrypt_AES_CBC_into(cleardata: Any, aes_key: Any, iv: Any, out: Any) -> int:
+    r"""
+    Encrypts a cleardata message using AES in CBC mode and writes the cipherdata into a caller-provided buffer.
+
+    This is the version of :func:`pyaescbc.encrypt_AES_CBC` without allocation: the full blocks of the cleardata are encrypted
+    directly into ``out`` with the ``update_into`` method of the cipher context, and only the last block is padded with PKCS7 padding.
+    The cipherdata length is ``16 * (len(cleardata) // 16 + 1)`` bytes, so the same output buffer can be reused across calls.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        out = bytearray(16 * (len(cleardata) // 16 + 1))
+        size = aes.encrypt_AES_CBC_into(cleardata, aes_key, iv, out)
+
+    Parameters
+    ----------
+    cleardata : buffer
+        The message to encrypt using AES in CBC mode (bytearray, bytes, memoryview, mmap or any object supporting the buffer protocol).
+
+    aes_key : buffer
+        The 32-byte AES key derived from the password, salt and iterations.
+
+    iv : buffer
+        The 16-byte initialization vector (IV) to use in AES-CBC mode.
+
+    out : buffer
+        The writable buffer receiving the cipherdata. It must contain at least ``16 * (len(cleardata) // 16 + 1)`` bytes.
+
+    Returns
+    -------
+    size : int
+        The number of bytes written at the beginning of ``out``.
+
+    Raises
+    ------
+    TypeError
+        If a given argument does not support the buffer protocol or if out is read-only.
+    ValueError
+        If the `aes_key` isn't 32 bytes long, the `iv` isn't 16 bytes long or `out` is too small.
+    """
+    # Check the types of the parameters
+    cleardata_length = buffer_nbytes(cleardata, 'cleardata')
+    aes_key_length = buffer_nbytes(aes_key, 'aes_key')
+    iv_length = buffer_nbytes(iv, 'iv')
+    out_length = buffer_nbytes(out, 'out')
+
+    # Check the values of the parameters
+    if aes_key_length != 32:
+        raise ValueError('Parameter aes_key is not 32 bytes long.')
+    if iv_length != 16:
+        raise ValueError('Parameter iv is not 16 bytes long.')
+    full_length = cleardata_length - cleardata_length % 16
+    if out_length < full_length + 16:
+        raise ValueError(f'Parameter out must contain at least {full_length + 16} bytes.')
+
+    # Encrypt the full blocks in place, then the padded last block
+    cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(iv), backend=default_backend())
+    encryptor = cipher.encryptor()
+    padder = padding.PKCS7(128).padder()
+    with byte_view(cleardata, 'cleardata') as clear_view, byte_view(out, 'out') as out_view:
+        if out_view.readonly:
+            raise TypeError('Parameter out is a read-only buffer.')
+        if full_length > 0:
+            encryptor.update_into(clear_view[:full_length], out_view)
+        last_block = bytes(padder.update(clear_view[full_length:])) + padder.finalize()
+        out_view[full_length:full_length + 16] = encryptor.update(last_block) + encryptor.finalize()
+    return full_length + 16
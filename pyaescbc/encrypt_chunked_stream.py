@@ -0,0 +1,256 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, BinaryIO
+
+from ._chunked import PREAMBLE_LENGTH, read_full, header_hmac, encrypt_chunk
+from .bundle_header import BundleHeader, BUNDLE_VERSION, KDF_PBKDF2_SHA256, FLAG_CHUNKED
+from .random_salt import random_salt
+from .derive_key import derive_key
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+
+def encrypt_chunked_stream(
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    password: bytearray,
+    iterations: int,
+    authdata: Optional[bytearray] = None,
+    chunk_size: int = 65_536,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None,
+    max_workers: Optional[int] = None
+) -> int:
+    """
+    encrypt_chunked_stream encrypts a binary stream into a seekable chunked bundle.
+
+    The clear data is cut in chunks of ``chunk_size`` bytes, and each chunk is encrypted on its own with :func:`pyaescbc.encrypt_AES_CBC`
+    (its own random IV) and authenticated with :func:`pyaescbc.create_hmac` together with its index and a last-chunk marker,
+    so the chunks can not be reordered, dropped or truncated without the decryption failing.
+    The key is derived once from the password with :func:`pyaescbc.derive_key`.
+
+    .. code-block:: console
+
+        header (24 bytes) | chunk_size (4 bytes) | salt (32 bytes) | header_hmac (32 bytes) | record 0 | record 1 | ...
+        record = iv (16 bytes) | hmac (32 bytes) | cipherdata (chunk_size + 16 bytes, shorter for the last record)
+
+    The header is a :class:`pyaescbc.BundleHeader` with the ``FLAG_CHUNKED`` flag, whose payload length is the length of the clear data.
+    All the records but the last one have the same length, so the position of any chunk is computed from its index,
+    and :func:`pyaescbc.decrypt_range` decrypts any range of the clear data by reading only the chunks it touches.
+    The cost is 64 bytes per chunk (IV, HMAC and padding).
+
+    Only two buffers of ``chunk_size`` bytes are held in memory. The output stream is seeked back to write the header once all the data has been processed.
+
+    CBC encryption is serial inside a chunk, but the chunks are independent: with ``max_workers``, the chunks are encrypted and authenticated
+    on a pool of ``max_workers`` threads (the cryptography backend and ``hashlib`` release the GIL) while the calling thread reads the input
+    and writes the records in order, so the throughput scales with the number of cores. The output has the same format, and at most
+    ``2 * max_workers + 2`` buffers of ``chunk_size`` bytes are held in memory. Use a chunk size of 1 MiB or more to amortize the thread hand-off.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = aes.generate_random_iterations()
+        with open("video.mp4", "rb") as input_stream, open("video.mp4.aes", "wb") as output_stream:
+            aes.encrypt_chunked_stream(input_stream, output_stream, password, iterations, chunk_size=65_536)
+
+    .. seealso::
+
+        - function :func:`pyaescbc.decrypt_chunked_stream` to decrypt the whole stream.
+        - function :func:`pyaescbc.decrypt_range` to decrypt a range of the clear data.
+
+    Parameters
+    ----------
+    input_stream : BinaryIO
+        The readable binary stream containing the clear data (must implement ``readinto``).
+
+    output_stream : BinaryIO
+        The writable and seekable binary stream receiving the chunked bundle.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : int
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in all the HMACs. Default is None.
+
+    chunk_size : int
+        The number of bytes of clear data per chunk. It must be a strictly positive multiple of 16. Default is 64 KiB.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    max_workers : Optional[int]
+        The number of threads encrypting the chunks in parallel. Default is None, the chunks are encrypted by the calling thread.
+
+    Returns
+    -------
+    bundle_size : int
+        The number of bytes written in the output stream.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations or max_workers is not a strictly positive integer, or if chunk_size is not a strictly positive multiple of 16.
+    """
+    # Check the types of the parameters
+    if not hasattr(input_stream, 'readinto'):
+        raise TypeError("Parameter input_stream is not a readable binary stream.")
+    if (not hasattr(output_stream, 'write')) or (not hasattr(output_stream, 'seek')):
+        raise TypeError("Parameter output_stream is not a writable and seekable binary stream.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if not isinstance(iterations, int):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(chunk_size, int):
+        raise TypeError("Parameter chunk_size is not integer")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError("Parameter max_workers is not integer")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if iterations <= 0 or iterations >= 2**32:
+        raise ValueError('Parameter iterations must be a positive integer fitting in 32 bits.')
+    if chunk_size <= 0 or chunk_size % 16 != 0 or chunk_size >= 2**32:
+        raise ValueError('Parameter chunk_size must be a strictly positive multiple of 16 fitting in 32 bits.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a positive integer.')
+
+    # Encryption
+    salt = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    preamble = bytearray()
+    buffers = []  # All the buffers of clear data, to be deleted at the end
+    free_buffers = []
+    pending = deque()  # Records being encrypted by the pool, in the order of the chunks: (future, view, buffer)
+    executor = None
+    try:
+        salt = random_salt()
+        if key_cache is not None:
+            derived_key = key_cache.derive_key(password, salt, iterations)
+        else:
+            derived_key = derive_key(password, salt, iterations)
+        aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+        if max_workers is not None:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        # Write a blank preamble, it is filled in at the end when the payload length is known
+        start = output_stream.tell()
+        output_stream.write(bytearray(PREAMBLE_LENGTH))
+        bundle_size = PREAMBLE_LENGTH
+
+        def get_buffer() -> bytearray:
+            if free_buffers:
+                return free_buffers.pop()
+            buffers.append(bytearray(chunk_size))
+            return buffers[-1]
+
+        def write_record(record: tuple) -> int:
+            for component in record:
+                output_stream.write(component)
+            return sum(len(component) for component in record)
+
+        def write_pending(limit: int) -> int:
+            # Write the oldest records in order until at most ``limit`` records are pending
+            size = 0
+            while len(pending) > limit:
+                future, view, buffer = pending[0]
+                size += write_record(future.result())
+                pending.popleft()
+                view.release()
+                free_buffers.append(buffer)
+            return size
+
+        # Encrypt the chunks, reading one chunk ahead to know which one is the last
+        payload_length = 0
+        index = 0
+        buffer = get_buffer()
+        size = read_full(input_stream, buffer)
+        while True:
+            next_buffer = get_buffer()
+            next_size = read_full(input_stream, next_buffer) if size == chunk_size else 0
+            last = next_size == 0
+            view = memoryview(buffer)[:size]
+            if executor is None:
+                with view:
+                    bundle_size += write_record(encrypt_chunk(view, aes_key, hmac_key, index, last, authdata))
+                free_buffers.append(buffer)
+            else:
+                pending.append((executor.submit(encrypt_chunk, view, aes_key, hmac_key, index, last, authdata), view, buffer))
+                bundle_size += write_pending(2 * max_workers)
+            payload_length += size
+            if last:
+                free_buffers.append(next_buffer)
+                break
+            buffer, size = next_buffer, next_size
+            index += 1
+        bundle_size += write_pending(0)
+
+        # Fill in the preamble, authenticated with the header MAC
+        header = BundleHeader(BUNDLE_VERSION, KDF_PBKDF2_SHA256, iterations, payload_length, FLAG_CHUNKED)
+        preamble = header.to_bytearray() + chunk_size.to_bytes(4, 'big') + salt + bytearray(32)
+        preamble[PREAMBLE_LENGTH - 32:] = header_hmac(hmac_key, preamble, authdata)
+        end = output_stream.tell()
+        output_stream.seek(start)
+        output_stream.write(preamble)
+        output_stream.seek(end)
+    except Exception as e:
+        raise e
+    finally:
+        # Waiting for the pending chunks before deleting their buffers
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for future, view, buffer in pending:
+            view.release()
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(salt)
+        delete_bytearray(derived_key)
+        delete_bytearray(aes_key)
+        delete_bytearray(hmac_key)
+        delete_bytearray(preamble)
+        for buffer in buffers:
+            delete_bytearray(buffer)
+
+    # Return the size of the chunked bundle
+    return bundle_size
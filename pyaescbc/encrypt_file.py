@@ -0,0 +1,107 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import Optional, Union
+
+from .encrypt_stream import encrypt_stream
+from .bundle_header import KDF_PBKDF2_SHA256
+
+def encrypt_file(
+    input_path: Union[str, os.PathLike],
+    output_path: Union[str, os.PathLike],
+    password: bytearray,
+    iterations: int,
+    authdata: Optional[bytearray] = None,
+    chunk_size: int = 1_048_576,
+    delete_keys: bool = True,
+    versioned: bool = False,
+    kdf: int = KDF_PBKDF2_SHA256
+) -> int:
+    """
+    encrypt_file encrypts the content of a file and writes the encrypted bundle in another file.
+
+    The file is encrypted chunk by chunk with :func:`pyaescbc.encrypt_stream`, so only one buffer of ``chunk_size`` bytes is held in memory.
+    The output file is byte-compatible with the encrypted bundle returned by :func:`pyaescbc.cleardata_to_encrypted_bundle`.
+    If the encryption fails, the partially written output file is removed.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = aes.generate_random_iterations()
+        aes.encrypt_file("dump.sql", "dump.sql.aes", password, iterations, delete_keys=True)
+
+    Parameters
+    ----------
+    input_path : Union[str, os.PathLike]
+        The path of the file to encrypt.
+
+    output_path : Union[str, os.PathLike]
+        The path of the file receiving the encrypted bundle.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : int
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+        If not None, it will be used to create the HMAC.
+
+    chunk_size : int
+        The number of bytes read from the input file at each step. Default is 1 MiB.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    versioned : bool
+        Write a versioned bundle starting with a header (see :class:`pyaescbc.BundleHeader`), decrypted without giving the iterations again.
+        Default is False (legacy bundle).
+
+    kdf : int
+        The key derivation function recorded in the header: ``KDF_PBKDF2_SHA256`` (default) or ``KDF_PBKDF2_HKDF_SHA256`` (versioned bundles only).
+
+    Returns
+    -------
+    bundle_size : int
+        The number of bytes written in the output file.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations or chunk_size is not a strictly positive integer.
+        If kdf is not a password-based KDF, or is not ``KDF_PBKDF2_SHA256`` for a legacy bundle.
+    """
+    # Check the types of the parameters
+    if not isinstance(input_path, (str, os.PathLike)):
+        raise TypeError("Parameter input_path is not a path.")
+    if not isinstance(output_path, (str, os.PathLike)):
+        raise TypeError("Parameter output_path is not a path.")
+
+    # Encryption
+    with open(input_path, 'rb') as input_stream:
+        try:
+            with open(output_path, 'w+b') as output_stream:
+                bundle_size = encrypt_stream(input_stream, output_stream, password, iterations, authdata=authdata, chunk_size=chunk_size, delete_keys=delete_keys, versioned=versioned, kdf=kdf)
+        except Exception as e:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise e
+
+    return bundle_size
@@ -0,0 +1,142 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional, Iterable, Iterator
+
+from .cleardata_to_encrypted_bundle import cleardata_to_encrypted_bundle
+from .delete_bytearray import delete_bytearray
+
+def encrypt_many(
+    cleardatas: Iterable[bytearray],
+    password: bytearray,
+    iterations: int,
+    authdata: Optional[bytearray] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    delete_keys: bool = True
+) -> Iterator[bytearray]:
+    """
+    encrypt_many encrypts a batch of clear data with the same password and number of iterations.
+
+    Each clear data is encrypted by :func:`pyaescbc.cleardata_to_encrypted_bundle` with its own salt and IV,
+    and the encryptions (including the key derivations) are spread over a process pool.
+    The encrypted bundles are yielded in the order of the clear data, and at most two items per worker are in flight at the same time.
+
+    .. warning::
+
+        With the default process pool, the call must be protected by ``if __name__ == "__main__":`` on platforms using the ``spawn`` start method.
+        The clear data and the password are sent to the worker processes, where they are deleted after the encryption.
+
+    .. seealso::
+
+        - function :func:`pyaescbc.decrypt_many` to decrypt a batch of encrypted bundles.
+
+    Parameters
+    ----------
+    cleardatas : Iterable[bytearray]
+        The clear messages to encrypt.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : int
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC of every bundle. Default is None.
+
+    max_workers : Optional[int]
+        The number of processes of the pool. Default is None, the number of processors of the machine.
+        Ignored if `executor` is given, except to bound the number of items in flight.
+
+    executor : Optional[Executor]
+        The executor running the encryptions. Default is None, a ``ProcessPoolExecutor`` is created for the batch and shut down at the end.
+
+    delete_keys : bool
+        Delete each clear data once encrypted, and the password and the authdata at the end of the batch. Default is True.
+
+    Returns
+    -------
+    encrypted_bundles : Iterator[bytearray]
+        The encrypted bundle of each clear data.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty or if iterations or max_workers is not a strictly positive integer.
+    """
+    # Check the types of the parameters
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if not isinstance(iterations, int):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError("Parameter max_workers is not integer")
+    if (executor is not None) and (not isinstance(executor, Executor)):
+        raise TypeError("Parameter executor is not Executor instance.")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if iterations <= 0:
+        raise ValueError('Parameter iterations must be a positive integer.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a positive integer.')
+
+    return _encrypt_many(cleardatas, password, iterations, authdata, max_workers, executor, delete_keys)
+
+def _encrypt_many(cleardatas, password, iterations, authdata, max_workers, executor, delete_keys):
+    """ Generator of :func:`encrypt_many`, the parameters are already checked. """
+    own_executor = executor is None
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    pending = deque()
+    try:
+        for cleardata in cleardatas:
+            if not isinstance(cleardata, bytearray):
+                raise TypeError("Parameter cleardatas does not contain only bytearray")
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+            # Each task works on its own copies, which are deleted by the task
+            pending.append(executor.submit(
+                cleardata_to_encrypted_bundle,
+                cleardata.copy(),
+                password.copy(),
+                iterations,
+                authdata=authdata.copy() if authdata is not None else None,
+                delete_keys=True
+            ))
+            if delete_keys:
+                delete_bytearray(cleardata)
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor and executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
@@ -0,0 +1,196 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mmap
+import os
+from typing import Optional, Union
+
+from ._atomic import atomic_output
+from .random_salt import random_salt
+from .random_iv import random_iv
+from ._kdf import derive_password_key
+from .encrypt_AES_CBC_HMAC_into import encrypt_AES_CBC_HMAC_into
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .bundle_header import BundleHeader, HEADER_LENGTH, BUNDLE_VERSION, KDF_PBKDF2_SHA256, PASSWORD_KDF_IDS
+
+def encrypt_path(
+    input_path: Union[str, os.PathLike],
+    output_path: Union[str, os.PathLike],
+    password: bytearray,
+    iterations: int,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None,
+    versioned: bool = False,
+    kdf: int = KDF_PBKDF2_SHA256
+) -> int:
+    """
+    encrypt_path encrypts a file into an encrypted bundle file through memory maps.
+
+    The input file is mapped read-only, and the output file is preallocated to the length of the bundle and mapped too,
+    so :func:`pyaescbc.encrypt_AES_CBC_HMAC_into` reads the clear data from the mapped pages of the input and writes the cipherdata
+    straight into the mapped pages of the output. The page cache replaces the heap: no buffer of the size of the file is allocated.
+    The output is byte-compatible with :func:`pyaescbc.cleardata_to_encrypted_bundle` and can be decrypted with :func:`pyaescbc.decrypt_path`,
+    :func:`pyaescbc.decrypt_file` or :func:`pyaescbc.decrypt`.
+
+    The output is written in a temporary file renamed at the end, so the output file is either untouched or complete.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = aes.generate_random_iterations()
+        aes.encrypt_path("dump.sql", "dump.sql.aes", password, iterations, versioned=True)
+
+    Parameters
+    ----------
+    input_path : Union[str, os.PathLike]
+        The path of the file to encrypt.
+
+    output_path : Union[str, os.PathLike]
+        The path of the file receiving the encrypted bundle. An existing file is replaced.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : int
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    versioned : bool
+        Start the bundle with a versioned header (see :class:`pyaescbc.BundleHeader`). Default is False.
+
+    kdf : int
+        The key derivation function recorded in the header: ``KDF_PBKDF2_SHA256`` (:func:`pyaescbc.derive_key`, default)
+        or ``KDF_PBKDF2_HKDF_SHA256`` (:func:`pyaescbc.derive_key_v2`, versioned bundles only).
+
+    Returns
+    -------
+    bundle_size : int
+        The number of bytes written in the output file.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty or if iterations is not a strictly positive integer.
+        If kdf is not a password-based KDF, or is not ``KDF_PBKDF2_SHA256`` for a legacy bundle.
+    """
+    # Check the types of the parameters
+    if not isinstance(input_path, (str, os.PathLike)):
+        raise TypeError("Parameter input_path is not a path.")
+    if not isinstance(output_path, (str, os.PathLike)):
+        raise TypeError("Parameter output_path is not a path.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if not isinstance(iterations, int):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+    if not isinstance(versioned, bool):
+        raise TypeError("Parameter versioned is not a boolean.")
+    if not isinstance(kdf, int):
+        raise TypeError("Parameter kdf is not integer")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if iterations <= 0:
+        raise ValueError('Parameter iterations must be a positive integer.')
+    if versioned and iterations >= 2**32:
+        raise ValueError("Parameter iterations must be a positive integer lower than 2**32 for a versioned bundle.")
+    if kdf not in PASSWORD_KDF_IDS:
+        raise ValueError(f"Parameter kdf {kdf} is not a password-based KDF.")
+    if (not versioned) and kdf != KDF_PBKDF2_SHA256:
+        raise ValueError("Parameter kdf requires a versioned bundle, a legacy bundle can not record it.")
+
+    # Encryption
+    salt = bytearray()
+    iv = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    header = bytearray()
+    expected_hmac = bytearray()
+    try:
+        salt = random_salt()
+        iv = random_iv()
+        derived_key = derive_password_key(password, salt, iterations, kdf, key_cache)
+        aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+
+        with open(input_path, 'rb') as input_stream:
+            cleardata_length = os.fstat(input_stream.fileno()).st_size
+            # An empty file can not be mapped
+            cleardata = mmap.mmap(input_stream.fileno(), 0, access=mmap.ACCESS_READ) if cleardata_length > 0 else bytearray()
+            try:
+                cipherdata_length = 16 * (cleardata_length // 16 + 1)
+                if versioned:
+                    header = BundleHeader(BUNDLE_VERSION, kdf, iterations, cipherdata_length).to_bytearray()
+                offset = len(header)
+                bundle_size = offset + 80 + cipherdata_length
+
+                # Preallocate and map the output, and build the bundle in place
+                with atomic_output(output_path, overwrite=True) as output_stream:
+                    output_stream.truncate(bundle_size)
+                    with mmap.mmap(output_stream.fileno(), bundle_size, access=mmap.ACCESS_WRITE) as encrypted_bundle:
+                        encrypted_bundle[0:offset] = header
+                        encrypted_bundle[offset:offset + 16] = iv
+                        encrypted_bundle[offset + 16:offset + 48] = salt
+                        with memoryview(encrypted_bundle) as view, view[offset + 80:] as cipherdata_view:
+                            expected_hmac = encrypt_AES_CBC_HMAC_into(cleardata, aes_key, hmac_key, iv, cipherdata_view, authdata=authdata, header=header if versioned else None)
+                        encrypted_bundle[offset + 48:offset + 80] = expected_hmac
+                        encrypted_bundle.flush()
+            finally:
+                if isinstance(cleardata, mmap.mmap):
+                    cleardata.close()
+    except Exception as e:
+        raise e
+    finally:
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(salt)
+        delete_bytearray(iv)
+        delete_bytearray(derived_key)
+        delete_bytearray(aes_key)
+        delete_bytearray(hmac_key)
+        delete_bytearray(header)
+        delete_bytearray(expected_hmac)
+
+    # Return the size of the encrypted bundle
+    return bundle_size
@@ -0,0 +1,284 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hmac
+import hashlib
+from typing import Optional, BinaryIO
+
+from cryptography.hazmat.primitives import padding, ciphers
+from cryptography.hazmat.backends import default_backend
+
+from .random_salt import random_salt
+from .random_iv import random_iv
+from ._kdf import derive_password_key
+from ._chunked import read_full
+from ._stream import remaining_length
+from .create_encrypted_bundle import create_encrypted_bundle
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .bundle_header import BundleHeader, BUNDLE_VERSION, KDF_PBKDF2_SHA256, PASSWORD_KDF_IDS
+from .instrumentation import _StageTimer
+
+def encrypt_stream(
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    password: bytearray,
+    iterations: int,
+    authdata: Optional[bytearray] = None,
+    chunk_size: int = 1_048_576,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None,
+    salt: Optional[bytearray] = None,
+    versioned: bool = False,
+    kdf: int = KDF_PBKDF2_SHA256
+) -> int:
+    """
+    encrypt_stream encrypts a binary stream chunk by chunk and writes the encrypted bundle in the output stream.
+
+    The output is byte-compatible with :func:`pyaescbc.cleardata_to_encrypted_bundle`:
+    the 80-byte header ``iv + salt + expected_hmac`` is written first with a blank HMAC,
+    the cipherdata is streamed after it, and the output stream is seeked back to fill in the HMAC once all the data has been processed.
+    Only one buffer of ``chunk_size`` bytes is held in memory.
+
+    .. note::
+
+        With ``versioned=True``, the bundle starts with a header carrying the KDF, the iterations and the length of the cipherdata
+        (see :class:`pyaescbc.BundleHeader`), so it can be decrypted without giving the iterations again.
+        The header is covered by the HMAC, so the length of the cipherdata is needed before the HMAC starts:
+        it is measured on a seekable input stream, otherwise the output stream must be readable and the cipherdata is read back
+        from it once written to compute the HMAC.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = aes.generate_random_iterations()
+        with open("dump.sql", "rb") as input_stream, open("dump.sql.aes", "wb") as output_stream:
+            aes.encrypt_stream(input_stream, output_stream, password, iterations, delete_keys=True)
+
+    .. seealso::
+
+        - function :func:`pyaescbc.decrypt_stream` to decrypt the stream.
+        - function :func:`pyaescbc.encrypt_file` to encrypt a file given its path.
+
+    Parameters
+    ----------
+    input_stream : BinaryIO
+        The readable binary stream containing the clear data (must implement ``readinto``).
+
+    output_stream : BinaryIO
+        The writable and seekable binary stream receiving the encrypted bundle.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : int
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+        If not None, it will be used to create the HMAC.
+
+    chunk_size : int
+        The number of bytes read from the input stream at each step. Default is 1 MiB.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    salt : Optional[bytearray]
+        The 32-byte salt to use instead of a random one. Default is None.
+        Several bundles encrypted with the same password, iterations and salt share the same derived key,
+        so it is derived only once with a :class:`pyaescbc.KeyCache`. Each bundle still has its own random IV.
+
+    versioned : bool
+        Write a versioned bundle starting with a header (see :class:`pyaescbc.BundleHeader`). Default is False (legacy bundle).
+
+    kdf : int
+        The key derivation function recorded in the header: ``KDF_PBKDF2_SHA256`` (:func:`pyaescbc.derive_key`, default)
+        or ``KDF_PBKDF2_HKDF_SHA256`` (:func:`pyaescbc.derive_key_v2`, versioned bundles only).
+
+    Returns
+    -------
+    bundle_size : int
+        The number of bytes written in the output stream.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations or chunk_size is not a strictly positive integer (iterations lower than 2**32 for a versioned bundle).
+        If kdf is not a password-based KDF, or is not ``KDF_PBKDF2_SHA256`` for a legacy bundle.
+        If a versioned bundle is written from a non-seekable input stream to a non-readable output stream.
+    """
+    # Check the types of the parameters
+    if not hasattr(input_stream, 'readinto'):
+        raise TypeError("Parameter input_stream is not a readable binary stream.")
+    if (not hasattr(output_stream, 'write')) or (not hasattr(output_stream, 'seek')):
+        raise TypeError("Parameter output_stream is not a writable and seekable binary stream.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if not isinstance(iterations, int):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(chunk_size, int):
+        raise TypeError("Parameter chunk_size is not integer")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+    if (salt is not None) and (not isinstance(salt, bytearray)):
+        raise TypeError("Parameter salt is not bytearray")
+    if not isinstance(versioned, bool):
+        raise TypeError("Parameter versioned is not a boolean.")
+    if not isinstance(kdf, int):
+        raise TypeError("Parameter kdf is not integer")
+
+    # Check the values of the parameters
+    if chunk_size <= 0:
+        raise ValueError('Parameter chunk_size must be a positive integer.')
+    if (salt is not None) and (len(salt) != 32):
+        raise ValueError('Parameter salt is not 32 bytes long.')
+    if versioned and not (0 < iterations < 2**32):
+        raise ValueError("Parameter iterations must be a positive integer lower than 2**32 for a versioned bundle.")
+    if kdf not in PASSWORD_KDF_IDS:
+        raise ValueError(f"Parameter kdf {kdf} is not a password-based KDF.")
+    if (not versioned) and kdf != KDF_PBKDF2_SHA256:
+        raise ValueError("Parameter kdf requires a versioned bundle, a legacy bundle can not record it.")
+    cleardata_length = remaining_length(input_stream) if versioned else None
+    read_back = versioned and cleardata_length is None
+    if read_back and not (hasattr(output_stream, 'readable') and output_stream.readable()):
+        raise ValueError('A versioned bundle requires a seekable input_stream or a readable output_stream.')
+
+    # Encryption
+    given_salt, salt = salt, bytearray()
+    iv = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    header = bytearray()
+    expected_hmac = bytearray()
+    buffer = bytearray(chunk_size)
+    timer = _StageTimer()
+    try:
+        salt = random_salt() if given_salt is None else given_salt.copy()
+        iv = random_iv()
+        derived_key = derive_password_key(password, salt, iterations, kdf, key_cache)
+        aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+
+        # Write the header with a blank HMAC, it is filled in at the end
+        start = output_stream.tell()
+        if versioned:
+            payload_length = 0 if read_back else 16 * (cleardata_length // 16 + 1)
+            header = BundleHeader(BUNDLE_VERSION, kdf, iterations, payload_length).to_bytearray()
+        preamble = create_encrypted_bundle(iv, salt, bytearray(32), bytearray())
+        output_stream.write(header)
+        output_stream.write(preamble)
+        bundle_size = len(header) + len(preamble)
+
+        # Stream the data through the padder, the encryptor and the HMAC (the header is authenticated first)
+        padder = padding.PKCS7(128).padder()
+        cipher = ciphers.Cipher(ciphers.algorithms.AES(aes_key), ciphers.modes.CBC(iv), backend=default_backend())
+        encryptor = cipher.encryptor()
+        mac = hmac.new(hmac_key, header, hashlib.sha256)
+        mac.update(iv)
+        cipherdata_length = 0
+        timer.start()
+        with memoryview(buffer) as view:
+            while True:
+                size = input_stream.readinto(buffer)
+                timer.lap("stream_io", size or 0)
+                if not size:
+                    break
+                chunk = encryptor.update(padder.update(view[:size]))
+                timer.lap("stream_AES_CBC", size)
+                if not read_back:
+                    mac.update(chunk)
+                    timer.lap("stream_HMAC", len(chunk))
+                output_stream.write(chunk)
+                timer.lap("stream_io", len(chunk))
+                cipherdata_length += len(chunk)
+        chunk = encryptor.update(padder.finalize()) + encryptor.finalize()
+        timer.lap("stream_AES_CBC")
+        if not read_back:
+            mac.update(chunk)
+            timer.lap("stream_HMAC", len(chunk))
+        output_stream.write(chunk)
+        timer.lap("stream_io", len(chunk))
+        cipherdata_length += len(chunk)
+        bundle_size += cipherdata_length
+        end = output_stream.tell()
+
+        if versioned and not read_back and cipherdata_length != payload_length:
+            raise ValueError('input_stream changed while it was encrypted.')
+        if read_back:
+            # Write the length of the cipherdata in the header, then authenticate the header and the cipherdata read back from the output
+            delete_bytearray(header)
+            header = BundleHeader(BUNDLE_VERSION, kdf, iterations, cipherdata_length).to_bytearray()
+            output_stream.seek(start)
+            output_stream.write(header)
+            mac = hmac.new(hmac_key, header, hashlib.sha256)
+            mac.update(iv)
+            output_stream.seek(start + len(header) + 80)
+            remaining = cipherdata_length
+            with memoryview(buffer) as view:
+                while remaining > 0:
+                    with view[:min(remaining, chunk_size)] as part:
+                        size = read_full(output_stream, part)
+                        timer.lap("stream_io", size)
+                        if size != len(part):
+                            raise ValueError('output_stream does not contain the cipherdata written.')
+                        mac.update(part)
+                        timer.lap("stream_HMAC", size)
+                    remaining -= size
+
+        # Fill in the HMAC in the header
+        if authdata is not None:
+            mac.update(authdata)
+        expected_hmac = bytearray(mac.digest())
+        output_stream.seek(start + len(header) + 48)
+        output_stream.write(expected_hmac)
+        output_stream.seek(end)
+    except Exception as e:
+        raise e
+    finally:
+        timer.record()
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(salt)
+        delete_bytearray(iv)
+        delete_bytearray(derived_key)
+        delete_bytearray(aes_key)
+        delete_bytearray(hmac_key)
+        delete_bytearray(header)
+        delete_bytearray(expected_hmac)
+        delete_bytearray(buffer)
+
+    # Return the size of the encrypted bundle
+    return bundle_size
@@ -14,25 +14,30 @@
 
 from typing import Optional
 
-from .derive_key import derive_key
-from .decrypt_AES_CBC import decrypt_AES_CBC
-from .extract_cryptography_components import extract_cryptography_components
-from .check_hmac import check_hmac
-from .create_hmac import create_hmac
+from ._kdf import derive_password_key
+from .decrypt_AES_CBC_HMAC_into import decrypt_AES_CBC_HMAC_into
+from .extract_cryptography_views import extract_cryptography_views
 from .delete_bytearray import delete_bytearray
-from .auth_error import AuthError
+from .key_cache import KeyCache
+from .bundle_header import KDF_PBKDF2_SHA256, PASSWORD_KDF_IDS
+from .instrumentation import instrumented
 
+@instrumented("encrypted_bundle_to_cleardata", nbytes="encrypted_bundle", iterations="iterations")
 def encrypted_bundle_to_cleardata(
     encrypted_bundle: bytearray,
     password: bytearray, 
-    iterations: int,
+    iterations: Optional[int] = None,
     authdata: Optional[bytearray] = None,
-    delete_keys: bool = True
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None,
+    max_workers: Optional[int] = None
 ) -> bytearray: 
     """
     encrypted_bundle_to_cleardata decrypts the encrypted bundle to generate the cleardata.
 
     The number of iterations can be generated using the function :func:`pyaescbc.generate_random_iterations` or :func:`pyaescbc.generate_pin_iterations`.
+    For a versioned bundle (see :class:`pyaescbc.BundleHeader`), the iterations can be omitted: they are read from the header of the bundle,
+    and the key is derived with the KDF of the header (:func:`pyaescbc.derive_key` or :func:`pyaescbc.derive_key_v2`).
 
     .. note::
         
@@ -61,8 +66,9 @@ def encrypted_bundle_to_cleardata(
     password : bytearray
         The user password. It must not be empty.
 
-    iterations : int
+    iterations : Optional[int]
         The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None for a versioned bundle, the iterations of the header are then used. Default is None.
     
     authdata : Optional[bytearray]
         The authentication data to use in the HMAC. Default is None.
@@ -71,6 +77,14 @@ def encrypted_bundle_to_cleardata(
     delete_keys : bool
         Delete the encrypted_bundle, the password from memory at the end of the function. Default is True.
 
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    max_workers : Optional[int]
+        The number of threads decrypting large cipherdata in parallel segments, see :func:`pyaescbc.decrypt_AES_CBC_HMAC_into`.
+        Default is None, the cipherdata is decrypted in a single pass.
+
     Returns
     -------
     cleardata : bytearray
@@ -82,50 +96,80 @@ def encrypted_bundle_to_cleardata(
         If an argument is of the wrong type.
     ValueError
         If `password` is empty, `iterations` is not a strictly positive integer, or `encrypted_bundle` does not contain more than 80 bytes.
+        If `iterations` is None for a legacy bundle or does not match the header, or if the header is not a password-based one.
+    AuthError
+        If the HMAC is not valid.
     """
     # Check the types of the parameters
     if (not isinstance(encrypted_bundle, bytearray)) or (not isinstance(password, bytearray)):
         raise TypeError("Parameters encrypted_bundle or password is not bytearray")
-    if not isinstance(iterations, int):
+    if (iterations is not None) and (not isinstance(iterations, int)):
         raise TypeError("Parameter iterations is not integer")
     if not isinstance(delete_keys, bool):
         raise ValueError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+    if (max_workers is not None) and (not isinstance(max_workers, int)):
+        raise TypeError("Parameter max_workers is not integer")
 
     # Check the values of the parameters
     if len(password) == 0:
         raise ValueError('Parameter password must not be empty.')
-    if iterations <= 0:
+    if (iterations is not None) and (iterations <= 0):
         raise ValueError('Parameter iterations must be a positive integer.')
+    if (max_workers is not None) and (max_workers <= 0):
+        raise ValueError('Parameter max_workers must be a positive integer.')
     if len(encrypted_bundle) < 80:
         raise ValueError(f'encrypted_bundle does not contain more than 80 bytes.')
 
-    # Decryption
+    # Decryption (the components are memoryviews on the bundle, they are not copied)
+    views = ()
+    salt = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    cleardata = bytearray()
     try:
-        iv, salt, expected_hmac, cipherdata = extract_cryptography_components(encrypted_bundle)
-        derived_key = derive_key(password, salt, iterations)
+        *views, bundle_header = extract_cryptography_views(encrypted_bundle, return_header=True)
+        iv, salt_view, expected_hmac, cipherdata = views
+        header = None
+        kdf = KDF_PBKDF2_SHA256
+        if bundle_header is not None:
+            if bundle_header.kdf not in PASSWORD_KDF_IDS or bundle_header.flags != 0:
+                raise ValueError('encrypted_bundle is not a password-based bundle.')
+            if iterations is None:
+                iterations = bundle_header.iterations
+            elif iterations != bundle_header.iterations:
+                raise ValueError('Parameter iterations does not match the header of encrypted_bundle.')
+            kdf = bundle_header.kdf
+            header = bundle_header.to_bytearray()  # The header is authenticated with the cipherdata
+        elif iterations is None:
+            raise ValueError('Parameter iterations is required for a bundle without header.')
+        salt = bytearray(salt_view)
+        derived_key = derive_password_key(password, salt, iterations, kdf, key_cache)
         aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
         hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
-        given_hmac = create_hmac(hmac_key, iv, cipherdata, authdata=authdata)
-        if not check_hmac(given_hmac, expected_hmac):
-            raise AuthError('The HMAC is not valid. The data has been tampered with or the password is incorrect.')
-        cleardata = decrypt_AES_CBC(cipherdata, aes_key, iv)
+        # Check the HMAC and decrypt the cipherdata in a single pass
+        cleardata = bytearray(len(cipherdata))
+        size = decrypt_AES_CBC_HMAC_into(cipherdata, aes_key, hmac_key, iv, expected_hmac, cleardata, authdata=authdata, header=header, max_workers=max_workers)
+        del cleardata[size:]
     except Exception as e:
+        delete_bytearray(cleardata)
         raise e
     finally:
+        # Releasing the views so the bundle can be deleted
+        for view in views:
+            view.release()
         # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
         if delete_keys:
             delete_bytearray(encrypted_bundle)
             delete_bytearray(password)
             if authdata is not None:
                 delete_bytearray(authdata)
-        delete_bytearray(iv)
         delete_bytearray(salt)
-        delete_bytearray(expected_hmac)
-        delete_bytearray(cipherdata)
         delete_bytearray(derived_key)
         delete_bytearray(aes_key)
         delete_bytearray(hmac_key)
-        delete_bytearray(given_hmac)
         
     # Return the decrypted data
     return cleardata
@@ -0,0 +1,136 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+from .derive_key_hkdf import derive_key_hkdf
+from .decrypt_AES_CBC_HMAC_into import decrypt_AES_CBC_HMAC_into
+from .extract_cryptography_views import extract_cryptography_views
+from .delete_bytearray import delete_bytearray
+from .bundle_header import KDF_HKDF_SHA256
+
+def encrypted_bundle_to_cleardata_with_key(
+    encrypted_bundle: bytearray,
+    master_key: bytearray,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+) -> bytearray:
+    """
+    encrypted_bundle_to_cleardata_with_key decrypts the encrypted bundle with a high-entropy master key to generate the cleardata.
+
+    This is the raw-key mode of :func:`pyaescbc.encrypted_bundle_to_cleardata`, for bundles created by
+    :func:`pyaescbc.cleardata_to_encrypted_bundle_with_key`. The AES and HMAC keys are derived from the master key
+    and the salt of the bundle with HKDF (see :func:`pyaescbc.derive_key_hkdf`).
+    Legacy and versioned bundles (see :class:`pyaescbc.BundleHeader`) are both accepted.
+
+    .. note::
+
+        The encrypted_bundle, the master key and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc
+
+        cleardata = pyaescbc.encrypted_bundle_to_cleardata_with_key(encrypted_bundle, master_key, delete_keys=False)
+
+    Parameters
+    ----------
+    encrypted_bundle : bytearray
+        The encrypted bundle to decrypt using AES in CBC mode. Must contain at least 80 bytes.
+
+    master_key : bytearray
+        The master key used to create the bundle. It must be at least 32 bytes long.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+        If not None, it will be used to create the HMAC.
+
+    delete_keys : bool
+        Delete the encrypted_bundle, the master key and authdata from memory at the end of the function. Default is True.
+
+    Returns
+    -------
+    cleardata : bytearray
+        The decrypted message using AES in CBC mode.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If `master_key` is shorter than 32 bytes or `encrypted_bundle` does not contain more than 80 bytes.
+        If the header of `encrypted_bundle` is not a raw-key one.
+    AuthError
+        If the HMAC is not valid.
+    """
+    # Check the types of the parameters
+    if not isinstance(encrypted_bundle, bytearray):
+        raise TypeError("Parameter encrypted_bundle is not bytearray instance.")
+    if not isinstance(master_key, bytearray):
+        raise TypeError("Parameter master_key is not bytearray instance.")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray instance.")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+
+    # Check the values of the parameters
+    if len(master_key) < 32:
+        raise ValueError('Parameter master_key must be at least 32 bytes long.')
+    if len(encrypted_bundle) < 80:
+        raise ValueError(f'encrypted_bundle does not contain more than 80 bytes.')
+
+    # Decryption (the components are memoryviews on the bundle, they are not copied)
+    views = ()
+    salt = bytearray()
+    derived_key = bytearray()
+    aes_key = bytearray()
+    hmac_key = bytearray()
+    cleardata = bytearray()
+    try:
+        *views, bundle_header = extract_cryptography_views(encrypted_bundle, return_header=True)
+        iv, salt_view, expected_hmac, cipherdata = views
+        header = None
+        if bundle_header is not None:
+            if bundle_header.kdf != KDF_HKDF_SHA256 or bundle_header.flags != 0:
+                raise ValueError('encrypted_bundle is not a raw-key bundle.')
+            header = bundle_header.to_bytearray()  # The header is authenticated with the cipherdata
+        salt = bytearray(salt_view)
+        derived_key = derive_key_hkdf(master_key, salt)
+        aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+        # Check the HMAC and decrypt the cipherdata in a single pass
+        cleardata = bytearray(len(cipherdata))
+        size = decrypt_AES_CBC_HMAC_into(cipherdata, aes_key, hmac_key, iv, expected_hmac, cleardata, authdata=authdata, header=header)
+        del cleardata[size:]
+    except Exception as e:
+        delete_bytearray(cleardata)
+        raise e
+    finally:
+        # Releasing the views so the bundle can be deleted
+        for view in views:
+            view.release()
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(encrypted_bundle)
+            delete_bytearray(master_key)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(salt)
+        delete_bytearray(derived_key)
+        delete_bytearray(aes_key)
+        delete_bytearray(hmac_key)
+
+    # Return the decrypted data
+    return cleardata
@@ -0,0 +1,520 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Layout of an encrypted log file:
+#
+#   header (24 bytes)        BundleHeader with FLAG_LOG, the payload length is 0 (the log grows)
+#   salt (32 bytes)
+#   header_hmac (32 bytes)   HMAC(hmac_key, header + salt + authdata)
+#   records                  length (4 bytes) | iv (16 bytes) | hmac (32 bytes) | cipherdata, one record per appended message
+#
+# The length is the big-endian length of the cipherdata. The HMAC of a record is create_hmac(hmac_key, iv, cipherdata, index (8 bytes) + authdata),
+# so a record can not be moved to another position or copied to another log. A record is written with a single write at the end of the file,
+# so a crash can only leave an incomplete record at the end of the log, which is found and cut when the log is opened again.
+
+import hmac
+import hashlib
+import os
+import threading
+from typing import Optional, Union, Iterator, Tuple
+
+from ._atomic import atomic_output
+from ._chunked import read_full
+from ._kdf import derive_password_key
+from .bundle_header import HEADER_STRUCT, HEADER_LENGTH, BUNDLE_MAGIC, BUNDLE_VERSION, KDF_PBKDF2_SHA256, PASSWORD_KDF_IDS, FLAG_LOG, BundleHeader
+from .random_salt import random_salt
+from .random_iv import random_iv
+from .encrypt_AES_CBC import encrypt_AES_CBC
+from .decrypt_AES_CBC import decrypt_AES_CBC
+from .create_hmac import create_hmac
+from .check_hmac import check_hmac
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .auth_error import AuthError
+
+LOG_PREAMBLE_LENGTH = HEADER_LENGTH + 32 + 32  # 88 bytes
+RECORD_PREFIX_LENGTH = 4 + 16 + 32  # 52 bytes
+
+class EncryptedLog:
+    """
+    Append-only encrypted log file deriving the key once per open.
+
+    Each appended message is encrypted with a fresh IV using :func:`pyaescbc.encrypt_AES_CBC`, authenticated with :func:`pyaescbc.create_hmac`
+    together with its index, and written as a length-prefixed record at the end of the file.
+    Appending a message costs the encryption of the message only: the records already written are not read or encrypted again,
+    and PBKDF2 runs once when the log is opened, instead of once per update with :func:`pyaescbc.cleardata_to_encrypted_bundle`.
+
+    .. code-block:: console
+
+        header (24 bytes) | salt (32 bytes) | header_hmac (32 bytes) | record 0 | record 1 | ...
+        record = length (4 bytes) | iv (16 bytes) | hmac (32 bytes) | cipherdata (length bytes)
+
+    The header is a :class:`pyaescbc.BundleHeader` with the ``FLAG_LOG`` flag, carrying the KDF and the iterations,
+    so an existing log is opened with the password only. The records are read back in order with :meth:`replay`.
+
+    A record is written with a single write at the end of the file. If the process crashes during a write, the log ends with an incomplete record:
+    when the log is opened again, the incomplete last record is cut with ``recover=True``, so the log holds all the records whose append returned.
+    Only a torn tail is cut: a corrupted length prefix or a complete record failing its HMAC raises instead, and no record is deleted. The number of bytes cut is given by :attr:`recovered_bytes`. Call :meth:`sync` to flush the records to the disk.
+
+    .. warning::
+
+        The records can not be reordered, modified or removed from the middle of the log, but the log can be truncated on a record boundary
+        without the replay failing, as any append-only file. Store the number of records (``len(log)``) elsewhere if it must be checked.
+
+    The keys are deleted from memory when the log is closed with :meth:`close` or at the end of the ``with`` block.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = aes.generate_random_iterations()
+        with aes.EncryptedLog("audit.log.aes", password, iterations) as log:
+            log.append(bytearray("user=toto action=login", 'utf-8'))
+
+        with aes.EncryptedLog("audit.log.aes", bytearray("password", 'utf-8')) as log:  # The iterations are read from the header
+            for cleardata in log.replay():
+                print(cleardata.decode('utf-8'))
+
+    Parameters
+    ----------
+    path : Union[str, os.PathLike]
+        The path of the log file. It is created if it does not exist or is empty.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer lower than 2**32.
+        It is required to create a log, and can be None to open an existing log (the iterations of the header are then used). Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC of the header and of all the records. Default is None.
+
+    kdf : int
+        The key derivation function of a new log: ``KDF_PBKDF2_SHA256`` (:func:`pyaescbc.derive_key`, default)
+        or ``KDF_PBKDF2_HKDF_SHA256`` (:func:`pyaescbc.derive_key_v2`). The KDF of an existing log is read from its header.
+
+    delete_keys : bool
+        Delete the password and the authdata from memory once the key is derived. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    recover : bool
+        Cut the incomplete last record left by a crash. Default is True.
+        If False, a ValueError is raised instead.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations is missing for a new log, is not a strictly positive integer or does not match the header,
+        if kdf is not a password-based KDF, if the file is not an encrypted log, if a length prefix is corrupted,
+        or if its last record is incomplete and recover is False.
+    AuthError
+        If the HMAC of the header or of the last complete record is not valid (wrong password or authdata, or modified data).
+    """
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        password: bytearray,
+        iterations: Optional[int] = None,
+        authdata: Optional[bytearray] = None,
+        kdf: int = KDF_PBKDF2_SHA256,
+        delete_keys: bool = True,
+        key_cache: Optional[KeyCache] = None,
+        recover: bool = True
+    ) -> None:
+        # Check the types of the parameters
+        if not isinstance(path, (str, os.PathLike)):
+            raise TypeError("Parameter path is not a path.")
+        if not isinstance(password, bytearray):
+            raise TypeError("Parameter password is not bytearray")
+        if (iterations is not None) and (not isinstance(iterations, int)):
+            raise TypeError("Parameter iterations is not integer")
+        if (authdata is not None) and (not isinstance(authdata, bytearray)):
+            raise TypeError("Parameter authdata is not bytearray")
+        if not isinstance(kdf, int):
+            raise TypeError("Parameter kdf is not integer")
+        if not isinstance(delete_keys, bool):
+            raise TypeError("Parameter delete_keys is not a boolean.")
+        if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+            raise TypeError("Parameter key_cache is not KeyCache instance.")
+        if not isinstance(recover, bool):
+            raise TypeError("Parameter recover is not a boolean.")
+
+        # Check the values of the parameters
+        if len(password) == 0:
+            raise ValueError('Parameter password must not be empty.')
+        if (iterations is not None) and not (0 < iterations < 2**32):
+            raise ValueError('Parameter iterations must be a positive integer lower than 2**32.')
+        if kdf not in PASSWORD_KDF_IDS:
+            raise ValueError(f'Parameter kdf {kdf} is not a password-based KDF.')
+
+        self._path = os.fspath(path)
+        self._stream = None
+        self._salt = bytearray()
+        self._aes_key = bytearray()
+        self._hmac_key = bytearray()
+        self._authdata = bytearray() if authdata is None else authdata.copy()
+        self._lock = threading.Lock()
+        self._closed = True
+        preamble = bytearray()
+        derived_key = bytearray()
+        given_hmac = bytearray()
+        try:
+            if (not os.path.exists(self._path)) or os.path.getsize(self._path) == 0:
+                # Create the log: the preamble is written atomically, so a log file always has a complete preamble
+                if iterations is None:
+                    raise ValueError('Parameter iterations is required to create a log.')
+                self._salt = random_salt()
+                derived_key = derive_password_key(password, self._salt, iterations, kdf, key_cache)
+                self._aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+                self._hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+                preamble = BundleHeader(BUNDLE_VERSION, kdf, iterations, 0, FLAG_LOG).to_bytearray() + self._salt
+                preamble += self._header_hmac(preamble)
+                with atomic_output(self._path, overwrite=True) as output_stream:
+                    output_stream.write(preamble)
+                self._stream = open(self._path, 'r+b')
+            else:
+                # Open the log and authenticate its preamble
+                self._stream = open(self._path, 'r+b')
+                preamble = bytearray(LOG_PREAMBLE_LENGTH)
+                if read_full(self._stream, preamble) != LOG_PREAMBLE_LENGTH or preamble[0:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+                    raise ValueError(f'{self._path} is not an encrypted log.')
+                magic, version, kdf, flags, header_iterations, payload_length = HEADER_STRUCT.unpack(preamble[0:HEADER_LENGTH])
+                if version != BUNDLE_VERSION:
+                    raise ValueError(f'Bundle version {version} is not supported.')
+                if not flags & FLAG_LOG:
+                    raise ValueError(f'{self._path} is not an encrypted log.')
+                if kdf not in PASSWORD_KDF_IDS:
+                    raise ValueError(f'{self._path} is not a password-based log.')
+                if iterations is None:
+                    iterations = header_iterations
+                elif iterations != header_iterations:
+                    raise ValueError('Parameter iterations does not match the header of the log.')
+                self._salt = preamble[HEADER_LENGTH:HEADER_LENGTH + 32]
+                derived_key = derive_password_key(password, self._salt, iterations, kdf, key_cache)
+                self._aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+                self._hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+                given_hmac = self._header_hmac(preamble[0:HEADER_LENGTH + 32])
+                if not check_hmac(given_hmac, preamble[HEADER_LENGTH + 32:LOG_PREAMBLE_LENGTH]):
+                    raise AuthError('The HMAC is not valid. The data has been tampered with or the password is incorrect.')
+            self._iterations = iterations
+            self._kdf = kdf
+            self._count, self._end, self._recovered_bytes = self._scan(recover)
+        except Exception as e:
+            if self._stream is not None:
+                self._stream.close()
+            delete_bytearray(self._salt)
+            delete_bytearray(self._aes_key)
+            delete_bytearray(self._hmac_key)
+            delete_bytearray(self._authdata)
+            raise e
+        finally:
+            # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+            if delete_keys:
+                delete_bytearray(password)
+                if authdata is not None:
+                    delete_bytearray(authdata)
+            delete_bytearray(preamble)
+            delete_bytearray(derived_key)
+            delete_bytearray(given_hmac)
+        self._closed = False
+
+    def _header_hmac(self, preamble: bytearray) -> bytearray:
+        """ Computes the HMAC of the header, the salt and the authdata. """
+        mac = hmac.new(self._hmac_key, preamble, hashlib.sha256)
+        mac.update(self._authdata)
+        return bytearray(mac.digest())
+
+    def _record_authdata(self, index: int) -> bytearray:
+        """ Returns the data authenticated with a record: its index and the authdata of the log. """
+        return bytearray(index.to_bytes(8, 'big')) + self._authdata
+
+    def _read_record(self, stream, index: int) -> bytearray:
+        """ Reads, authenticates and decrypts the record ``index`` at the current position of the stream. """
+        prefix = bytearray(RECORD_PREFIX_LENGTH)
+        cipherdata = bytearray()
+        position = bytearray()
+        given_hmac = bytearray()
+        try:
+            if read_full(stream, prefix) != RECORD_PREFIX_LENGTH:
+                raise ValueError('The log is truncated.')
+            cipherdata = bytearray(int.from_bytes(prefix[0:4], 'big'))
+            if read_full(stream, cipherdata) != len(cipherdata):
+                raise ValueError('The log is truncated.')
+            iv = prefix[4:20]
+            expected_hmac = prefix[20:52]
+            position = self._record_authdata(index)
+            given_hmac = create_hmac(self._hmac_key, iv, cipherdata, authdata=position)
+            if not check_hmac(given_hmac, expected_hmac):
+                raise AuthError('The HMAC is not valid. The data has been tampered with or the password is incorrect.')
+            cleardata = decrypt_AES_CBC(cipherdata, self._aes_key, iv)
+        finally:
+            delete_bytearray(prefix)
+            delete_bytearray(cipherdata)
+            delete_bytearray(position)
+            delete_bytearray(given_hmac)
+        return cleardata
+
+    def _scan(self, recover: bool) -> Tuple[int, int, int]:
+        """
+        Walks the length prefixes of the records to find the end of the log, and cuts the incomplete last record left by a crash.
+
+        Only the last complete record is authenticated, the other ones are authenticated when they are replayed.
+        The bytes after it are cut only if they are a torn record: a valid length prefix claiming more bytes than the end of the file,
+        with no complete record inside. Any other damage (invalid length prefix followed by data, last complete record not authenticated)
+        raises, so a corrupted prefix in the middle of the log never deletes the records after it.
+        Returns the number of records, the end offset of the last record and the number of bytes cut.
+        """
+        size = self._stream.seek(0, 2)
+        offset = LOG_PREAMBLE_LENGTH
+        last_offset = None
+        count = 0
+        torn = False
+        length = bytearray(4)
+        while offset < size:
+            if size - offset < 4:
+                torn = True  # Incomplete length prefix
+                break
+            self._stream.seek(offset)
+            read_full(self._stream, length)
+            cipherdata_length = int.from_bytes(length, 'big')
+            if cipherdata_length == 0 or cipherdata_length % 16 != 0:
+                raise ValueError(f'The length prefix of the record {count} of {self._path} is not valid, the log is corrupted.')
+            if offset + RECORD_PREFIX_LENGTH + cipherdata_length > size:
+                torn = True  # The record claims more bytes than the end of the file
+                break
+            last_offset = offset
+            offset += RECORD_PREFIX_LENGTH + cipherdata_length
+            count += 1
+
+        # Check the last complete record, a record in the middle of the log or a complete record is never cut
+        if last_offset is not None:
+            self._stream.seek(last_offset)
+            delete_bytearray(self._read_record(self._stream, count - 1))
+
+        # Cut the torn tail, only if it does not hide a complete record behind a corrupted length prefix
+        if torn:
+            if self._holds_record(offset, size, count):
+                raise ValueError(f'The length prefix of the record {count} of {self._path} is not valid, the log is corrupted.')
+            if not recover:
+                raise ValueError(f'The last record of {self._path} is incomplete, open it with recover=True to cut it.')
+            self._stream.truncate(offset)
+            self._stream.flush()
+        return count, offset, size - offset
+
+    def _holds_record(self, offset: int, size: int, index: int) -> bool:
+        """ Returns True if the bytes from ``offset`` to ``size`` start with a complete record ``index`` authenticated with a shorter length than its prefix. """
+        if size - offset < RECORD_PREFIX_LENGTH + 16:
+            return False
+        prefix = bytearray(RECORD_PREFIX_LENGTH)
+        block = bytearray(16)
+        position = self._record_authdata(index)
+        try:
+            self._stream.seek(offset)
+            read_full(self._stream, prefix)
+            mac = hmac.new(self._hmac_key, prefix[4:20], hashlib.sha256)  # create_hmac(hmac_key, iv, cipherdata, authdata=position)
+            for _ in range((size - offset - RECORD_PREFIX_LENGTH) // 16):
+                read_full(self._stream, block)
+                mac.update(block)
+                candidate = mac.copy()
+                candidate.update(position)
+                if hmac.compare_digest(candidate.digest(), bytes(prefix[20:52])):
+                    return True
+        finally:
+            delete_bytearray(prefix)
+            delete_bytearray(block)
+            delete_bytearray(position)
+        return False
+
+    @property
+    def path(self) -> str:
+        """ The path of the log file. """
+        return self._path
+
+    @property
+    def iterations(self) -> int:
+        """ The number of iterations for PBKDF2 of the log. """
+        return self._iterations
+
+    @property
+    def kdf(self) -> int:
+        """ The identifier of the key derivation function of the log. """
+        return self._kdf
+
+    @property
+    def size(self) -> int:
+        """ The size of the log file in bytes. """
+        return self._end
+
+    @property
+    def recovered_bytes(self) -> int:
+        """ The number of bytes of incomplete records cut when the log was opened. """
+        return self._recovered_bytes
+
+    @property
+    def closed(self) -> bool:
+        """ True if the log file is closed and its keys have been deleted. """
+        return self._closed
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("The log is closed.")
+
+    def append(self, cleardata: bytearray, delete_keys: bool = True) -> int:
+        """
+        Encrypts a message with the keys of the log and a fresh IV, and appends it as a record at the end of the log.
+
+        The cost of the append only depends on the length of the message. The record is flushed to the operating system,
+        call :meth:`sync` to flush it to the disk.
+
+        Parameters
+        ----------
+        cleardata : bytearray
+            The clear message to append.
+
+        delete_keys : bool
+            Delete the cleardata from memory at the end of the method. Default is True.
+
+        Returns
+        -------
+        index : int
+            The index of the record in the log.
+
+        Raises
+        ------
+        TypeError
+            If an argument is of the wrong type.
+        ValueError
+            If the log is closed or if the message does not fit in a record (4 GiB).
+        """
+        # Check the types of the parameters
+        if not isinstance(cleardata, bytearray):
+            raise TypeError("Parameter cleardata is not bytearray")
+        if not isinstance(delete_keys, bool):
+            raise TypeError("Parameter delete_keys is not a boolean.")
+        self._check_open()
+
+        # Check the values of the parameters
+        cipherdata_length = 16 * (len(cleardata) // 16 + 1)
+        if cipherdata_length >= 2**32:
+            raise ValueError('Parameter cleardata does not fit in a record of the log.')
+
+        # Encryption
+        iv = bytearray()
+        cipherdata = bytearray()
+        position = bytearray()
+        expected_hmac = bytearray()
+        record = bytearray()
+        try:
+            with self._lock:
+                index = self._count
+                iv = random_iv()
+                cipherdata = encrypt_AES_CBC(cleardata, self._aes_key, iv)
+                position = self._record_authdata(index)
+                expected_hmac = create_hmac(self._hmac_key, iv, cipherdata, authdata=position)
+                record = bytearray(cipherdata_length.to_bytes(4, 'big')) + iv + expected_hmac + cipherdata
+                # A single write at the end of the log, cut back if it fails
+                try:
+                    self._stream.seek(self._end)
+                    self._stream.write(record)
+                    self._stream.flush()
+                except Exception:
+                    self._stream.truncate(self._end)
+                    raise
+                self._end += len(record)
+                self._count += 1
+        except Exception as e:
+            raise e
+        finally:
+            # Deleting from memory all critical data for security
+            if delete_keys:
+                delete_bytearray(cleardata)
+            delete_bytearray(iv)
+            delete_bytearray(cipherdata)
+            delete_bytearray(position)
+            delete_bytearray(expected_hmac)
+            delete_bytearray(record)
+
+        return index
+
+    def replay(self) -> Iterator[bytearray]:
+        """
+        Reads, authenticates and decrypts the records of the log in order.
+
+        The records are read sequentially from a separate read-only handle, so the log can be appended to during the replay:
+        the records appended after the start of the replay are not yielded.
+
+        Yields
+        ------
+        cleardata : bytearray
+            The decrypted message of each record, from the oldest to the newest.
+
+        Raises
+        ------
+        ValueError
+            If the log is closed or truncated.
+        AuthError
+            If the HMAC of a record is not valid.
+        """
+        self._check_open()
+        count = self._count
+        with open(self._path, 'rb') as input_stream:
+            input_stream.seek(LOG_PREAMBLE_LENGTH)
+            for index in range(count):
+                self._check_open()
+                yield self._read_record(input_stream, index)
+
+    def sync(self) -> None:
+        """
+        Flushes the records appended to the log to the disk.
+        """
+        self._check_open()
+        with self._lock:
+            self._stream.flush()
+            os.fsync(self._stream.fileno())
+
+    def close(self) -> None:
+        """
+        Closes the log file and deletes the keys of the log from memory. The log can not be used afterwards.
+        """
+        if self._closed:
+            return
+        with self._lock:
+            self._stream.close()
+            delete_bytearray(self._salt)
+            delete_bytearray(self._aes_key)
+            delete_bytearray(self._hmac_key)
+            delete_bytearray(self._authdata)
+            self._closed = True
+
+    def __enter__(self) -> "EncryptedLog":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -12,44 +12,67 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Tuple
+from typing import Tuple, Any, Union, Optional
 
-def extract_cryptography_components(encrypted_bundle: bytearray) -> Tuple[bytearray, bytearray, bytearray, bytearray]:
+from ._buffer import byte_view, buffer_nbytes
+from .bundle_header import BundleHeader, HEADER_LENGTH, FLAG_CHUNKED, FLAG_LOG
+from .read_bundle_header import read_bundle_header
+
+def extract_cryptography_components(encrypted_bundle: Any, return_header: bool = False) -> Union[Tuple[bytearray, bytearray, bytearray, bytearray], Tuple[bytearray, bytearray, bytearray, bytearray, Optional[BundleHeader]]]:
     """
     Extracts the IV, salt, expected HMAC, and cipherdata from the encrypted bundle.
 
+    Versioned bundles (see :class:`pyaescbc.BundleHeader`) and legacy bundles without header are both accepted,
+    the header being detected with :func:`pyaescbc.read_bundle_header`.
+
     .. seealso::
 
         - function :func:`pyaescbc.create_encrypted_bundle` to create the encrypted bundle.
 
     Parameters
     ----------
-    encrypted_bundle : bytearray
-        The encrypted bundle. Must contain at least 80 bytes.
+    encrypted_bundle : buffer
+        The encrypted bundle (bytearray, bytes, memoryview, mmap or any object supporting the buffer protocol). Must contain at least 80 bytes.
+
+    return_header : bool
+        Also return the header of the bundle, or None for a legacy bundle. Default is False.
 
     Returns
     -------
     tuple
-        A tuple containing the IV, salt, expected HMAC, and cipherdata.
+        A tuple containing the copies of the IV, salt, expected HMAC, and cipherdata as bytearrays.
+        If `return_header` is True, the header (:class:`pyaescbc.BundleHeader` or None) is added at the end of the tuple.
 
     Raises
     ------
     TypeError
-        If the argument is not a `bytearray` instance.
+        If the argument does not support the buffer protocol.
     ValueError
-        If the bytearray does not contain at least 80 bytes.
+        If the bytearray does not contain at least 80 bytes, if its header is not supported or does not match its length, or if it is a chunked bundle.
     """
     # Check the types of the parameters
-    if not isinstance(encrypted_bundle, bytearray):
-        raise TypeError('Parameter encrypted_bundle is not bytearray instance.')
+    encrypted_bundle_length = buffer_nbytes(encrypted_bundle, 'encrypted_bundle')
+    if not isinstance(return_header, bool):
+        raise TypeError('Parameter return_header is not a boolean.')
     
     # Check the value of the parameters
-    if len(encrypted_bundle) < 80:
+    if encrypted_bundle_length < 80:
         raise ValueError(f'encrypted_bundle does not contain more than 80 bytes.') 
 
+    # Skip the header of versioned bundles
+    header = read_bundle_header(encrypted_bundle)
+    offset = 0 if header is None else HEADER_LENGTH
+    if header is not None and header.flags & FLAG_CHUNKED:
+        raise ValueError('encrypted_bundle is a chunked bundle, use pyaescbc.decrypt_chunked_stream or pyaescbc.decrypt_range.')
+    if header is not None and header.flags & FLAG_LOG:
+        raise ValueError('encrypted_bundle is an encrypted log, use pyaescbc.EncryptedLog.')
+
     # Extract the components
-    iv = encrypted_bundle[0:16]
-    salt = encrypted_bundle[16:48]
-    expected_hmac = encrypted_bundle[48:80]
-    cipherdata = encrypted_bundle[80:]
+    with byte_view(encrypted_bundle, 'encrypted_bundle') as view:
+        iv = bytearray(view[offset:offset + 16])
+        salt = bytearray(view[offset + 16:offset + 48])
+        expected_hmac = bytearray(view[offset + 48:offset + 80])
+        cipherdata = bytearray(view[offset + 80:])
+    if return_header:
+        return iv, salt, expected_hmac, cipherdata, header
     return iv, salt, expected_hmac, cipherdata
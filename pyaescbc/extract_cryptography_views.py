@@ -0,0 +1,80 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Tuple, Any, Union, Optional
+
+from ._buffer import byte_view, buffer_nbytes
+from .bundle_header import BundleHeader, HEADER_LENGTH, FLAG_CHUNKED, FLAG_LOG
+from .read_bundle_header import read_bundle_header
+
+def extract_cryptography_views(encrypted_bundle: Any, return_header: bool = False) -> Union[Tuple[memoryview, memoryview, memoryview, memoryview], Tuple[memoryview, memoryview, memoryview, memoryview, Optional[BundleHeader]]]:
+    """
+    Returns memoryviews on the IV, salt, expected HMAC, and cipherdata of the encrypted bundle, without copying them.
+
+    This is the zero-copy version of :func:`pyaescbc.extract_cryptography_components`.
+    Versioned bundles (see :class:`pyaescbc.BundleHeader`) and legacy bundles without header are both accepted.
+
+    .. warning::
+
+        If the bundle is a bytearray, it can not be resized (and so can not be deleted with :func:`pyaescbc.delete_bytearray`) until all the views are released.
+
+    .. seealso::
+
+        - function :func:`pyaescbc.allocate_encrypted_bundle` to build a bundle in place.
+
+    Parameters
+    ----------
+    encrypted_bundle : buffer
+        The encrypted bundle (bytearray, bytes, memoryview, mmap or any object supporting the buffer protocol). Must contain at least 80 bytes.
+
+    return_header : bool
+        Also return the header of the bundle, or None for a legacy bundle. Default is False.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the views on the IV, salt, expected HMAC, and cipherdata.
+        The views are read-only if the bundle is read-only (bytes, read-only mmap, ...).
+        If `return_header` is True, the header (:class:`pyaescbc.BundleHeader` or None) is added at the end of the tuple.
+
+    Raises
+    ------
+    TypeError
+        If the argument does not support the buffer protocol.
+    ValueError
+        If the bytearray does not contain at least 80 bytes, if its header is not supported or does not match its length, or if it is a chunked bundle.
+    """
+    # Check the types of the parameters
+    encrypted_bundle_length = buffer_nbytes(encrypted_bundle, 'encrypted_bundle')
+    if not isinstance(return_header, bool):
+        raise TypeError('Parameter return_header is not a boolean.')
+
+    # Check the value of the parameters
+    if encrypted_bundle_length < 80:
+        raise ValueError(f'encrypted_bundle does not contain more than 80 bytes.')
+
+    # Skip the header of versioned bundles
+    header = read_bundle_header(encrypted_bundle)
+    offset = 0 if header is None else HEADER_LENGTH
+    if header is not None and header.flags & FLAG_CHUNKED:
+        raise ValueError('encrypted_bundle is a chunked bundle, use pyaescbc.decrypt_chunked_stream or pyaescbc.decrypt_range.')
+    if header is not None and header.flags & FLAG_LOG:
+        raise ValueError('encrypted_bundle is an encrypted log, use pyaescbc.EncryptedLog.')
+
+    # Create the views
+    with byte_view(encrypted_bundle, 'encrypted_bundle') as view:
+        views = view[offset:offset + 16], view[offset + 16:offset + 48], view[offset + 48:offset + 80], view[offset + 80:]
+    if return_header:
+        return (*views, header)
+    return views
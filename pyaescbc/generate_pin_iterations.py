@@ -16,14 +16,16 @@ import hashlib
 from typing import Optional
 
 from .delete_bytearray import delete_bytearray
+from .calibrate_iterations import calibrate_iterations
 
-def generate_pin_iterations(pin: bytearray, Nmin: Optional[int] = None, Nmax: Optional[int] = None, delete_keys: bool = True) -> int:
+def generate_pin_iterations(pin: bytearray, Nmin: Optional[int] = None, Nmax: Optional[int] = None, delete_keys: bool = True, target_latency: Optional[float] = None) -> int:
     """
     Generates a number of iterations for PBKDF2 based on the PIN.
 
     Use the following code to estimate the order of magnitude of the number of iterations.
     By default, the number of iterations is between 2,000,000 and 5,000,000 (valid for computers with 4GB of RAM in 2021).
     It is recommended to have a derived key generation time between 1 and 2 seconds to avoid brute force attacks withouth affecting the user experience.
+    The range can also be calibrated on the current host for a given latency with ``target_latency`` (see :func:`pyaescbc.calibrate_iterations`).
 
     .. note::
 
@@ -60,6 +62,16 @@ def generate_pin_iterations(pin: bytearray, Nmin: Optional[int] = None, Nmax: Op
         Delete the PIN from memory at the end of the function. Default is True.
         If False, it needs to be deleted after dealing with Exception.
 
+    target_latency : Optional[float]
+        The targeted duration of one key derivation in seconds. Default is None.
+        If not None, the range is computed by :func:`pyaescbc.calibrate_iterations` in place of the default range.
+        It cannot be used with `Nmin` or `Nmax`.
+
+        .. warning::
+
+            The calibrated range depends on the host, so the same PIN gives different iterations on different computers.
+            Use it only if the bundle is decrypted on the same computer, or store the iterations with the bundle.
+
     Returns
     -------
     iterations : int
@@ -70,7 +82,7 @@ def generate_pin_iterations(pin: bytearray, Nmin: Optional[int] = None, Nmax: Op
     TypeError
         If `Nmin` or `Nmax` are not int instances or if `pin` is not a bytearray instance.
     ValueError
-        If `Nmin` or `Nmax` are not positive integers or if `Nmin` is greater than `Nmax`.
+        If `Nmin` or `Nmax` are not positive integers, if `Nmin` is greater than `Nmax` or if `target_latency` is used with `Nmin` or `Nmax`.
     """
     # Check the types of the parameters
     if not isinstance(pin, bytearray):
@@ -79,9 +91,16 @@ def generate_pin_iterations(pin: bytearray, Nmin: Optional[int] = None, Nmax: Op
         raise TypeError('Parameter Nmin is not int instance.')
     if (Nmax is not None) and (not isinstance(Nmax, int)):
         raise TypeError('Parameter Nmax is not int instance.')
+    if (target_latency is not None) and (isinstance(target_latency, bool) or not isinstance(target_latency, (int, float))):
+        raise TypeError('Parameter target_latency is not float instance.')
     if not isinstance(delete_keys, bool):
         raise TypeError('Parameter delete_keys is not a boolean.')
-    
+
+    if target_latency is not None:
+        if (Nmin is not None) or (Nmax is not None):
+            raise ValueError('Parameter target_latency cannot be used with Nmin or Nmax.')
+        Nmin, Nmax = calibrate_iterations(target_latency)
+
     if Nmin is None:
         Nmin = 2_000_000
     if Nmax is None:
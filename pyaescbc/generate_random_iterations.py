@@ -15,7 +15,9 @@
 import random
 from typing import Optional
 
-def generate_random_iterations(Nmin: Optional[int] = None, Nmax: Optional[int] = None) -> int:
+from .calibrate_iterations import calibrate_iterations
+
+def generate_random_iterations(Nmin: Optional[int] = None, Nmax: Optional[int] = None, target_latency: Optional[float] = None) -> int:
     """
     Generates a random number of iterations for PBKDF2.
 
@@ -24,6 +26,7 @@ def generate_random_iterations(Nmin: Optional[int] = None, Nmax: Optional[int] =
     Use the following code to estimate the order of magnitude of the number of iterations.
     By default, the number of iterations is between 2,000,000 and 5,000,000 (valid for computers with 4GB of RAM in 2021).
     It is recommended to have a derived key generation time between 1 and 2 seconds to avoid brute force attacks withouth affecting the user experience.
+    The range can also be calibrated on the current host for a given latency with ``target_latency`` (see :func:`pyaescbc.calibrate_iterations`).
 
     .. code-block:: python
 
@@ -48,6 +51,11 @@ def generate_random_iterations(Nmin: Optional[int] = None, Nmax: Optional[int] =
     Nmax : Optional[int]
         The maximum number of iterations. The default is None -> 5,000,000.
 
+    target_latency : Optional[float]
+        The targeted duration of one key derivation in seconds. Default is None.
+        If not None, the range is computed by :func:`pyaescbc.calibrate_iterations` in place of the default range.
+        It cannot be used with `Nmin` or `Nmax`.
+
     Returns
     -------
     iterations : int
@@ -58,14 +66,21 @@ def generate_random_iterations(Nmin: Optional[int] = None, Nmax: Optional[int] =
     TypeError
         If `Nmin` or `Nmax` are not int instances.
     ValueError
-        If `Nmin` or `Nmax` are not positive integers or if `Nmin` is greater than `Nmax`.
+        If `Nmin` or `Nmax` are not positive integers, if `Nmin` is greater than `Nmax` or if `target_latency` is used with `Nmin` or `Nmax`.
     """
     # Check the types of the parameters
     if (Nmin is not None) and (not isinstance(Nmin, int)):
         raise TypeError('Parameter Nmin is not int instance.')
     if (Nmax is not None) and (not isinstance(Nmax, int)):
         raise TypeError('Parameter Nmax is not int instance.')
-    
+    if (target_latency is not None) and (isinstance(target_latency, bool) or not isinstance(target_latency, (int, float))):
+        raise TypeError('Parameter target_latency is not float instance.')
+
+    if target_latency is not None:
+        if (Nmin is not None) or (Nmax is not None):
+            raise ValueError('Parameter target_latency cannot be used with Nmin or Nmax.')
+        Nmin, Nmax = calibrate_iterations(target_latency)
+
     if Nmin is None:
         Nmin = 2_000_000
     if Nmax is None:
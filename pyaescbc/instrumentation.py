@@ -0,0 +1,351 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextvars
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Registered callbacks, replaced (never mutated) so the disabled check is a single truth test
+_hooks: Tuple[Callable[["StageEvent"], None], ...] = ()
+_hooks_lock = threading.Lock()
+
+# Collector of the current context, see StageCollector
+_collector: contextvars.ContextVar[Optional["StageCollector"]] = contextvars.ContextVar("pyaescbc_stage_collector", default=None)
+
+# Number of instrumented calls in progress in the current context, so a failure is counted by the outermost stage only
+_depth: contextvars.ContextVar[int] = contextvars.ContextVar("pyaescbc_stage_depth", default=0)
+
+# Process-wide counters, updated only when enabled with enable_counters
+_counters_enabled = False
+_counters: Dict[str, Dict[str, float]] = {}
+_auth_failures = 0
+_counters_lock = threading.Lock()
+
+class StageEvent(NamedTuple):
+    """
+    Record of one call of an instrumented stage of the bundle pipeline.
+
+    Parameters
+    ----------
+    stage : str
+        The name of the stage, the name of the instrumented function (``"derive_key"``, ``"encrypt_AES_CBC_HMAC_into"``, ``"delete_bytearray"``, ...).
+        The loops of the stream functions (:func:`pyaescbc.encrypt_stream`, ...) record the time of their I/O, AES and HMAC
+        as the stages ``"stream_io"``, ``"stream_AES_CBC"`` and ``"stream_HMAC"``, one event per stage and call.
+
+    seconds : float
+        The wall-clock duration of the call.
+
+    nbytes : Optional[int]
+        The number of bytes processed by the call, None if the stage does not process data.
+
+    iterations : Optional[int]
+        The number of PBKDF2 iterations for ``derive_key``, None for the other stages.
+
+    error : Optional[str]
+        The name of the exception raised by the call, ``"AuthError"`` for a ``check_hmac`` call returning False, None if the call succeeded.
+    """
+    stage: str
+    seconds: float
+    nbytes: Optional[int]
+    iterations: Optional[int]
+    error: Optional[str]
+
+class StageCollector:
+    """
+    Collector of the stage events of the current context (thread or asyncio task).
+
+    The collector is activated with a ``with`` statement and records all the instrumented calls made in the block,
+    including the calls made by the functions of the package (an ``encrypt`` records its ``derive_key``,
+    ``encrypt_AES_CBC_HMAC_into`` and ``delete_bytearray`` stages, then itself as ``cleardata_to_encrypted_bundle``).
+    It is scoped with a :class:`contextvars.ContextVar`, so the calls of the other threads are not recorded.
+    Collectors can be nested, the inner one records the events of its block only.
+
+    .. code-block:: python
+
+        import pyaescbc
+
+        with pyaescbc.StageCollector() as collector:
+            encrypted_bundle = pyaescbc.encrypt(cleardata, password, iterations)
+        for stage, summary in collector.summary().items():
+            print(stage, summary["calls"], summary["seconds"], summary["bytes"])
+
+    .. seealso::
+
+        - function :func:`pyaescbc.register_stage_hook` to receive the events of all the contexts.
+        - function :func:`pyaescbc.enable_counters` for process-wide counters.
+
+    Attributes
+    ----------
+    events : List[StageEvent]
+        The events recorded, in the order the calls ended.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[StageEvent] = []
+        self._token = None
+
+    def __enter__(self) -> "StageCollector":
+        self._token = _collector.set(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _collector.reset(self._token)
+        self._token = None
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregates the events by stage.
+
+        Returns
+        -------
+        summary : dict
+            For each stage, the number of `calls` and `errors`, the total `seconds`, `bytes` and `iterations`.
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            _aggregate(summary, event)
+        return summary
+
+def _aggregate(summary: Dict[str, Dict[str, float]], event: StageEvent) -> None:
+    """ Adds an event to a summary by stage. """
+    entry = summary.get(event.stage)
+    if entry is None:
+        entry = summary[event.stage] = {"calls": 0, "errors": 0, "seconds": 0.0, "bytes": 0, "iterations": 0}
+    entry["calls"] += 1
+    entry["errors"] += event.error is not None
+    entry["seconds"] += event.seconds
+    entry["bytes"] += event.nbytes or 0
+    entry["iterations"] += event.iterations or 0
+
+def _record(event: StageEvent) -> None:
+    """ Dispatches an event to the collector of the context, the counters and the hooks. """
+    global _auth_failures
+    collector = _collector.get()
+    if collector is not None:
+        collector.events.append(event)
+    if _counters_enabled:
+        with _counters_lock:
+            _aggregate(_counters, event)
+            if event.error == "AuthError" and _depth.get() == 0:
+                _auth_failures += 1
+    for hook in _hooks:
+        hook(event)
+
+class _StageTimer:
+    """
+    Splits the time of a streaming loop between its stages (``"stream_io"``, ``"stream_AES_CBC"``, ``"stream_HMAC"``),
+    recorded as one event per stage at the end of the loop. It does nothing when no hook, no collector and no counter is active.
+    """
+    def __init__(self) -> None:
+        self.enabled = bool(_hooks or _counters_enabled) or _collector.get() is not None
+        self.seconds: Dict[str, float] = {}
+        self.nbytes: Dict[str, int] = {}
+        self._last = 0.0
+
+    def start(self) -> None:
+        """ Starts the first stage of the loop. """
+        if self.enabled:
+            self._last = time.perf_counter()
+
+    def lap(self, stage: str, nbytes: int = 0) -> None:
+        """ Adds the time elapsed since the previous lap (or the start) to the stage. """
+        if self.enabled:
+            now = time.perf_counter()
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + now - self._last
+            self.nbytes[stage] = self.nbytes.get(stage, 0) + nbytes
+            self._last = now
+
+    def record(self) -> None:
+        """ Records one event per stage. """
+        for stage, seconds in self.seconds.items():
+            _record(StageEvent(stage, seconds, self.nbytes[stage], None, None))
+        self.seconds.clear()
+
+def _argument(args: tuple, kwargs: dict, index: Optional[int], name: Optional[str]) -> Any:
+    """ Returns the argument of a call given its position and name, None if it is not given. """
+    if index is None:
+        return None
+    if index < len(args):
+        return args[index]
+    return kwargs.get(name)
+
+def _nbytes(obj: Any) -> Optional[int]:
+    """ Returns the length in bytes of a buffer, None if it is not a buffer. """
+    try:
+        with memoryview(obj) as view:
+            return view.nbytes
+    except TypeError:
+        return None
+
+def instrumented(stage: str, nbytes: Optional[str] = None, iterations: Optional[str] = None, auth: bool = False) -> Callable:
+    """
+    Decorator recording the calls of a function of the pipeline as the stage ``stage``.
+
+    When no hook, no collector and no counter is active, the wrapper only performs one check before calling the function.
+
+    Parameters
+    ----------
+    stage : str
+        The name of the stage.
+
+    nbytes : Optional[str]
+        The name of the parameter whose length in bytes is recorded, measured before the call. Default is None.
+
+    iterations : Optional[str]
+        The name of the parameter holding the PBKDF2 iterations. Default is None.
+
+    auth : bool
+        Record a False result as an ``"AuthError"``, for the HMAC checks. Default is False.
+    """
+    def decorator(function: Callable) -> Callable:
+        parameters = list(function.__code__.co_varnames[:function.__code__.co_argcount])
+        nbytes_index = None if nbytes is None else parameters.index(nbytes)
+        iterations_index = None if iterations is None else parameters.index(iterations)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not (_hooks or _counters_enabled) and _collector.get() is None:
+                return function(*args, **kwargs)
+            size = _nbytes(_argument(args, kwargs, nbytes_index, nbytes)) if nbytes_index is not None else None
+            count = _argument(args, kwargs, iterations_index, iterations)
+            error = None
+            token = _depth.set(_depth.get() + 1)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+                if auth and result is False:
+                    error = "AuthError"
+                return result
+            except BaseException as e:
+                error = type(e).__name__
+                raise
+            finally:
+                _depth.reset(token)
+                _record(StageEvent(stage, time.perf_counter() - start, size, count, error))
+        return wrapper
+    return decorator
+
+def register_stage_hook(hook: Callable[[StageEvent], None]) -> None:
+    """
+    Registers a callback receiving the :class:`pyaescbc.StageEvent` of every instrumented call, in all the threads.
+
+    The callback is called synchronously at the end of each call, it must be fast and must not raise.
+
+    .. code-block:: python
+
+        import pyaescbc
+
+        def log_slow_stages(event):
+            if event.seconds > 0.5:
+                logger.warning("slow %s: %.3f s (%s bytes)", event.stage, event.seconds, event.nbytes)
+
+        pyaescbc.register_stage_hook(log_slow_stages)
+
+    Parameters
+    ----------
+    hook : Callable[[StageEvent], None]
+        The callback to register.
+
+    Raises
+    ------
+    TypeError
+        If hook is not callable.
+    """
+    global _hooks
+    # Check the types of the parameters
+    if not callable(hook):
+        raise TypeError('Parameter hook is not callable.')
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+def unregister_stage_hook(hook: Callable[[StageEvent], None]) -> None:
+    """
+    Unregisters a callback registered with :func:`pyaescbc.register_stage_hook`.
+
+    Parameters
+    ----------
+    hook : Callable[[StageEvent], None]
+        The callback to unregister.
+
+    Raises
+    ------
+    ValueError
+        If hook is not registered.
+    """
+    global _hooks
+    with _hooks_lock:
+        if hook not in _hooks:
+            raise ValueError('Parameter hook is not registered.')
+        hooks = list(_hooks)
+        hooks.remove(hook)
+        _hooks = tuple(hooks)
+
+def enable_counters(enabled: bool = True) -> None:
+    """
+    Enables or disables the process-wide counters of the instrumented stages.
+
+    The counters are disabled by default. Once enabled, each instrumented call is aggregated in the counters
+    read with :func:`pyaescbc.get_counters`.
+
+    Parameters
+    ----------
+    enabled : bool
+        Enable the counters. Default is True.
+
+    Raises
+    ------
+    TypeError
+        If enabled is not a boolean.
+    """
+    global _counters_enabled
+    # Check the types of the parameters
+    if not isinstance(enabled, bool):
+        raise TypeError('Parameter enabled is not a boolean.')
+    _counters_enabled = enabled
+
+def get_counters() -> Dict[str, Any]:
+    """
+    Returns a snapshot of the process-wide counters, ready to be exported (JSON, metrics exporter, ...).
+
+    .. code-block:: python
+
+        import json
+        import pyaescbc
+
+        pyaescbc.enable_counters()
+        ...
+        print(json.dumps(pyaescbc.get_counters(), indent=2))
+
+    Returns
+    -------
+    counters : dict
+        The number of `auth_failures` (one per failed top-level call, the nested stages are not counted again), and the `stages` with for each stage the number of `calls` and `errors`,
+        the total `seconds`, `bytes` and `iterations`.
+    """
+    with _counters_lock:
+        return {
+            "auth_failures": _auth_failures,
+            "stages": {stage: dict(entry) for stage, entry in _counters.items()},
+        }
+
+def reset_counters() -> None:
+    """
+    Resets the process-wide counters to zero.
+    """
+    global _auth_failures
+    with _counters_lock:
+        _counters.clear()
+        _auth_failures = 0
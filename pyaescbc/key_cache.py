@@ -0,0 +1,254 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hmac
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .derive_key import derive_key
+from .derive_key_v2 import derive_key_v2
+from .bundle_header import KDF_PBKDF2_SHA256, KDF_PBKDF2_HKDF_SHA256
+from .random_bytearray import random_bytearray
+from .delete_bytearray import delete_bytearray
+
+class KeyCache:
+    """
+    In-memory cache of the derived keys created by :func:`pyaescbc.derive_key` (or :func:`pyaescbc.derive_key_v2`).
+
+    The cache avoids running PBKDF2 again when the same password, salt and number of iterations are used several times,
+    for example when the same encrypted bundle is decrypted repeatedly.
+
+    The entries are indexed by a keyed hash (HMAC-SHA256 with a random secret created with the cache) of the password, the salt and the number of iterations,
+    so neither the password nor the salt is stored in the cache.
+    The least recently used entry is evicted when the cache holds more than ``max_size`` entries,
+    and the entries older than ``ttl`` seconds are expired.
+    The evicted and expired derived keys are deleted from memory with :func:`pyaescbc.delete_bytearray`.
+
+    The cache is thread-safe and can be used as a context manager to delete all the keys at the end of the block.
+    Concurrent calls to :meth:`derive_key` for the same entry run PBKDF2 only once, the other threads wait for its result.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        with aes.KeyCache(max_size=8, ttl=60.0) as key_cache:
+            for encrypted_bundle in bundles:
+                password = bytearray("password", 'utf-8')
+                cleardata = aes.decrypt(encrypted_bundle, password, iterations, key_cache=key_cache)
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum number of derived keys held in the cache. It must be a strictly positive integer. Default is 16.
+
+    ttl : Optional[float]
+        The time to live of an entry in seconds. Default is 300 seconds. If None, the entries never expire.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If `max_size` or `ttl` is not strictly positive.
+    """
+    def __init__(self, max_size: int = 16, ttl: Optional[float] = 300.0) -> None:
+        # Check the types of the parameters
+        if not isinstance(max_size, int):
+            raise TypeError('Parameter max_size is not int instance.')
+        if (ttl is not None) and (not isinstance(ttl, (int, float))):
+            raise TypeError('Parameter ttl is not float instance.')
+
+        # Check the values of the parameters
+        if max_size <= 0:
+            raise ValueError('Parameter max_size must be a positive integer.')
+        if (ttl is not None) and (ttl <= 0):
+            raise ValueError('Parameter ttl must be strictly positive.')
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._secret = random_bytearray(32)
+        self._entries = OrderedDict()  # lookup key -> (derived_key, expiration time)
+        self._lock = threading.Lock()
+        self._pending = {}  # lookup key -> lock held while the derived key is computed
+
+    def _lookup_key(self, password: bytearray, salt: bytearray, iterations: int, kdf: int = KDF_PBKDF2_SHA256) -> bytes:
+        """ Computes the keyed hash indexing the derived key of (password, salt, iterations, kdf). """
+        if not isinstance(password, bytearray):
+            raise TypeError('Parameter password is not bytearray instance.')
+        if not isinstance(salt, bytearray):
+            raise TypeError('Parameter salt is not bytearray instance.')
+        if not isinstance(iterations, int):
+            raise TypeError('Parameter iterations is not int instance.')
+        if kdf not in (KDF_PBKDF2_SHA256, KDF_PBKDF2_HKDF_SHA256):
+            raise ValueError(f'Parameter kdf {kdf} is not a password-based KDF.')
+        mac = hmac.new(self._secret, len(password).to_bytes(8, 'big'), hashlib.sha256)
+        mac.update(password)
+        mac.update(len(salt).to_bytes(8, 'big'))
+        mac.update(salt)
+        mac.update(iterations.to_bytes(8, 'big'))
+        mac.update(kdf.to_bytes(1, 'big'))
+        return mac.digest()
+
+    def _expire(self) -> None:
+        """ Deletes the expired entries. The lock must be held. """
+        if self.ttl is None:
+            return
+        now = time.monotonic()
+        for lookup_key in [lookup_key for lookup_key, (_, expiration) in self._entries.items() if expiration <= now]:
+            derived_key, _ = self._entries.pop(lookup_key)
+            delete_bytearray(derived_key)
+
+    def get(self, password: bytearray, salt: bytearray, iterations: int, kdf: int = KDF_PBKDF2_SHA256) -> Optional[bytearray]:
+        """
+        Returns a copy of the cached derived key, or None if it is not in the cache.
+
+        Parameters
+        ----------
+        password : bytearray
+            The user password.
+
+        salt : bytearray
+            The 32-byte salt used to generate the derived key.
+
+        iterations : int
+            The number of iterations for PBKDF2.
+
+        kdf : int
+            The identifier of the key derivation function, ``KDF_PBKDF2_SHA256`` (:func:`pyaescbc.derive_key`, default)
+            or ``KDF_PBKDF2_HKDF_SHA256`` (:func:`pyaescbc.derive_key_v2`).
+
+        Returns
+        -------
+        derived_key : Optional[bytearray]
+            A copy of the 64-byte derived key, which can be deleted by the caller, or None.
+        """
+        lookup_key = self._lookup_key(password, salt, iterations, kdf)
+        with self._lock:
+            self._expire()
+            if lookup_key not in self._entries:
+                return None
+            self._entries.move_to_end(lookup_key)
+            derived_key, _ = self._entries[lookup_key]
+            return derived_key.copy()
+
+    def put(self, password: bytearray, salt: bytearray, iterations: int, derived_key: bytearray, kdf: int = KDF_PBKDF2_SHA256) -> None:
+        """
+        Stores a copy of the derived key in the cache.
+
+        Parameters
+        ----------
+        password : bytearray
+            The user password.
+
+        salt : bytearray
+            The 32-byte salt used to generate the derived key.
+
+        iterations : int
+            The number of iterations for PBKDF2.
+
+        derived_key : bytearray
+            The 64-byte derived key. The cache keeps its own copy.
+
+        kdf : int
+            The identifier of the key derivation function, ``KDF_PBKDF2_SHA256`` (:func:`pyaescbc.derive_key`, default)
+            or ``KDF_PBKDF2_HKDF_SHA256`` (:func:`pyaescbc.derive_key_v2`).
+        """
+        if not isinstance(derived_key, bytearray):
+            raise TypeError('Parameter derived_key is not bytearray instance.')
+        lookup_key = self._lookup_key(password, salt, iterations, kdf)
+        expiration = float('inf') if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if lookup_key in self._entries:
+                old_key, _ = self._entries.pop(lookup_key)
+                delete_bytearray(old_key)
+            self._entries[lookup_key] = (derived_key.copy(), expiration)
+            self._expire()
+            while len(self._entries) > self.max_size:
+                _, (old_key, _) = self._entries.popitem(last=False)
+                delete_bytearray(old_key)
+
+    def derive_key(self, password: bytearray, salt: bytearray, iterations: int, kdf: int = KDF_PBKDF2_SHA256) -> bytearray:
+        """
+        Returns the derived key from the cache, or derives it with :func:`pyaescbc.derive_key` (or :func:`pyaescbc.derive_key_v2`) and stores it.
+
+        Parameters
+        ----------
+        password : bytearray
+            The user password. It must not be empty.
+
+        salt : bytearray
+            The 32-byte salt used to generate the derived key.
+
+        iterations : int
+            The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+        kdf : int
+            The identifier of the key derivation function, ``KDF_PBKDF2_SHA256`` (:func:`pyaescbc.derive_key`, default)
+            or ``KDF_PBKDF2_HKDF_SHA256`` (:func:`pyaescbc.derive_key_v2`).
+
+        Returns
+        -------
+        derived_key : bytearray
+            A copy of the 64-byte derived key, which can be deleted by the caller.
+        """
+        derived_key = self.get(password, salt, iterations, kdf)
+        if derived_key is not None:
+            return derived_key
+        # Only one thread derives a given key, the others wait for it and read it from the cache
+        lookup_key = self._lookup_key(password, salt, iterations, kdf)
+        with self._lock:
+            pending = self._pending.setdefault(lookup_key, threading.Lock())
+        try:
+            with pending:
+                derived_key = self.get(password, salt, iterations, kdf)
+                if derived_key is None:
+                    if kdf == KDF_PBKDF2_HKDF_SHA256:
+                        derived_key = derive_key_v2(password, salt, iterations)
+                    else:
+                        derived_key = derive_key(password, salt, iterations)
+                    self.put(password, salt, iterations, derived_key, kdf)
+        finally:
+            with self._lock:
+                if self._pending.get(lookup_key) is pending:
+                    del self._pending[lookup_key]
+        return derived_key
+
+    def clear(self) -> None:
+        """
+        Deletes all the derived keys of the cache.
+        """
+        with self._lock:
+            while self._entries:
+                _, (derived_key, _) = self._entries.popitem()
+                delete_bytearray(derived_key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._entries)
+
+    def __enter__(self) -> "KeyCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.clear()
+
+    def __del__(self) -> None:
+        try:
+            self.clear()
+        except Exception:
+            pass
@@ -0,0 +1,67 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mmap
+import os
+from typing import Union
+
+def open_bundle(path: Union[str, os.PathLike]) -> mmap.mmap:
+    """
+    open_bundle maps an encrypted bundle file in memory, read-only.
+
+    The returned map supports the buffer protocol, so it can be given directly to :func:`pyaescbc.read_bundle_header`,
+    :func:`pyaescbc.extract_cryptography_views` or :func:`pyaescbc.decrypt_AES_CBC_HMAC_into`:
+    the pages of the file are read by the operating system when they are accessed, and the bundle is never copied in a bytearray.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        with aes.open_bundle("dump.sql.aes") as encrypted_bundle:
+            header = aes.read_bundle_header(encrypted_bundle)
+            iv, salt, expected_hmac, cipherdata = aes.extract_cryptography_views(encrypted_bundle)
+            ...
+            for view in (iv, salt, expected_hmac, cipherdata):
+                view.release()  # The map can not be closed while views are alive
+
+    .. seealso::
+
+        - function :func:`pyaescbc.decrypt_path` to decrypt a bundle file through a map.
+
+    Parameters
+    ----------
+    path : Union[str, os.PathLike]
+        The path of the encrypted bundle file.
+
+    Returns
+    -------
+    encrypted_bundle : mmap.mmap
+        The read-only map of the file, to be closed by the caller (it can be used as a context manager).
+
+    Raises
+    ------
+    TypeError
+        If path is not a path.
+    ValueError
+        If the file does not contain at least 80 bytes.
+    """
+    # Check the types of the parameters
+    if not isinstance(path, (str, os.PathLike)):
+        raise TypeError("Parameter path is not a path.")
+
+    # Map the file, the map stays valid once the file is closed
+    with open(path, 'rb') as stream:
+        if os.fstat(stream.fileno()).st_size < 80:
+            raise ValueError(f'{os.fspath(path)} does not contain more than 80 bytes.')
+        return mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
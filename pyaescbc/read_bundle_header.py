@@ -0,0 +1,83 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Optional
+
+from ._buffer import byte_view
+from .bundle_header import BundleHeader, HEADER_STRUCT, HEADER_LENGTH, BUNDLE_MAGIC, BUNDLE_VERSION, KDF_IDS, FLAG_CHUNKED, FLAG_LOG
+from ._chunked import PREAMBLE_LENGTH, chunked_length
+
+def read_bundle_header(encrypted_bundle: Any) -> Optional[BundleHeader]:
+    """
+    Reads the versioned header of an encrypted bundle.
+
+    A bundle starting with the magic ``b"PYAESCBC"`` is a versioned bundle (see :class:`pyaescbc.BundleHeader`).
+    Otherwise it is a legacy bundle ``iv | salt | hmac | cipherdata`` and None is returned.
+    The chunked bundles of :func:`pyaescbc.encrypt_chunked_stream` have the ``FLAG_CHUNKED`` flag set in their header,
+    and the log files of :class:`pyaescbc.EncryptedLog` the ``FLAG_LOG`` flag (their length is not checked, the log grows).
+    The header is not authenticated by this function, it is authenticated when the bundle is decrypted.
+
+    This allows to route a bundle to the right decryption function without trial decryption.
+
+    .. code-block:: python
+
+        import pyaescbc
+
+        header = pyaescbc.read_bundle_header(encrypted_bundle)
+        if header is None:
+            cleardata = pyaescbc.decrypt(encrypted_bundle, password, iterations)  # Legacy bundle
+        elif header.kdf == pyaescbc.KDF_PBKDF2_SHA256:
+            cleardata = pyaescbc.decrypt(encrypted_bundle, password)  # The iterations are read from the header
+        else:
+            cleardata = pyaescbc.encrypted_bundle_to_cleardata_with_key(encrypted_bundle, master_key)
+
+    Parameters
+    ----------
+    encrypted_bundle : buffer
+        The encrypted bundle (bytearray, bytes, memoryview, mmap or any object supporting the buffer protocol).
+
+    Returns
+    -------
+    header : Optional[BundleHeader]
+        The header of the bundle, or None for a legacy bundle.
+
+    Raises
+    ------
+    TypeError
+        If the argument does not support the buffer protocol.
+    ValueError
+        If the bundle has the magic but an unsupported version or KDF, or if its length does not match the payload length.
+    """
+    # Check the types of the parameters
+    with byte_view(encrypted_bundle, 'encrypted_bundle') as view:
+        encrypted_bundle_length = view.nbytes
+        if encrypted_bundle_length < HEADER_LENGTH or view[0:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            return None
+        magic, version, kdf, flags, iterations, payload_length = HEADER_STRUCT.unpack(view[0:HEADER_LENGTH])
+        chunk_size = int.from_bytes(view[HEADER_LENGTH:HEADER_LENGTH + 4], 'big') if encrypted_bundle_length >= PREAMBLE_LENGTH else 0
+
+    # Check the values of the header
+    if version != BUNDLE_VERSION:
+        raise ValueError(f'Bundle version {version} is not supported.')
+    if kdf not in KDF_IDS:
+        raise ValueError(f'Bundle KDF {kdf} is not supported.')
+    if flags & FLAG_CHUNKED:
+        if chunk_size == 0 or chunk_size % 16 != 0 or encrypted_bundle_length != chunked_length(payload_length, chunk_size):
+            raise ValueError('encrypted_bundle length does not match the payload length of its header.')
+    elif flags & FLAG_LOG:
+        pass
+    elif encrypted_bundle_length != HEADER_LENGTH + 80 + payload_length:
+        raise ValueError('encrypted_bundle length does not match the payload length of its header.')
+
+    return BundleHeader(version, kdf, iterations, payload_length, flags)
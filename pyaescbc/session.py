@@ -0,0 +1,294 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+from typing import Optional
+
+from .random_salt import random_salt
+from .random_iv import random_iv
+from .derive_key import derive_key
+from .encrypt_AES_CBC import encrypt_AES_CBC
+from .decrypt_AES_CBC import decrypt_AES_CBC
+from .create_hmac import create_hmac
+from .check_hmac import check_hmac
+from .delete_bytearray import delete_bytearray
+from .auth_error import AuthError
+
+class Session:
+    """
+    Encryption session deriving the key once and encrypting many messages with it.
+
+    The derived key is created with :func:`pyaescbc.derive_key` when the session is opened,
+    then each message is encrypted with a fresh IV using :func:`pyaescbc.encrypt_AES_CBC` and authenticated with :func:`pyaescbc.create_hmac`.
+    This avoids one PBKDF2 run per message when many small messages are encrypted with the same password.
+
+    Each encrypted message has the following compact format:
+
+    .. code-block:: console
+
+        message = session_id (8 bytes) + iv (16 bytes) + expected_hmac (32 bytes) + cipherdata
+
+    The ``session_id`` is the first 8 bytes of the SHA-256 of the salt and the number of iterations of the session.
+    It points back to the session parameters, which must be stored once (see :attr:`salt` and :attr:`iterations`)
+    to open the same session again with ``Session(password, iterations, salt=salt)``.
+    The ``session_id`` is also authenticated by the HMAC.
+
+    The keys are deleted from memory when the session is closed with :meth:`close` or at the end of the ``with`` block.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        iterations = aes.generate_random_iterations()
+        with aes.Session(password, iterations) as session:
+            message = session.encrypt(bytearray("Hello, World!", 'utf-8'))
+            cleardata = session.decrypt(message)
+
+    Parameters
+    ----------
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : int
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+
+    salt : Optional[bytearray]
+        The 32-byte salt of an existing session. Default is None, a random salt is generated.
+
+    delete_keys : bool
+        Delete the password from memory once the key is derived. Default is True.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations is not a strictly positive integer or if salt is not 32 bytes long.
+    """
+    def __init__(self, password: bytearray, iterations: int, salt: Optional[bytearray] = None, delete_keys: bool = True) -> None:
+        # Check the types of the parameters
+        if not isinstance(password, bytearray):
+            raise TypeError("Parameter password is not bytearray")
+        if not isinstance(iterations, int):
+            raise TypeError("Parameter iterations is not integer")
+        if (salt is not None) and (not isinstance(salt, bytearray)):
+            raise TypeError("Parameter salt is not bytearray")
+        if not isinstance(delete_keys, bool):
+            raise TypeError("Parameter delete_keys is not a boolean.")
+
+        # Derive the key of the session
+        self._salt = random_salt() if salt is None else salt.copy()
+        self._iterations = iterations
+        self._aes_key = bytearray()
+        self._hmac_key = bytearray()
+        derived_key = bytearray()
+        try:
+            derived_key = derive_key(password, self._salt, iterations)
+            self._aes_key = derived_key[:32]  # AES key is the first 32 bytes of the derived key
+            self._hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+        except Exception as e:
+            delete_bytearray(self._salt)
+            raise e
+        finally:
+            if delete_keys:
+                delete_bytearray(password)
+            delete_bytearray(derived_key)
+        self._session_id = hashlib.sha256(self._salt + iterations.to_bytes(8, 'big')).digest()[:8]
+        self._closed = False
+
+    @property
+    def salt(self) -> bytearray:
+        """ A copy of the 32-byte salt of the session. """
+        self._check_open()
+        return self._salt.copy()
+
+    @property
+    def iterations(self) -> int:
+        """ The number of iterations for PBKDF2 of the session. """
+        return self._iterations
+
+    @property
+    def session_id(self) -> bytes:
+        """ The 8-byte identifier written at the beginning of each message. """
+        return self._session_id
+
+    @property
+    def closed(self) -> bool:
+        """ True if the keys of the session have been deleted. """
+        return self._closed
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("The session is closed.")
+
+    def encrypt(self, cleardata: bytearray, authdata: Optional[bytearray] = None, delete_keys: bool = True) -> bytearray:
+        """
+        Encrypts a message with the keys of the session and a fresh IV.
+
+        Parameters
+        ----------
+        cleardata : bytearray
+            The clear message to encrypt.
+
+        authdata : Optional[bytearray]
+            The authentication data to use in the HMAC. Default is None.
+
+        delete_keys : bool
+            Delete the cleardata and the authdata from memory at the end of the method. Default is True.
+
+        Returns
+        -------
+        message : bytearray
+            The encrypted message ``session_id + iv + expected_hmac + cipherdata``.
+
+        Raises
+        ------
+        TypeError
+            If an argument is of the wrong type.
+        ValueError
+            If the session is closed.
+        """
+        # Check the types of the parameters
+        if not isinstance(cleardata, bytearray):
+            raise TypeError("Parameter cleardata is not bytearray")
+        if (authdata is not None) and (not isinstance(authdata, bytearray)):
+            raise TypeError("Parameter authdata is not bytearray")
+        if not isinstance(delete_keys, bool):
+            raise TypeError("Parameter delete_keys is not a boolean.")
+        self._check_open()
+
+        # Encryption
+        iv = bytearray()
+        cipherdata = bytearray()
+        session_authdata = bytearray()
+        expected_hmac = bytearray()
+        try:
+            iv = random_iv()
+            cipherdata = encrypt_AES_CBC(cleardata, self._aes_key, iv)
+            session_authdata = bytearray(self._session_id) + (authdata if authdata is not None else bytearray())
+            expected_hmac = create_hmac(self._hmac_key, iv, cipherdata, authdata=session_authdata)
+            message = bytearray(self._session_id) + iv + expected_hmac + cipherdata
+        except Exception as e:
+            raise e
+        finally:
+            # Deleting from memory all critical data for security
+            if delete_keys:
+                delete_bytearray(cleardata)
+                if authdata is not None:
+                    delete_bytearray(authdata)
+            delete_bytearray(iv)
+            delete_bytearray(cipherdata)
+            delete_bytearray(session_authdata)
+            delete_bytearray(expected_hmac)
+
+        return message
+
+    def decrypt(self, message: bytearray, authdata: Optional[bytearray] = None, delete_keys: bool = True) -> bytearray:
+        """
+        Decrypts a message encrypted by a session with the same password, salt and iterations.
+
+        Parameters
+        ----------
+        message : bytearray
+            The encrypted message ``session_id + iv + expected_hmac + cipherdata``. Must contain at least 72 bytes.
+
+        authdata : Optional[bytearray]
+            The authentication data to use in the HMAC. Default is None.
+
+        delete_keys : bool
+            Delete the message and the authdata from memory at the end of the method. Default is True.
+
+        Returns
+        -------
+        cleardata : bytearray
+            The decrypted message.
+
+        Raises
+        ------
+        TypeError
+            If an argument is of the wrong type.
+        ValueError
+            If the session is closed or if the message does not contain at least 72 bytes.
+        AuthError
+            If the message does not belong to the session or if the HMAC is not valid.
+        """
+        # Check the types of the parameters
+        if not isinstance(message, bytearray):
+            raise TypeError("Parameter message is not bytearray")
+        if (authdata is not None) and (not isinstance(authdata, bytearray)):
+            raise TypeError("Parameter authdata is not bytearray")
+        if not isinstance(delete_keys, bool):
+            raise TypeError("Parameter delete_keys is not a boolean.")
+        self._check_open()
+
+        # Check the values of the parameters
+        if len(message) < 72:
+            raise ValueError('message does not contain at least 72 bytes.')
+
+        # Decryption
+        iv = bytearray()
+        expected_hmac = bytearray()
+        cipherdata = bytearray()
+        session_authdata = bytearray()
+        given_hmac = bytearray()
+        try:
+            if bytes(message[0:8]) != self._session_id:
+                raise AuthError('The message does not belong to this session.')
+            iv = message[8:24]
+            expected_hmac = message[24:56]
+            cipherdata = message[56:]
+            session_authdata = bytearray(self._session_id) + (authdata if authdata is not None else bytearray())
+            given_hmac = create_hmac(self._hmac_key, iv, cipherdata, authdata=session_authdata)
+            if not check_hmac(given_hmac, expected_hmac):
+                raise AuthError('The HMAC is not valid. The data has been tampered with or the password is incorrect.')
+            cleardata = decrypt_AES_CBC(cipherdata, self._aes_key, iv)
+        except Exception as e:
+            raise e
+        finally:
+            # Deleting from memory all critical data for security
+            if delete_keys:
+                delete_bytearray(message)
+                if authdata is not None:
+                    delete_bytearray(authdata)
+            delete_bytearray(iv)
+            delete_bytearray(expected_hmac)
+            delete_bytearray(cipherdata)
+            delete_bytearray(session_authdata)
+            delete_bytearray(given_hmac)
+
+        return cleardata
+
+    def close(self) -> None:
+        """
+        Deletes the keys of the session from memory. The session can not be used afterwards.
+        """
+        if self._closed:
+            return
+        delete_bytearray(self._aes_key)
+        delete_bytearray(self._hmac_key)
+        delete_bytearray(self._salt)
+        self._closed = True
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,155 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Optional
+
+from ._kdf import derive_password_key
+from .create_hmac import create_hmac
+from .check_hmac import check_hmac
+from .extract_cryptography_views import extract_cryptography_views
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .bundle_header import KDF_PBKDF2_SHA256, PASSWORD_KDF_IDS
+
+def verify_bundle(
+    encrypted_bundle: Any,
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None
+) -> bool:
+    """
+    verify_bundle checks the HMAC of an encrypted bundle without decrypting it.
+
+    The HMAC is computed with :func:`pyaescbc.create_hmac` on views of the bundle and compared with :func:`pyaescbc.check_hmac`:
+    AES is not run and no clear data is allocated. The bundle itself is never modified nor deleted,
+    so it can be a read-only buffer such as a map returned by :func:`pyaescbc.open_bundle`.
+    For a versioned bundle (see :class:`pyaescbc.BundleHeader`), the iterations can be omitted: they are read from the header.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        password = bytearray("password", 'utf-8')
+        with aes.open_bundle("dump.sql.aes") as encrypted_bundle:
+            valid = aes.verify_bundle(encrypted_bundle, password, iterations)
+
+    .. seealso::
+
+        - function :func:`pyaescbc.audit_bundles` to verify many bundles in parallel.
+
+    Parameters
+    ----------
+    encrypted_bundle : buffer
+        The encrypted bundle (bytearray, bytes, memoryview, mmap or any object supporting the buffer protocol). Must contain at least 80 bytes.
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None for a versioned bundle, the iterations of the header are then used. Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    Returns
+    -------
+    bool
+        True if the HMAC is valid, False otherwise.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations is not a strictly positive integer, or if the bundle does not contain at least 80 bytes.
+        If `iterations` is None for a legacy bundle or does not match the header, or if the header is not a password-based one.
+    """
+    # Check the types of the parameters
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if (iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+
+    # Check the values of the parameters
+    if len(password) == 0:
+        raise ValueError('Parameter password must not be empty.')
+    if (iterations is not None) and (iterations <= 0):
+        raise ValueError('Parameter iterations must be a positive integer.')
+
+    # Verification (the components are memoryviews on the bundle, they are not copied)
+    views = ()
+    salt = bytearray()
+    header = bytearray()
+    derived_key = bytearray()
+    hmac_key = bytearray()
+    given_hmac = bytearray()
+    try:
+        *views, bundle_header = extract_cryptography_views(encrypted_bundle, return_header=True)
+        iv, salt_view, expected_hmac, cipherdata = views
+        kdf = KDF_PBKDF2_SHA256
+        if bundle_header is not None:
+            if bundle_header.kdf not in PASSWORD_KDF_IDS or bundle_header.flags != 0:
+                raise ValueError('encrypted_bundle is not a password-based bundle.')
+            if iterations is None:
+                iterations = bundle_header.iterations
+            elif iterations != bundle_header.iterations:
+                raise ValueError('Parameter iterations does not match the header of encrypted_bundle.')
+            kdf = bundle_header.kdf
+            header = bundle_header.to_bytearray()  # The header is authenticated with the cipherdata
+        elif iterations is None:
+            raise ValueError('Parameter iterations is required for a bundle without header.')
+        salt = bytearray(salt_view)
+        derived_key = derive_password_key(password, salt, iterations, kdf, key_cache)
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+        given_hmac = create_hmac(hmac_key, iv, cipherdata, authdata=authdata, header=header if bundle_header is not None else None)
+        result = check_hmac(given_hmac, expected_hmac)
+    except Exception as e:
+        raise e
+    finally:
+        # Releasing the views on the bundle
+        for view in views:
+            view.release()
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(salt)
+        delete_bytearray(header)
+        delete_bytearray(derived_key)
+        delete_bytearray(hmac_key)
+        delete_bytearray(given_hmac)
+
+    return result
@@ -0,0 +1,163 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hmac
+import hashlib
+from typing import Optional, BinaryIO
+
+from ._kdf import derive_password_key
+from ._stream import read_stream_preamble
+from .bundle_header import KDF_PBKDF2_SHA256
+from .check_hmac import check_hmac
+from .delete_bytearray import delete_bytearray
+from .key_cache import KeyCache
+from .instrumentation import _StageTimer
+
+def verify_stream(
+    input_stream: BinaryIO,
+    password: bytearray,
+    iterations: Optional[int] = None,
+    authdata: Optional[bytearray] = None,
+    chunk_size: int = 1_048_576,
+    delete_keys: bool = True,
+    key_cache: Optional[KeyCache] = None
+) -> bool:
+    """
+    verify_stream checks the HMAC of an encrypted bundle stream without decrypting it.
+
+    This is the first pass of :func:`pyaescbc.decrypt_stream`: the cipherdata is read chunk by chunk and fed to the HMAC,
+    and nothing is decrypted. The input stream does not need to be seekable.
+    For a versioned bundle (see :class:`pyaescbc.BundleHeader`), the iterations can be omitted: they are read from the header of the bundle,
+    the key is derived with the KDF of the header, and the header is authenticated with the cipherdata.
+    Only one buffer of ``chunk_size`` bytes is held in memory.
+
+    .. note::
+
+        The password and the authdata are deleted from memory at the end of the function if delete_keys is True.
+        Otherwise, they need to be deleted after dealing with Exception.
+
+    Parameters
+    ----------
+    input_stream : BinaryIO
+        The readable binary stream containing the encrypted bundle (must implement ``readinto``).
+
+    password : bytearray
+        The user password. It must not be empty.
+
+    iterations : Optional[int]
+        The number of iterations for PBKDF2. It must be a strictly positive integer.
+        It can be None for a versioned bundle, the iterations of the header are then used. Default is None.
+
+    authdata : Optional[bytearray]
+        The authentication data to use in the HMAC. Default is None.
+
+    chunk_size : int
+        The number of bytes read from the input stream at each step. Default is 1 MiB.
+
+    delete_keys : bool
+        Delete the password and authdata from memory at the end of the function. Default is True.
+
+    key_cache : Optional[KeyCache]
+        The cache of derived keys to use instead of running PBKDF2 again. Default is None.
+        See :class:`pyaescbc.KeyCache`.
+
+    Returns
+    -------
+    bool
+        True if the HMAC is valid, False otherwise.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If password is empty, if iterations or chunk_size is not a strictly positive integer, or if the stream does not contain at least 80 bytes.
+        If `iterations` is None for a legacy bundle or does not match the header, or if the header is not a password-based one.
+    """
+    # Check the types of the parameters
+    if not hasattr(input_stream, 'readinto'):
+        raise TypeError("Parameter input_stream is not a readable binary stream.")
+    if not isinstance(password, bytearray):
+        raise TypeError("Parameter password is not bytearray")
+    if (iterations is not None) and (not isinstance(iterations, int)):
+        raise TypeError("Parameter iterations is not integer")
+    if (authdata is not None) and (not isinstance(authdata, bytearray)):
+        raise TypeError("Parameter authdata is not bytearray")
+    if not isinstance(chunk_size, int):
+        raise TypeError("Parameter chunk_size is not integer")
+    if not isinstance(delete_keys, bool):
+        raise TypeError("Parameter delete_keys is not a boolean.")
+    if (key_cache is not None) and (not isinstance(key_cache, KeyCache)):
+        raise TypeError("Parameter key_cache is not KeyCache instance.")
+
+    # Check the values of the parameters
+    if chunk_size <= 0:
+        raise ValueError('Parameter chunk_size must be a positive integer.')
+
+    # Verification
+    header = bytearray()
+    iv = bytearray()
+    salt = bytearray()
+    expected_hmac = bytearray()
+    derived_key = bytearray()
+    hmac_key = bytearray()
+    given_hmac = bytearray()
+    buffer = bytearray(chunk_size)
+    timer = _StageTimer()
+    try:
+        bundle_header, iterations, iv, salt, expected_hmac = read_stream_preamble(input_stream, iterations)
+        kdf = KDF_PBKDF2_SHA256 if bundle_header is None else bundle_header.kdf
+        derived_key = derive_password_key(password, salt, iterations, kdf, key_cache)
+        hmac_key = derived_key[32:]  # HMAC key is the last 32 bytes of the derived key
+
+        mac = hmac.new(hmac_key, digestmod=hashlib.sha256)
+        if bundle_header is not None:
+            header = bundle_header.to_bytearray()  # The header is authenticated with the cipherdata
+            mac.update(header)
+        mac.update(iv)
+        cipherdata_length = 0
+        timer.start()
+        with memoryview(buffer) as view:
+            while True:
+                size = input_stream.readinto(buffer)
+                timer.lap("stream_io", size or 0)
+                if not size:
+                    break
+                mac.update(view[:size])
+                timer.lap("stream_HMAC", size)
+                cipherdata_length += size
+        if authdata is not None:
+            mac.update(authdata)
+        given_hmac = bytearray(mac.digest())
+        # A bundle whose length does not match its header is not valid
+        result = check_hmac(given_hmac, expected_hmac) and (bundle_header is None or cipherdata_length == bundle_header.payload_length)
+    except Exception as e:
+        raise e
+    finally:
+        timer.record()
+        # Deleting from memory all critical data for security (in the order of their creation to avoid memory leaks)
+        if delete_keys:
+            delete_bytearray(password)
+            if authdata is not None:
+                delete_bytearray(authdata)
+        delete_bytearray(header)
+        delete_bytearray(iv)
+        delete_bytearray(salt)
+        delete_bytearray(expected_hmac)
+        delete_bytearray(derived_key)
+        delete_bytearray(hmac_key)
+        delete_bytearray(given_hmac)
+        delete_bytearray(buffer)
+
+    return result
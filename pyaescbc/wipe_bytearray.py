@@ -0,0 +1,94 @@
+# Copyright 2025 Artezaru
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+def wipe_bytearray(barray: bytearray, method: str = "random", passes: int = 1, chunk_size: int = 1_048_576) -> None:
+    r"""
+    Overwrites the contents of a bytearray in place, without changing its length.
+
+    The bytearray is overwritten in bulk, ``chunk_size`` bytes at a time, using memoryview slice assignment.
+    The available methods are:
+
+    - ``"random"``: the bytearray is overwritten ``passes`` times with random data from ``os.urandom``.
+    - ``"zero"``: the bytearray is overwritten ``passes`` times with zeros.
+    - ``"multipass"``: the bytearray is overwritten ``passes`` times with random data, then once with zeros.
+
+    .. code-block:: python
+
+        import pyaescbc as aes
+
+        barray = aes.random_bytearray(32)
+        aes.wipe_bytearray(barray, method="multipass", passes=3)
+
+    .. seealso::
+
+        - function :func:`pyaescbc.delete_bytearray` to overwrite and clear the bytearray.
+
+    Parameters
+    ----------
+    barray : bytearray
+        The bytearray to overwrite.
+
+    method : str
+        The overwriting method, one of ``"random"``, ``"zero"`` or ``"multipass"``. Default is ``"random"``.
+
+    passes : int
+        The number of overwriting passes. It must be a strictly positive integer. Default is 1.
+
+    chunk_size : int
+        The number of bytes overwritten at each step. It must be a strictly positive integer. Default is 1 MiB.
+
+    Raises
+    ------
+    TypeError
+        If an argument is of the wrong type.
+    ValueError
+        If `method` is unknown or if `passes` or `chunk_size` is not a strictly positive integer.
+    """
+    # Check the types of the parameters
+    if not isinstance(barray, bytearray):
+        raise TypeError('Parameter barray is not bytearray instance.')
+    if not isinstance(method, str):
+        raise TypeError('Parameter method is not str instance.')
+    if not isinstance(passes, int):
+        raise TypeError('Parameter passes is not int instance.')
+    if not isinstance(chunk_size, int):
+        raise TypeError('Parameter chunk_size is not int instance.')
+
+    # Check the values of the parameters
+    if method not in ("random", "zero", "multipass"):
+        raise ValueError(f'Parameter method must be "random", "zero" or "multipass", got {method!r}.')
+    if passes <= 0:
+        raise ValueError('Parameter passes must be a positive integer.')
+    if chunk_size <= 0:
+        raise ValueError('Parameter chunk_size must be a positive integer.')
+
+    # Overwrite the bytearray chunk by chunk
+    size = len(barray)
+    if size == 0:
+        return
+    chunk_size = min(chunk_size, size)
+    with memoryview(barray) as view:
+        if method in ("random", "multipass"):
+            for _ in range(passes):
+                for start in range(0, size, chunk_size):
+                    stop = min(start + chunk_size, size)
+                    view[start:stop] = os.urandom(stop - start)
+        if method in ("zero", "multipass"):
+            zeros = bytes(chunk_size)
+            for _ in range(passes if method == "zero" else 1):
+                for start in range(0, size, chunk_size):
+                    stop = min(start + chunk_size, size)
+                    view[start:stop] = zeros[:stop - start]
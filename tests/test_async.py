@@ -0,0 +1,78 @@
+import asyncio
+import importlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pyaescbc
+import pytest
+
+def test_async_encrypt_decrypt():
+    """ Test that the event loop keeps running while the keys are derived. """
+    async def main():
+        ticks = 0
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+        task = asyncio.create_task(ticker())
+        encrypted_bundle = await pyaescbc.async_encrypt(bytearray(b"Hello, World!"), bytearray(b"password"), 200_000)
+        cleardata = await pyaescbc.async_decrypt(encrypted_bundle, bytearray(b"password"), 200_000)
+        versioned_bundle = pyaescbc.encrypt(bytearray(b"Hello, World!"), bytearray(b"password"), 1000, versioned=True)
+        assert await pyaescbc.async_decrypt(versioned_bundle, bytearray(b"password")) == cleardata
+        task.cancel()
+        return cleardata, ticks
+    cleardata, ticks = asyncio.run(main())
+    assert cleardata == bytearray(b"Hello, World!")
+    assert ticks > 1
+
+def test_async_cancel_before_start():
+    """ Test that a queued call is dropped and its inputs deleted on cancellation. """
+    release = threading.Event()
+    async def main():
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(release.wait)  # Keep the only worker busy
+            password = bytearray(b"password")
+            task = asyncio.create_task(pyaescbc.async_encrypt(bytearray(b"data"), password, 1000, executor=executor))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.set()
+            return password
+    assert len(asyncio.run(main())) == 0
+
+def test_async_process_pool_rejected():
+    """ Test that a process pool is rejected, the job and the deletion of the inputs need the memory of the caller. """
+    async def main():
+        with ProcessPoolExecutor(1) as executor:
+            with pytest.raises(TypeError):
+                await pyaescbc.async_encrypt(bytearray(b"data"), bytearray(b"password"), 1000, executor=executor)
+            with pytest.raises(TypeError):
+                await pyaescbc.async_decrypt(bytearray(96), bytearray(b"password"), 1000, executor=executor)
+    asyncio.run(main())
+
+def test_async_cancel_while_running(monkeypatch):
+    """ Test that the result of a call cancelled while running is deleted instead of being left in memory. """
+    started, release = threading.Event(), threading.Event()
+    results = []
+    module = importlib.import_module("pyaescbc.async_decrypt")
+    decrypt = module.encrypted_bundle_to_cleardata
+    def slow_decrypt(*args, **kwargs):
+        started.set()
+        release.wait()
+        results.append(decrypt(*args, **kwargs))
+        return results[-1]
+    monkeypatch.setattr(module, "encrypted_bundle_to_cleardata", slow_decrypt)
+
+    encrypted_bundle = pyaescbc.encrypt(bytearray(b"secret"), bytearray(b"password"), 1000)
+    async def main():
+        with ThreadPoolExecutor(1) as executor:
+            task = asyncio.create_task(pyaescbc.async_decrypt(encrypted_bundle, bytearray(b"password"), 1000, executor=executor))
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.set()
+    asyncio.run(main())
+    assert results == [bytearray()]
@@ -0,0 +1,110 @@
+import concurrent.futures
+import pyaescbc
+import pytest
+
+def test_versioned_bundle_round_trip():
+    """ Test that a versioned bundle is decrypted with the iterations read from its header. """
+    cleardata = bytearray("Hello, World!", 'utf-8')
+    encrypted_bundle = pyaescbc.encrypt(cleardata.copy(), bytearray(b"password"), 1000, versioned=True)
+    assert len(encrypted_bundle) == 24 + 80 + 16
+    header = pyaescbc.read_bundle_header(encrypted_bundle)
+    assert header == pyaescbc.BundleHeader(1, pyaescbc.KDF_PBKDF2_SHA256, 1000, 16, 0)
+    iv, salt, expected_hmac, cipherdata, read_header = pyaescbc.extract_cryptography_components(encrypted_bundle, return_header=True)
+    assert read_header == header
+    assert len(cipherdata) == 16
+    assert pyaescbc.decrypt(encrypted_bundle.copy(), bytearray(b"password")) == cleardata
+    assert pyaescbc.decrypt(encrypted_bundle.copy(), bytearray(b"password"), 1000) == cleardata
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt(encrypted_bundle.copy(), bytearray(b"password"), 2000)
+
+def test_versioned_bundle_header_is_authenticated():
+    """ Test that the header can not be modified without the decryption failing. """
+    encrypted_bundle = pyaescbc.encrypt(bytearray(b"data"), bytearray(b"password"), 1000, versioned=True)
+    tampered = encrypted_bundle.copy()
+    tampered[10] ^= 0x01  # Flags
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt(tampered, bytearray(b"password"))
+    # Removing the header gives a legacy bundle whose HMAC does not match
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt(encrypted_bundle[24:], bytearray(b"password"), 1000)
+    with pytest.raises(ValueError):
+        pyaescbc.read_bundle_header(encrypted_bundle[:-16])  # Truncated
+
+def test_legacy_bundle_still_accepted():
+    """ Test that legacy bundles are detected and still need the iterations. """
+    encrypted_bundle = pyaescbc.encrypt(bytearray(b"data"), bytearray(b"password"), 1000)
+    assert pyaescbc.read_bundle_header(encrypted_bundle) is None
+    assert pyaescbc.extract_cryptography_components(encrypted_bundle, return_header=True)[4] is None
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt(encrypted_bundle.copy(), bytearray(b"password"))
+    assert pyaescbc.decrypt(encrypted_bundle, bytearray(b"password"), 1000) == bytearray(b"data")
+
+def test_versioned_raw_key_routing():
+    """ Test that the KDF of the header routes the bundle to the right function. """
+    master_key = pyaescbc.random_bytearray(32)
+    encrypted_bundle = pyaescbc.cleardata_to_encrypted_bundle_with_key(bytearray(b"data"), master_key.copy(), versioned=True)
+    assert pyaescbc.read_bundle_header(encrypted_bundle).kdf == pyaescbc.KDF_HKDF_SHA256
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt(encrypted_bundle.copy(), master_key.copy())
+    assert pyaescbc.encrypted_bundle_to_cleardata_with_key(encrypted_bundle, master_key) == bytearray(b"data")
+
+def test_create_encrypted_bundle_with_header():
+    """ Test that create_encrypted_bundle and the views handle the header. """
+    hmac_key, iv, salt = pyaescbc.random_bytearray(32), pyaescbc.random_iv(), pyaescbc.random_salt()
+    cipherdata = pyaescbc.random_bytearray(32)
+    header = pyaescbc.BundleHeader(1, pyaescbc.KDF_PBKDF2_SHA256, 1000, len(cipherdata))
+    expected_hmac = pyaescbc.create_hmac(hmac_key, iv, cipherdata, header=header.to_bytearray())
+    encrypted_bundle = pyaescbc.create_encrypted_bundle(iv, salt, expected_hmac, cipherdata, header=header)
+    views = pyaescbc.extract_cryptography_views(encrypted_bundle)
+    assert [bytes(view) for view in views] == [bytes(iv), bytes(salt), bytes(expected_hmac), bytes(cipherdata)]
+    for view in views:
+        view.release()
+    with pytest.raises(ValueError):
+        pyaescbc.create_encrypted_bundle(iv, salt, expected_hmac, cipherdata[:16], header=header)
+
+def test_kdf_v2_round_trip():
+    """ Test that a KDF v2 bundle records its KDF and is decrypted with the derivation of its header. """
+    cleardata = bytearray("Hello, World!", 'utf-8')
+    encrypted_bundle = pyaescbc.encrypt(cleardata.copy(), bytearray(b"password"), 1000, versioned=True, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256)
+    assert pyaescbc.read_bundle_header(encrypted_bundle).kdf == pyaescbc.KDF_PBKDF2_HKDF_SHA256
+    assert pyaescbc.verify_bundle(encrypted_bundle, bytearray(b"password"))
+    assert pyaescbc.decrypt(encrypted_bundle.copy(), bytearray(b"password")) == cleardata
+    # Rewriting the KDF of the header to the v1 profile breaks the HMAC
+    tampered = encrypted_bundle.copy()
+    tampered[9] = pyaescbc.KDF_PBKDF2_SHA256
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt(tampered, bytearray(b"password"))
+    # A legacy bundle has no header to record the KDF
+    with pytest.raises(ValueError):
+        pyaescbc.encrypt(cleardata.copy(), bytearray(b"password"), 1000, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256)
+    with pytest.raises(ValueError):
+        pyaescbc.encrypt(cleardata.copy(), bytearray(b"password"), 1000, versioned=True, kdf=pyaescbc.KDF_HKDF_SHA256)
+
+def test_derive_key_v2():
+    """ Test that derive_key_v2 expands one PBKDF2 block with HKDF and differs from derive_key. """
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDFExpand
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    password, salt = bytearray(b"password"), pyaescbc.random_salt()
+    derived_key = pyaescbc.derive_key_v2(password, salt, 1000)
+    assert len(derived_key) == 64
+    assert derived_key != pyaescbc.derive_key(password, salt, 1000)
+    pseudorandom_key = PBKDF2HMAC(hashes.SHA256(), 32, bytes(salt), 1000).derive(bytes(password))
+    assert derived_key == HKDFExpand(hashes.SHA256(), 64, b"pyaescbc v2 PBKDF2-SHA256 AES-256-CBC HMAC-SHA256").derive(pseudorandom_key)
+    with pytest.raises(ValueError):
+        pyaescbc.derive_key_v2(password, salt, 0)
+
+def test_key_cache_separates_kdf():
+    """ Test that the derived keys of both KDF profiles do not collide in a KeyCache. """
+    key_cache = pyaescbc.KeyCache()
+    password, salt = bytearray(b"password"), pyaescbc.random_salt()
+    assert key_cache.derive_key(password, salt, 1000) == pyaescbc.derive_key(password, salt, 1000)
+    assert key_cache.get(password, salt, 1000, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256) is None
+    assert key_cache.derive_key(password, salt, 1000, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256) == pyaescbc.derive_key_v2(password, salt, 1000)
+    encrypted_bundles = [
+        pyaescbc.encrypt(bytearray(b"v1"), bytearray(b"password"), 1000, versioned=True),
+        pyaescbc.encrypt(bytearray(b"v2"), bytearray(b"password"), 1000, versioned=True, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256),
+    ]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(pyaescbc.decrypt_many(encrypted_bundles, bytearray(b"password"), 1000, executor=executor))
+    assert results == [bytearray(b"v1"), bytearray(b"v2")]
@@ -0,0 +1,37 @@
+import importlib
+import time
+import pyaescbc
+import pytest
+
+calibrate_module = importlib.import_module("pyaescbc.calibrate_iterations")
+
+def test_calibrate_iterations_latency():
+    """ Test that the calibrated range gives a derivation time close to the target. """
+    Nmin, Nmax = pyaescbc.calibrate_iterations(target_latency=0.05, tolerance=0.1, refresh=True)
+    assert 0 < Nmin < Nmax
+    start = time.perf_counter()
+    pyaescbc.derive_key(bytearray(b"password"), pyaescbc.random_salt(), (Nmin + Nmax) // 2)
+    elapsed = time.perf_counter() - start
+    # Loose bounds, the host may be busy
+    assert 0.01 < elapsed < 0.5
+
+def test_calibrate_iterations_cached(monkeypatch):
+    """ Test the mapping from the cached throughput to the range of iterations. """
+    monkeypatch.setattr(calibrate_module, "_throughput", 1_000_000.0)
+    assert pyaescbc.calibrate_iterations(0.25, 0.1) == (225_000, 275_000)
+    assert pyaescbc.calibrate_iterations(1.0, 0.5) == (500_000, 1_500_000)
+
+def test_generators_target_latency(monkeypatch):
+    """ Test that the generators use the calibrated range in place of the defaults. """
+    monkeypatch.setattr(calibrate_module, "_throughput", 1_000_000.0)
+    for _ in range(20):
+        assert 225_000 <= pyaescbc.generate_random_iterations(target_latency=0.25) <= 275_000
+    iterations = pyaescbc.generate_pin_iterations(bytearray(b"1234"), target_latency=0.25)
+    assert 225_000 <= iterations <= 275_000
+    assert iterations == pyaescbc.generate_pin_iterations(bytearray(b"1234"), target_latency=0.25)
+    with pytest.raises(ValueError):
+        pyaescbc.generate_random_iterations(Nmin=10, target_latency=0.25)
+    with pytest.raises(ValueError):
+        pyaescbc.calibrate_iterations(tolerance=1.0)
+    with pytest.raises(TypeError):
+        pyaescbc.calibrate_iterations(target_latency="0.25")
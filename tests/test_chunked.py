@@ -0,0 +1,109 @@
+import io
+import random
+import pyaescbc
+import pytest
+
+def _chunked_bundle(cleardata, chunk_size=4096, authdata=None):
+    output_stream = io.BytesIO()
+    pyaescbc.encrypt_chunked_stream(io.BytesIO(cleardata), output_stream, bytearray("password", 'utf-8'), 1000, authdata=authdata, chunk_size=chunk_size)
+    return bytearray(output_stream.getvalue())
+
+@pytest.mark.parametrize("length", [0, 15, 4096, 4097, 3 * 4096, 100_000])
+def test_chunked_round_trip(length):
+    """ Test the encryption and decryption of a chunked bundle, the chunk boundaries included. """
+    cleardata = bytes(random.getrandbits(8) for _ in range(length))
+    bundle = _chunked_bundle(cleardata)
+    header = pyaescbc.read_bundle_header(bundle)
+    assert header.flags == pyaescbc.FLAG_CHUNKED
+    assert header.payload_length == length
+
+    output_stream = io.BytesIO()
+    size = pyaescbc.decrypt_chunked_stream(io.BytesIO(bytes(bundle)), output_stream, bytearray("password", 'utf-8'))
+    assert size == length
+    assert output_stream.getvalue() == cleardata
+
+def test_decrypt_range():
+    """ Test the decryption of random ranges with a single key derivation. """
+    cleardata = bytes(random.getrandbits(8) for _ in range(50_000))
+    bundle = io.BytesIO(bytes(_chunked_bundle(cleardata, chunk_size=1024)))
+    password = bytearray("password", 'utf-8')
+    with pyaescbc.KeyCache() as key_cache:
+        for _ in range(50):
+            offset = random.randrange(0, len(cleardata))
+            length = random.randrange(0, len(cleardata) - offset + 1)
+            bundle.seek(0)
+            assert pyaescbc.decrypt_range(bundle, password, offset, length, delete_keys=False, key_cache=key_cache) == cleardata[offset:offset + length]
+    bundle.seek(0)
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt_range(bundle, password, 49_000, 2_000)
+
+def test_chunked_authdata_and_password():
+    """ Test that the header MAC covers the password and the authdata. """
+    bundle = _chunked_bundle(b"x" * 10_000, authdata=bytearray("user=toto", 'utf-8'))
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_range(io.BytesIO(bytes(bundle)), bytearray("wrong", 'utf-8'), 0, 10)
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_range(io.BytesIO(bytes(bundle)), bytearray("password", 'utf-8'), 0, 10)
+    assert pyaescbc.decrypt_range(io.BytesIO(bytes(bundle)), bytearray("password", 'utf-8'), 0, 10, authdata=bytearray("user=toto", 'utf-8')) == b"x" * 10
+
+def test_chunked_tampering():
+    """ Test that a modified, reordered or truncated chunk is detected. """
+    cleardata = bytes(range(256)) * 64  # 4 chunks of 4096 bytes
+    bundle = _chunked_bundle(cleardata)
+    record = 48 + 4096 + 16
+
+    tampered = bundle.copy()
+    tampered[92 + record + 100] ^= 1  # Cipherdata of the chunk 1
+    assert pyaescbc.decrypt_range(io.BytesIO(bytes(tampered)), bytearray("password", 'utf-8'), 0, 4096) == cleardata[:4096]  # The chunk 0 is not read
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_range(io.BytesIO(bytes(tampered)), bytearray("password", 'utf-8'), 4096, 10)
+
+    swapped = bundle[:92] + bundle[92 + record:92 + 2 * record] + bundle[92:92 + record] + bundle[92 + 2 * record:]
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_range(io.BytesIO(bytes(swapped)), bytearray("password", 'utf-8'), 0, 10)
+
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt_chunked_stream(io.BytesIO(bytes(bundle[:-record])), io.BytesIO(), bytearray("password", 'utf-8'))
+
+def test_chunked_bundle_rejected_by_bundle_api():
+    """ Test that a chunked bundle is routed away from the single-bundle functions. """
+    bundle = _chunked_bundle(b"x" * 1000)
+    with pytest.raises(ValueError, match="chunked"):
+        pyaescbc.decrypt(bundle, bytearray("password", 'utf-8'))
+
+@pytest.mark.parametrize("length", [0, 4095, 4096, 40_000])
+def test_chunked_parallel_encryption(length):
+    """ Test that the chunks encrypted on a thread pool are written in order in the same format. """
+    cleardata = bytes(range(256)) * (length // 256) + bytes(length % 256)
+    output_stream = io.BytesIO()
+    size = pyaescbc.encrypt_chunked_stream(io.BytesIO(cleardata), output_stream, bytearray("password", 'utf-8'), 1000, chunk_size=1024, max_workers=3)
+    bundle = output_stream.getvalue()
+    assert size == len(bundle) == len(_chunked_bundle(cleardata, chunk_size=1024))
+    output_stream = io.BytesIO()
+    pyaescbc.decrypt_chunked_stream(io.BytesIO(bundle), output_stream, bytearray("password", 'utf-8'))
+    assert output_stream.getvalue() == cleardata
+    if length > 0:
+        assert pyaescbc.decrypt_range(io.BytesIO(bundle), bytearray("password", 'utf-8'), length // 2, length // 4) == cleardata[length // 2:length // 2 + length // 4]
+    with pytest.raises(ValueError):
+        pyaescbc.encrypt_chunked_stream(io.BytesIO(cleardata), io.BytesIO(), bytearray("password", 'utf-8'), 1000, max_workers=0)
+
+class _FailingStream(io.RawIOBase):
+    """ Readable stream failing after the first read. """
+    def __init__(self):
+        self.reads = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        self.reads += 1
+        if self.reads > 1:
+            raise OSError("disk")
+        buffer[:16] = bytes(16)
+        return 16
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_chunked_failing_stream(max_workers):
+    """ Test that the error of the input stream is raised, not hidden by the deletion of the buffers. """
+    with pytest.raises(OSError, match="disk"):
+        pyaescbc.encrypt_chunked_stream(_FailingStream(), io.BytesIO(), bytearray("password", 'utf-8'), 1000, chunk_size=1024, max_workers=max_workers)
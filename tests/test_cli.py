@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+import pyaescbc
+import pytest
+from pyaescbc.__main__ import main
+
+def test_cli_encrypt_decrypt_files(tmp_path, monkeypatch, capsys):
+    """ Test the encryption and decryption of several files in parallel with the password in an environment variable. """
+    monkeypatch.setenv("PYAESCBC_PASSWORD", "password")
+    sources = []
+    for index in range(3):
+        source = tmp_path / f"file{index}.bin"
+        source.write_bytes(os.urandom(100_000 * index + 7))
+        sources.append(source)
+    assert main(["encrypt", "-n", "1000", "-j", "2", "--timings", "--chunk-size", "4K"] + [str(source) for source in sources]) == 0
+    assert "MB/s" in capsys.readouterr().err
+
+    # The encrypted files are regular bundles
+    encrypted = (tmp_path / "file1.bin.aes").read_bytes()
+    assert pyaescbc.decrypt(bytearray(encrypted), bytearray(b"password"), 1000) == sources[1].read_bytes()
+
+    assert main(["verify", "-n", "1000"] + [str(source) + ".aes" for source in sources]) == 0
+    for source in sources:
+        source.rename(str(source) + ".orig")
+    assert main(["decrypt", "-n", "1000", "-j", "0"] + [str(source) + ".aes" for source in sources]) == 0
+    for source in sources:
+        assert source.read_bytes() == (tmp_path / (source.name + ".orig")).read_bytes()
+
+def test_cli_failures(tmp_path, monkeypatch, capsys):
+    """ Test that a wrong password fails without leaving an output and that outputs are not overwritten. """
+    source = tmp_path / "file.bin"
+    source.write_bytes(b"Hello, World!")
+    monkeypatch.setenv("PASSWORD_A", "password")
+    monkeypatch.setenv("PASSWORD_B", "wrong")
+    assert main(["encrypt", "-n", "1000", "--password-env", "PASSWORD_A", str(source)]) == 0
+    assert main(["encrypt", "-n", "1000", "--password-env", "PASSWORD_A", str(source)]) == 1  # Already exists
+    assert main(["verify", "-n", "1000", "--password-env", "PASSWORD_B", str(source) + ".aes"]) == 1
+    target = tmp_path / "out.bin"
+    assert main(["decrypt", "-n", "1000", "--password-env", "PASSWORD_B", "-o", str(target), str(source) + ".aes"]) == 1
+    assert not target.exists()
+    assert sorted(os.listdir(tmp_path)) == ["file.bin", "file.bin.aes"]  # No temporary file left
+    assert "FAILED" in capsys.readouterr().err
+
+def test_cli_pipeline(tmp_path):
+    """ Test the encryption and decryption through the standard input and output with the password from a file descriptor. """
+    cleardata = os.urandom(300_000)
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"password\npassword\n")
+    os.close(write_fd)
+    command = [sys.executable, "-m", "pyaescbc"]
+    environment = {key: value for key, value in os.environ.items() if key != "PYAESCBC_PASSWORD"}
+    encrypted = subprocess.run(command + ["encrypt", "-n", "1000", "--password-fd", str(read_fd), "-"], input=cleardata, capture_output=True, check=True, pass_fds=(read_fd,), env=environment).stdout
+    decrypted = subprocess.run(command + ["decrypt", "--password-fd", str(read_fd), "-"], input=encrypted, capture_output=True, check=True, pass_fds=(read_fd,), env=environment).stdout
+    os.close(read_fd)
+    assert decrypted == cleardata
+    assert len(encrypted) == 24 + 80 + 16 * (len(cleardata) // 16 + 1)  # Versioned bundle read from a pipe
+
+def test_cli_bench(capsys):
+    """ Test the bench command. """
+    assert main(["bench", "-n", "1000", "--size", "64K"]) == 0
+    assert "encrypt_AES_CBC" in capsys.readouterr().out
+
+def test_cli_timings(tmp_path, monkeypatch, capsys):
+    """ Test that --timings prints one line per stage, measured by the instrumentation of the stream functions. """
+    monkeypatch.setenv("PYAESCBC_PASSWORD", "password")
+    source = tmp_path / "file.bin"
+    source.write_bytes(os.urandom(200_000))
+    assert main(["encrypt", "-n", "1000", "--timings", "--chunk-size", "16K", str(source)]) == 0
+    assert main(["decrypt", "--timings", "-o", str(tmp_path / "out.bin"), str(source) + ".aes"]) == 0
+    lines = capsys.readouterr().err.splitlines()
+    assert len(lines) == 10
+    for index, stage in enumerate(["kdf", "aes", "hmac", "io", "total"] * 2):
+        assert lines[index].split()[1] == stage
+        assert float(lines[index].split()[2]) > 0
+
+def test_cli_versioned_without_iterations(tmp_path, monkeypatch):
+    """ Test that the outputs of encrypt and encrypt-tree are decrypted and verified without -n, unlike the --legacy ones. """
+    monkeypatch.setenv("PYAESCBC_PASSWORD", "password")
+    cleardata = os.urandom(50_000)
+    (tmp_path / "tree").mkdir()
+    source = tmp_path / "tree" / "file.bin"
+    source.write_bytes(cleardata)
+    assert main(["encrypt", "-n", "1000", str(source)]) == 0
+    assert pyaescbc.read_bundle_header(bytearray((tmp_path / "tree" / "file.bin.aes").read_bytes())).iterations == 1000
+    assert main(["verify", str(source) + ".aes"]) == 0
+    target = tmp_path / "file.bin"
+    assert main(["decrypt", "-o", str(target), str(source) + ".aes"]) == 0
+    assert target.read_bytes() == cleardata
+
+    assert main(["encrypt-tree", "-n", "1000", str(tmp_path / "tree"), str(tmp_path / "encrypted")]) == 0
+    assert main(["decrypt-tree", str(tmp_path / "encrypted"), str(tmp_path / "out")]) == 0
+    assert (tmp_path / "out" / "file.bin").read_bytes() == cleardata
+
+    # Legacy bundles still need the iterations
+    assert main(["encrypt", "-n", "1000", "--legacy", "-o", str(tmp_path / "legacy.aes"), str(source)]) == 0
+    assert pyaescbc.read_bundle_header(bytearray((tmp_path / "legacy.aes").read_bytes())) is None
+    assert main(["verify", str(tmp_path / "legacy.aes")]) == 1
+    assert main(["verify", "-n", "1000", str(tmp_path / "legacy.aes")]) == 0
@@ -0,0 +1,19 @@
+import pyaescbc
+import pytest
+
+@pytest.mark.parametrize("method", ["random", "zero", "multipass"])
+def test_delete_bytearray(method):
+    """ Test that the bytearray is cleared for every method. """
+    barray = pyaescbc.random_bytearray(3_000_000)
+    pyaescbc.delete_bytearray(barray, method=method, passes=2)
+    assert len(barray) == 0
+
+def test_wipe_bytearray_zero():
+    """ Test that the zero method overwrites every byte, including a partial last chunk. """
+    barray = bytearray(b"\xff" * 1000)
+    pyaescbc.wipe_bytearray(barray, method="zero", chunk_size=300)
+    assert barray == bytearray(1000)
+
+def test_wipe_bytearray_unknown_method():
+    with pytest.raises(ValueError):
+        pyaescbc.wipe_bytearray(bytearray(16), method="shred")
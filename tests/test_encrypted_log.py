@@ -0,0 +1,80 @@
+import os
+import pyaescbc
+import pytest
+
+def test_encrypted_log_append_and_replay(tmp_path):
+    """ Test that the records of a log are replayed in order after reopening it with the password only. """
+    path = tmp_path / "audit.log.aes"
+    password = bytearray("password", 'utf-8')
+    with pyaescbc.EncryptedLog(path, password, 1000, authdata=bytearray(b"audit")) as log:
+        assert [log.append(bytearray(f"record {index}", 'utf-8')) for index in range(5)] == list(range(5))
+        log.sync()
+    assert log.closed
+    assert len(password) == 0 # The password is deleted.
+    assert pyaescbc.read_bundle_header(path.read_bytes()).flags == pyaescbc.FLAG_LOG
+
+    with pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8'), authdata=bytearray(b"audit")) as log:
+        assert len(log) == 5 and log.iterations == 1000
+        size = log.size
+        log.append(bytearray(b"record 5"))
+        assert log.size == size + 52 + 16 # Only the new record is written
+        assert list(log.replay()) == [bytearray(f"record {index}", 'utf-8') for index in range(6)]
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8'))
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt(bytearray(path.read_bytes()), bytearray("password", 'utf-8'))
+
+def test_encrypted_log_tampering(tmp_path):
+    """ Test that a modified record is detected by the replay. """
+    path = tmp_path / "audit.log.aes"
+    with pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8'), 1000) as log:
+        for index in range(3):
+            log.append(bytearray(b"x" * 40))
+    content = bytearray(path.read_bytes())
+    content[88 + 52 + 10] ^= 1 # Cipherdata of the record 0
+    path.write_bytes(content)
+    with pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8')) as log:
+        with pytest.raises(pyaescbc.AuthError):
+            list(log.replay())
+
+@pytest.mark.parametrize("torn", [1, 30, 52 + 16 - 1])
+def test_encrypted_log_recovery(tmp_path, torn):
+    """ Test that an incomplete last record left by a crash is cut when the log is opened again. """
+    path = tmp_path / "audit.log.aes"
+    with pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8'), 1000) as log:
+        for index in range(3):
+            log.append(bytearray(f"record {index}", 'utf-8'))
+        size = log.size
+        log.append(bytearray(b"torn record"))
+    os.truncate(path, size + torn) # A partial write of the last record
+    with pytest.raises(ValueError):
+        pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8'), recover=False)
+    with pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8')) as log:
+        assert log.recovered_bytes == torn and len(log) == 3
+        log.append(bytearray(b"record 3"))
+        assert list(log.replay())[-1] == bytearray(b"record 3")
+    assert os.path.getsize(path) == size + 52 + 16
+
+@pytest.mark.parametrize("flip", [0x01, 0x10, 0x80])
+def test_encrypted_log_corrupted_middle_record(tmp_path, flip):
+    """ Test that a corrupted record in the middle of the log raises instead of cutting the records after it. """
+    path = tmp_path / "audit.log.aes"
+    with pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8'), 1000) as log:
+        for index in range(5):
+            log.append(bytearray(b"x" * 40))
+    content = bytearray(path.read_bytes())
+    record = 52 + 48
+    content[88 + record + 3] ^= flip # Length prefix of the record 1
+    path.write_bytes(content)
+    with pytest.raises((ValueError, pyaescbc.AuthError)):
+        pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8'))
+    assert path.read_bytes() == content # Nothing is cut
+
+    # A complete last record failing its HMAC is not cut either
+    content = bytearray(path.read_bytes())
+    content[88 + record + 3] ^= flip
+    content[-1] ^= 1
+    path.write_bytes(content)
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.EncryptedLog(path, bytearray("password", 'utf-8'))
+    assert path.read_bytes() == content
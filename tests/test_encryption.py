@@ -24,3 +24,25 @@ def test_encrypt_decrypt():
     cleardata = pyaescbc.decrypt(encrypted_bundle, password, iterations, delete_keys=True)
 
     assert cleardata == cleardata_copy
+
+def test_bundle_views():
+    """ Test that the in-place builder and the views match the copying functions. """
+    iv, salt, expected_hmac, cipherdata = pyaescbc.random_iv(), pyaescbc.random_salt(), pyaescbc.random_bytearray(32), pyaescbc.random_bytearray(48)
+    encrypted_bundle, *views = pyaescbc.allocate_encrypted_bundle(48)
+    for view, component in zip(views, (iv, salt, expected_hmac, cipherdata)):
+        view[:] = component
+        view.release()
+    assert encrypted_bundle == pyaescbc.create_encrypted_bundle(iv, salt, expected_hmac, cipherdata)
+
+    views = pyaescbc.extract_cryptography_views(encrypted_bundle)
+    assert [bytes(view) for view in views] == [bytes(component) for component in pyaescbc.extract_cryptography_components(encrypted_bundle)]
+    for view in views:
+        view.release()
+    pyaescbc.delete_bytearray(encrypted_bundle)
+
+def test_decrypt_wrong_password_deletes_bundle():
+    """ Test that the bundle is deleted even if the HMAC is not valid. """
+    encrypted_bundle = pyaescbc.encrypt(bytearray(b"Hello, World!"), bytearray(b"password"), 1000)
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt(encrypted_bundle, bytearray(b"wrong"), 1000, delete_keys=True)
+    assert len(encrypted_bundle) == 0
@@ -0,0 +1,61 @@
+import threading
+import pyaescbc
+import pytest
+
+def test_stage_collector():
+    """ Test that a collector records the stages of an encryption and a failed decryption. """
+    cleardata = bytearray(b"x" * 10_000)
+    with pyaescbc.StageCollector() as collector:
+        encrypted_bundle = pyaescbc.encrypt(cleardata, bytearray("password", 'utf-8'), 1000)
+        with pytest.raises(pyaescbc.AuthError):
+            pyaescbc.decrypt(encrypted_bundle, bytearray("wrong", 'utf-8'), 1000)
+    summary = collector.summary()
+
+    assert summary["derive_key"]["calls"] == 2
+    assert summary["derive_key"]["iterations"] == 2000
+    assert summary["encrypt_AES_CBC_HMAC_into"]["bytes"] == 10_000
+    assert summary["check_hmac"]["errors"] == 1
+    assert summary["delete_bytearray"]["calls"] > 0
+    assert collector.events[-1].stage == "encrypted_bundle_to_cleardata"
+    assert collector.events[-1].error == "AuthError"
+
+def test_stage_collector_context():
+    """ Test that a collector does not record the calls of the other threads. """
+    with pyaescbc.StageCollector() as collector:
+        thread = threading.Thread(target=pyaescbc.derive_key, args=(bytearray(b"password"), pyaescbc.random_salt(), 1000))
+        thread.start()
+        thread.join()
+    assert collector.events == []
+
+def test_hooks_and_counters():
+    """ Test the registered hooks and the process-wide counters. """
+    events = []
+    pyaescbc.register_stage_hook(events.append)
+    pyaescbc.enable_counters()
+    pyaescbc.reset_counters()
+    try:
+        assert not pyaescbc.check_hmac(bytearray(32), bytearray(b"\x01" * 32))
+        pyaescbc.create_hmac(bytearray(32), bytearray(16), bytearray(100))
+        counters = pyaescbc.get_counters()
+
+        # A failed decryption is counted once, not by each of its nested stages
+        encrypted_bundle = pyaescbc.encrypt(bytearray(b"data"), bytearray(b"password"), 1000)
+        pyaescbc.reset_counters()
+        with pytest.raises(pyaescbc.AuthError):
+            pyaescbc.decrypt(encrypted_bundle, bytearray(b"wrong"), 1000)
+    finally:
+        pyaescbc.unregister_stage_hook(events.append)
+        pyaescbc.enable_counters(False)
+    assert [event.stage for event in events[:2]] == ["check_hmac", "create_hmac"]
+    assert counters["auth_failures"] == 1
+    assert counters["stages"]["create_hmac"]["bytes"] == 100
+    assert sum(event.error == "AuthError" for event in events[2:]) > 1
+    assert pyaescbc.get_counters()["auth_failures"] == 1
+
+    # Disabled: nothing is recorded
+    count = len(events)
+    pyaescbc.create_hmac(bytearray(32), bytearray(16), bytearray(100))
+    assert len(events) == count
+    assert "create_hmac" not in pyaescbc.get_counters()["stages"]
+    with pytest.raises(ValueError):
+        pyaescbc.unregister_stage_hook(events.append)
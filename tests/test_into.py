@@ -0,0 +1,114 @@
+import importlib
+import mmap
+import pyaescbc
+import pytest
+from cryptography.hazmat.primitives import padding, ciphers
+
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 4096 + 5])
+def test_into_round_trip(size):
+    """ Test the *_into functions against a reference AES-CBC encryption, with a reused output buffer. """
+    cleardata = bytes(pyaescbc.random_bytearray(size))
+    aes_key, iv = pyaescbc.random_bytearray(32), pyaescbc.random_iv()
+    padder = padding.PKCS7(128).padder()
+    encryptor = ciphers.Cipher(ciphers.algorithms.AES(bytes(aes_key)), ciphers.modes.CBC(bytes(iv))).encryptor()
+    reference = encryptor.update(padder.update(cleardata) + padder.finalize()) + encryptor.finalize()
+
+    out = bytearray(8192)
+    written = pyaescbc.encrypt_AES_CBC_into(cleardata, aes_key, iv, out)
+    assert bytes(out[:written]) == reference
+    assert pyaescbc.encrypt_AES_CBC(memoryview(cleardata), bytes(aes_key), bytes(iv)) == reference
+
+    written = pyaescbc.decrypt_AES_CBC_into(reference, aes_key, iv, out)
+    assert bytes(out[:written]) == cleardata
+    assert pyaescbc.decrypt_AES_CBC(reference, aes_key, iv) == cleardata
+
+def test_buffer_protocol_inputs():
+    """ Test that an mmap bundle can be parsed and authenticated without copying it first. """
+    encrypted_bundle = pyaescbc.encrypt(bytearray(b"Hello, World!"), bytearray(b"password"), 1000)
+    with mmap.mmap(-1, len(encrypted_bundle)) as mapped:
+        mapped[:] = encrypted_bundle
+        iv, salt, expected_hmac, cipherdata = pyaescbc.extract_cryptography_views(mapped)
+        derived_key = pyaescbc.derive_key(b"password", salt, 1000)
+        assert pyaescbc.check_hmac(pyaescbc.create_hmac(derived_key[32:], iv, cipherdata), expected_hmac)
+        assert pyaescbc.decrypt_AES_CBC(cipherdata, derived_key[:32], iv) == b"Hello, World!"
+        for view in (iv, salt, expected_hmac, cipherdata):
+            view.release()
+
+def test_into_errors():
+    with pytest.raises(ValueError):
+        pyaescbc.encrypt_AES_CBC_into(bytes(16), bytes(32), bytes(16), bytearray(16))
+    with pytest.raises(TypeError):
+        pyaescbc.encrypt_AES_CBC_into(bytes(16), bytes(32), bytes(16), bytes(32))
+    with pytest.raises(TypeError):
+        pyaescbc.encrypt_AES_CBC("text", bytes(32), bytes(16))
+
+@pytest.mark.parametrize("size", [0, 31, 100_000])
+def test_fused_engine_matches_separate_functions(size):
+    """ Test that the fused engine produces the same cipherdata and HMAC as encrypt_AES_CBC and create_hmac. """
+    cleardata = pyaescbc.random_bytearray(size)
+    aes_key, hmac_key, iv, authdata = pyaescbc.random_bytearray(32), pyaescbc.random_bytearray(32), pyaescbc.random_iv(), bytearray(b"user=toto")
+    cipherdata = pyaescbc.encrypt_AES_CBC(cleardata, aes_key, iv)
+    expected_hmac = pyaescbc.create_hmac(hmac_key, iv, cipherdata, authdata=authdata)
+
+    out = bytearray(len(cipherdata))
+    assert pyaescbc.encrypt_AES_CBC_HMAC_into(cleardata, aes_key, hmac_key, iv, out, authdata=authdata, chunk_size=4096) == expected_hmac
+    assert out == cipherdata
+
+    size = pyaescbc.decrypt_AES_CBC_HMAC_into(cipherdata, aes_key, hmac_key, iv, expected_hmac, out, authdata=authdata, chunk_size=4096)
+    assert out[:size] == cleardata
+
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_AES_CBC_HMAC_into(cipherdata, aes_key, hmac_key, iv, expected_hmac, out, chunk_size=4096)
+    assert out[:len(cipherdata) - 16] == bytearray(len(cipherdata) - 16) # The unauthenticated data is overwritten
+
+@pytest.mark.parametrize("length", [0, 15, 16, 17, 1_000, 100_003])
+def test_parallel_decrypt_identical(monkeypatch, length):
+    """ Test that the parallel CBC decryption gives the same output as the single pass, over many segments. """
+    monkeypatch.setattr(importlib.import_module("pyaescbc._parallel_cbc"), "MIN_SEGMENT_SIZE", 64)
+    aes_key, hmac_key, iv = pyaescbc.random_bytearray(32), pyaescbc.random_bytearray(32), pyaescbc.random_iv()
+    cleardata = pyaescbc.random_bytearray(length)
+    cipherdata = pyaescbc.encrypt_AES_CBC(cleardata, aes_key, iv)
+    for max_workers in (1, 2, 7):
+        assert pyaescbc.decrypt_AES_CBC(cipherdata, aes_key, iv, max_workers=max_workers) == cleardata
+
+    expected_hmac = pyaescbc.create_hmac(hmac_key, iv, cipherdata)
+    out = bytearray(len(cipherdata))
+    size = pyaescbc.decrypt_AES_CBC_HMAC_into(cipherdata, aes_key, hmac_key, iv, expected_hmac, out, chunk_size=48, max_workers=3)
+    assert out[:size] == cleardata
+
+    cipherdata[0] ^= 1
+    out = bytearray(len(cipherdata))
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_AES_CBC_HMAC_into(cipherdata, aes_key, hmac_key, iv, expected_hmac, out, max_workers=3)
+    assert out == bytearray(len(cipherdata))  # The unauthenticated cleardata is overwritten
+
+def test_parallel_decrypt_bundle(monkeypatch):
+    """ Test the parallel decryption of an existing bundle. """
+    monkeypatch.setattr(importlib.import_module("pyaescbc._parallel_cbc"), "MIN_SEGMENT_SIZE", 1024)
+    cleardata = pyaescbc.random_bytearray(50_000)
+    encrypted_bundle = pyaescbc.encrypt(cleardata.copy(), bytearray("password", 'utf-8'), 1000)
+    assert pyaescbc.decrypt(encrypted_bundle.copy(), bytearray("password", 'utf-8'), 1000, max_workers=4) == cleardata
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt_AES_CBC(bytearray(32), bytearray(32), bytearray(16), max_workers=0)
+
+@pytest.mark.parametrize("length", [50, 50_000])
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_parallel_decrypt_auth_failure(monkeypatch, tmp_path, length, max_workers):
+    """ Test that a wrong password or a tampered bundle raises AuthError with max_workers, the buffers being deleted. """
+    monkeypatch.setattr(importlib.import_module("pyaescbc._parallel_cbc"), "MIN_SEGMENT_SIZE", 1024)
+    encrypted_bundle = pyaescbc.encrypt(pyaescbc.random_bytearray(length), bytearray("password", 'utf-8'), 1000)
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt(encrypted_bundle.copy(), bytearray("wrong", 'utf-8'), 1000, max_workers=max_workers)
+    tampered = encrypted_bundle.copy()
+    tampered[-1] ^= 1
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt(tampered, bytearray("password", 'utf-8'), 1000, max_workers=max_workers)
+    assert len(tampered) == 0 # The bundle is deleted
+
+    (tmp_path / "bundle").write_bytes(encrypted_bundle)
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_path(tmp_path / "bundle", tmp_path / "clear", bytearray("wrong", 'utf-8'), 1000, max_workers=max_workers)
+    (tmp_path / "bundle").write_bytes(encrypted_bundle[:-1] + bytes([encrypted_bundle[-1] ^ 1]))
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_path(tmp_path / "bundle", tmp_path / "clear", bytearray("password", 'utf-8'), 1000, max_workers=max_workers)
+    assert not (tmp_path / "clear").exists()
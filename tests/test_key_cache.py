@@ -0,0 +1,51 @@
+import time
+import pyaescbc
+import pytest
+
+def test_key_cache_skips_derivation(monkeypatch):
+    """ Test that a bundle encrypted with a cache is decrypted without running PBKDF2 again. """
+    key_cache = pyaescbc.KeyCache()
+    cleardata = bytearray("Hello, World!", 'utf-8')
+    encrypted_bundle = pyaescbc.encrypt(cleardata.copy(), bytearray("password", 'utf-8'), 1000, key_cache=key_cache)
+    assert len(key_cache) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("derive_key should not be called")
+    monkeypatch.setattr("pyaescbc.key_cache.derive_key", fail)
+    for _ in range(2):
+        decrypted = pyaescbc.decrypt(encrypted_bundle.copy(), bytearray("password", 'utf-8'), 1000, key_cache=key_cache)
+        assert decrypted == cleardata
+
+    # A wrong password is not a cache hit
+    with pytest.raises(AssertionError):
+        pyaescbc.decrypt(encrypted_bundle.copy(), bytearray("wrong", 'utf-8'), 1000, key_cache=key_cache)
+
+def test_key_cache_eviction():
+    """ Test the size and TTL eviction of the cache. """
+    key_cache = pyaescbc.KeyCache(max_size=2, ttl=0.05)
+    password = bytearray("password", 'utf-8')
+    salts = [pyaescbc.random_salt() for _ in range(3)]
+    for salt in salts:
+        key_cache.put(password, salt, 1000, pyaescbc.random_bytearray(64))
+    assert len(key_cache) == 2
+    assert key_cache.get(password, salts[0], 1000) is None
+    assert key_cache.get(password, salts[2], 1000) is not None
+    time.sleep(0.1)
+    assert len(key_cache) == 0
+
+def test_key_cache_single_flight(monkeypatch):
+    """ Test that concurrent derivations of the same key run PBKDF2 only once. """
+    import importlib
+    import threading
+    key_cache_module = importlib.import_module("pyaescbc.key_cache")
+    calls = []
+    derive_key = key_cache_module.derive_key
+    monkeypatch.setattr(key_cache_module, "derive_key", lambda *args: calls.append(1) or derive_key(*args))
+    key_cache = pyaescbc.KeyCache()
+    salt = pyaescbc.random_salt()
+    threads = [threading.Thread(target=key_cache.derive_key, args=(bytearray(b"password"), salt, 20_000)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
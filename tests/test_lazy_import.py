@@ -0,0 +1,23 @@
+import subprocess
+import sys
+import pyaescbc
+
+def test_import_does_not_load_backend():
+    """ Test that importing the package does not import the cryptography backend nor the submodules. """
+    code = (
+        "import sys, pyaescbc\n"
+        "assert not [name for name in sys.modules if name.startswith('cryptography')]\n"
+        "assert 'pyaescbc.derive_key' not in sys.modules\n"
+        "pyaescbc.generate_pin_iterations(bytearray(b'1234'))\n"
+        "assert not [name for name in sys.modules if name.startswith('cryptography')]\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_lazy_names():
+    """ Test that all the public names and the aliases resolve to the objects of their submodules. """
+    for name in pyaescbc.__all__:
+        assert hasattr(pyaescbc, name)
+    assert pyaescbc.encrypt is pyaescbc.cleardata_to_encrypted_bundle
+    assert pyaescbc.decrypt is pyaescbc.encrypted_bundle_to_cleardata
+    assert callable(pyaescbc.derive_key)  # Not hidden by the submodule pyaescbc.derive_key
+    assert set(pyaescbc.__all__) <= set(dir(pyaescbc))
@@ -0,0 +1,69 @@
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+import pyaescbc
+
+def test_encrypt_many_decrypt_many():
+    """ Test a batch round trip with a process pool, including a tampered bundle reported in place. """
+    cleardatas = [bytearray(f"message {index}", 'utf-8') for index in range(6)]
+    expected = [cleardata.copy() for cleardata in cleardatas]
+    encrypted_bundles = list(pyaescbc.encrypt_many(cleardatas, bytearray("password", 'utf-8'), 1000, max_workers=2))
+    assert all(len(cleardata) == 0 for cleardata in cleardatas) # The data is deleted.
+
+    encrypted_bundles[3][-1] ^= 1
+    results = list(pyaescbc.decrypt_many(encrypted_bundles, bytearray("password", 'utf-8'), 1000, max_workers=2))
+    assert isinstance(results[3], pyaescbc.AuthError)
+    assert [result for index, result in enumerate(results) if index != 3] == [data for index, data in enumerate(expected) if index != 3]
+
+def test_decrypt_many_groups_salts(monkeypatch):
+    """ Test that bundles sharing a salt are derived once. """
+    encrypted_bundle = pyaescbc.encrypt(bytearray(b"same salt"), bytearray("password", 'utf-8'), 1000)
+    calls = []
+    derive_key = pyaescbc.derive_key
+    monkeypatch.setattr(importlib.import_module("pyaescbc.decrypt_many"), "derive_key", lambda *args: calls.append(1) or derive_key(*args))
+    with ThreadPoolExecutor(2) as executor:
+        results = list(pyaescbc.decrypt_many([encrypted_bundle.copy() for _ in range(5)], bytearray("password", 'utf-8'), 1000, executor=executor))
+    assert results == [bytearray(b"same salt")] * 5
+    assert len(calls) == 1
+
+def test_decrypt_many_versioned():
+    """ Test that the iterations are read from the headers of versioned bundles, a legacy bundle failing in place. """
+    encrypted_bundles = [
+        pyaescbc.encrypt(bytearray(b"first"), bytearray("password", 'utf-8'), 1000, versioned=True),
+        pyaescbc.encrypt(bytearray(b"second"), bytearray("password", 'utf-8'), 2000, versioned=True, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256),
+        pyaescbc.encrypt(bytearray(b"legacy"), bytearray("password", 'utf-8'), 1000),
+    ]
+    with ThreadPoolExecutor(2) as executor:
+        results = list(pyaescbc.decrypt_many(encrypted_bundles, bytearray("password", 'utf-8'), executor=executor))
+    assert results[:2] == [bytearray(b"first"), bytearray(b"second")]
+    assert isinstance(results[2], ValueError)
+
+def test_decrypt_many_window(monkeypatch):
+    """ Test that the bundles are read lazily through a bounded window and that each derived key is deleted once used. """
+    encrypted_bundles = [pyaescbc.encrypt(bytearray(f"message {index}", 'utf-8'), bytearray("password", 'utf-8'), 1000) for index in range(10)]
+    encrypted_bundles[4:6] = [pyaescbc.encrypt(bytearray(b"shared"), bytearray("password", 'utf-8'), 1000)] * 2
+    read = []
+    def bundles():
+        for encrypted_bundle in encrypted_bundles:
+            read.append(1)
+            yield encrypted_bundle.copy()
+    derived_keys = []
+    derive_key = pyaescbc.derive_key
+    monkeypatch.setattr(importlib.import_module("pyaescbc.decrypt_many"), "derive_key", lambda *args: derived_keys.append(derive_key(*args)) or derived_keys[-1])
+
+    with ThreadPoolExecutor(2) as executor:
+        results = pyaescbc.decrypt_many(bundles(), bytearray("password", 'utf-8'), 1000, max_workers=2, executor=executor)
+        assert next(results) == bytearray(b"message 0")
+        assert len(read) == 4 # 2 * max_workers bundles in flight
+        assert list(results)[3:5] == [bytearray(b"shared")] * 2
+    assert len(read) == 10
+    assert len(derived_keys) == 9 # The two bundles sharing a salt in the window share a derivation
+    assert all(len(derived_key) == 0 for derived_key in derived_keys)
+
+    # The keys of the window are also deleted when the batch is stopped early
+    derived_keys.clear()
+    with ThreadPoolExecutor(2) as executor:
+        results = pyaescbc.decrypt_many(bundles(), bytearray("password", 'utf-8'), 1000, max_workers=2, executor=executor)
+        next(results)
+        results.close()
+    assert 1 <= len(derived_keys) <= 4 # The derivations not started yet are cancelled
+    assert all(len(derived_key) == 0 for derived_key in derived_keys)
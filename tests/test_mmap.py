@@ -0,0 +1,41 @@
+import os
+import pyaescbc
+import pytest
+
+@pytest.mark.parametrize("length", [0, 15, 16, 100_000])
+@pytest.mark.parametrize("versioned", [False, True])
+def test_encrypt_decrypt_path(tmp_path, length, versioned):
+    """ Test that the mapped paths are compatible with the in-memory API. """
+    cleardata = os.urandom(length)
+    (tmp_path / "clear").write_bytes(cleardata)
+    size = pyaescbc.encrypt_path(tmp_path / "clear", tmp_path / "bundle", bytearray("password", 'utf-8'), 1000, versioned=versioned)
+    assert size == (tmp_path / "bundle").stat().st_size
+
+    encrypted_bundle = bytearray((tmp_path / "bundle").read_bytes())
+    assert pyaescbc.decrypt(encrypted_bundle, bytearray("password", 'utf-8'), 1000) == cleardata
+
+    size = pyaescbc.decrypt_path(tmp_path / "bundle", tmp_path / "decrypted", bytearray("password", 'utf-8'), 1000)
+    assert size == length
+    assert (tmp_path / "decrypted").read_bytes() == cleardata
+
+def test_decrypt_path_wrong_password(tmp_path):
+    """ Test that no output file is left when the HMAC is not valid. """
+    (tmp_path / "bundle").write_bytes(pyaescbc.encrypt(bytearray(b"x" * 1000), bytearray("password", 'utf-8'), 1000))
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_path(tmp_path / "bundle", tmp_path / "decrypted", bytearray("wrong", 'utf-8'), 1000)
+    assert sorted(os.listdir(tmp_path)) == ["bundle"]
+
+def test_open_bundle(tmp_path):
+    """ Test the zero-copy reading of a mapped bundle. """
+    authdata = bytearray("user=toto", 'utf-8')
+    (tmp_path / "bundle").write_bytes(pyaescbc.encrypt(bytearray(b"Hello, World!"), bytearray("password", 'utf-8'), 1000, authdata=authdata.copy(), versioned=True))
+    with pyaescbc.open_bundle(tmp_path / "bundle") as encrypted_bundle:
+        assert pyaescbc.read_bundle_header(encrypted_bundle).iterations == 1000
+        iv, salt, expected_hmac, cipherdata = pyaescbc.extract_cryptography_views(encrypted_bundle)
+        assert cipherdata.readonly
+        for view in (iv, salt, expected_hmac, cipherdata):
+            view.release()
+
+    (tmp_path / "short").write_bytes(b"x" * 79)
+    with pytest.raises(ValueError):
+        pyaescbc.open_bundle(tmp_path / "short")
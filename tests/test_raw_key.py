@@ -0,0 +1,35 @@
+import pyaescbc
+import pytest
+
+def test_raw_key_round_trip():
+    """ Test the encryption and decryption of a bundle with a master key. """
+    master_key = pyaescbc.random_bytearray(32)
+    cleardata = bytearray("Hello, World!", 'utf-8')
+    authdata = bytearray("header", 'utf-8')
+    encrypted_bundle = pyaescbc.cleardata_to_encrypted_bundle_with_key(cleardata.copy(), master_key, authdata=authdata.copy(), delete_keys=False)
+    assert len(encrypted_bundle) == 80 + 16
+    assert len(master_key) == 32  # Not deleted
+    result = pyaescbc.encrypted_bundle_to_cleardata_with_key(encrypted_bundle, master_key.copy(), authdata=authdata.copy())
+    assert result == cleardata
+    assert len(encrypted_bundle) == 0  # Deleted
+
+def test_raw_key_wrong_key():
+    """ Test that a wrong master key or a password-based bundle is rejected. """
+    master_key = pyaescbc.random_bytearray(32)
+    encrypted_bundle = pyaescbc.cleardata_to_encrypted_bundle_with_key(bytearray(b"data"), master_key.copy())
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.encrypted_bundle_to_cleardata_with_key(encrypted_bundle.copy(), pyaescbc.random_bytearray(32))
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt(encrypted_bundle.copy(), master_key.copy(), 1000)
+    with pytest.raises(ValueError):
+        pyaescbc.cleardata_to_encrypted_bundle_with_key(bytearray(b"data"), bytearray(16))
+    with pytest.raises(TypeError):
+        pyaescbc.encrypted_bundle_to_cleardata_with_key(bytes(encrypted_bundle), master_key)
+
+def test_derive_key_hkdf():
+    """ Test that the HKDF derivation depends on the master key and the salt. """
+    master_key, salt = pyaescbc.random_bytearray(32), pyaescbc.random_salt()
+    derived_key = pyaescbc.derive_key_hkdf(master_key, salt)
+    assert len(derived_key) == 64
+    assert derived_key == pyaescbc.derive_key_hkdf(bytes(master_key), memoryview(salt))
+    assert derived_key != pyaescbc.derive_key_hkdf(master_key, pyaescbc.random_salt())
@@ -0,0 +1,20 @@
+import pyaescbc
+import pytest
+
+def test_session_encrypt_decrypt():
+    """ Test that messages of a session can be decrypted by a session reopened with the same salt. """
+    password = bytearray("password", 'utf-8')
+    with pyaescbc.Session(password, 1000) as session:
+        messages = [session.encrypt(bytearray(f"message {index}", 'utf-8')) for index in range(10)]
+        salt = session.salt
+    assert session.closed
+    assert len(password) == 0 # The password is deleted.
+    assert len({bytes(message[8:24]) for message in messages}) == 10 # Fresh IV per message
+
+    with pyaescbc.Session(bytearray("password", 'utf-8'), 1000, salt=salt) as session:
+        for index, message in enumerate(messages):
+            assert session.decrypt(message) == bytearray(f"message {index}", 'utf-8')
+        with pytest.raises(pyaescbc.AuthError):
+            session.decrypt(bytearray(72))
+    with pytest.raises(ValueError):
+        session.encrypt(bytearray(b"closed"))
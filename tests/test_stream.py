@@ -0,0 +1,122 @@
+import io
+import pyaescbc
+import pytest
+
+def test_encrypt_stream_decrypt_bundle():
+    """ Test that a streamed bundle can be decrypted by the in-memory API. """
+    cleardata = bytearray(b"x" * 100_000)
+    input_stream = io.BytesIO(bytes(cleardata))
+    output_stream = io.BytesIO()
+    password = bytearray("password", 'utf-8')
+    size = pyaescbc.encrypt_stream(input_stream, output_stream, password, 1000, chunk_size=4096, delete_keys=True)
+
+    assert size == len(output_stream.getvalue())
+    assert len(password) == 0 # The password is deleted.
+
+    encrypted_bundle = bytearray(output_stream.getvalue())
+    password = bytearray("password", 'utf-8')
+    assert pyaescbc.decrypt(encrypted_bundle, password, 1000) == cleardata
+
+def test_encrypt_decrypt_file(tmp_path):
+    """ Test the encryption and decryption of a file with authdata. """
+    cleardata = bytes(range(256)) * 1000
+    (tmp_path / "clear").write_bytes(cleardata)
+    password = bytearray("password", 'utf-8')
+    authdata = bytearray("user=toto", 'utf-8')
+    pyaescbc.encrypt_file(tmp_path / "clear", tmp_path / "bundle", password, 1000, authdata=authdata, chunk_size=1000)
+
+    password = bytearray("password", 'utf-8')
+    authdata = bytearray("user=toto", 'utf-8')
+    pyaescbc.decrypt_file(tmp_path / "bundle", tmp_path / "decrypted", password, 1000, authdata=authdata, chunk_size=1000)
+    assert (tmp_path / "decrypted").read_bytes() == cleardata
+
+def test_decrypt_stream_wrong_password():
+    """ Test that nothing is written when the HMAC is not valid. """
+    cleardata = bytearray("Hello, World!", 'utf-8')
+    encrypted_bundle = pyaescbc.encrypt(cleardata, bytearray("password", 'utf-8'), 1000)
+    output_stream = io.BytesIO()
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_stream(io.BytesIO(bytes(encrypted_bundle)), output_stream, bytearray("wrong", 'utf-8'), 1000)
+    assert output_stream.getvalue() == b""
+
+def test_verify_stream():
+    """ Test the verification of a bundle stream without decrypting it. """
+    encrypted_bundle = pyaescbc.encrypt(bytearray("Hello, World!", 'utf-8'), bytearray("password", 'utf-8'), 1000)
+    assert pyaescbc.verify_stream(io.BytesIO(bytes(encrypted_bundle)), bytearray("password", 'utf-8'), 1000)
+    assert not pyaescbc.verify_stream(io.BytesIO(bytes(encrypted_bundle)), bytearray("wrong", 'utf-8'), 1000)
+
+@pytest.mark.parametrize("kdf", [pyaescbc.KDF_PBKDF2_SHA256, pyaescbc.KDF_PBKDF2_HKDF_SHA256])
+@pytest.mark.parametrize("length", [0, 15, 10_000])
+def test_stream_versioned_bundle(tmp_path, kdf, length):
+    """ Test that the stream functions read the header of a versioned bundle: iterations, KDF and authentication. """
+    cleardata = bytes(range(256)) * (length // 256) + bytes(length % 256)
+    encrypted_bundle = pyaescbc.encrypt(bytearray(cleardata), bytearray("password", 'utf-8'), 1000, versioned=True, kdf=kdf)
+    output_stream = io.BytesIO()
+    assert pyaescbc.decrypt_stream(io.BytesIO(bytes(encrypted_bundle)), output_stream, bytearray("password", 'utf-8'), chunk_size=1000) == length
+    assert output_stream.getvalue() == cleardata
+    assert pyaescbc.verify_stream(io.BytesIO(bytes(encrypted_bundle)), bytearray("password", 'utf-8'), 1000)
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt_stream(io.BytesIO(bytes(encrypted_bundle)), io.BytesIO(), bytearray("password", 'utf-8'), 2000)
+
+    (tmp_path / "clear").write_bytes(cleardata)
+    pyaescbc.encrypt_path(tmp_path / "clear", tmp_path / "bundle", bytearray("password", 'utf-8'), 1000, versioned=True, kdf=kdf)
+    pyaescbc.decrypt_file(tmp_path / "bundle", tmp_path / "decrypted", bytearray("password", 'utf-8'))
+    assert (tmp_path / "decrypted").read_bytes() == cleardata
+
+    # The header is authenticated, and the length of the bundle must match it
+    tampered = encrypted_bundle.copy()
+    tampered[15] ^= 1 # Iterations
+    with pytest.raises(pyaescbc.AuthError):
+        pyaescbc.decrypt_stream(io.BytesIO(bytes(tampered)), io.BytesIO(), bytearray("password", 'utf-8'))
+    assert not pyaescbc.verify_stream(io.BytesIO(bytes(tampered)), bytearray("password", 'utf-8'))
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt_stream(io.BytesIO(bytes(encrypted_bundle[:-16])), io.BytesIO(), bytearray("password", 'utf-8'))
+    assert not pyaescbc.verify_stream(io.BytesIO(bytes(encrypted_bundle) + bytes(16)), bytearray("password", 'utf-8'))
+
+def test_stream_legacy_bundle_requires_iterations():
+    """ Test that a legacy bundle still needs the iterations in the stream functions. """
+    encrypted_bundle = pyaescbc.encrypt(bytearray(b"data"), bytearray("password", 'utf-8'), 1000)
+    with pytest.raises(ValueError):
+        pyaescbc.decrypt_stream(io.BytesIO(bytes(encrypted_bundle)), io.BytesIO(), bytearray("password", 'utf-8'))
+    with pytest.raises(ValueError):
+        pyaescbc.verify_stream(io.BytesIO(bytes(encrypted_bundle[:50])), bytearray("password", 'utf-8'), 1000)
+
+class _Pipe(io.RawIOBase):
+    """ Readable stream that can not be seeked, like a pipe. """
+    def __init__(self, data: bytes) -> None:
+        self.stream = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self.stream.readinto(buffer)
+
+@pytest.mark.parametrize("kdf", [pyaescbc.KDF_PBKDF2_SHA256, pyaescbc.KDF_PBKDF2_HKDF_SHA256])
+@pytest.mark.parametrize("seekable", [True, False])
+def test_encrypt_stream_versioned(tmp_path, kdf, seekable):
+    """ Test that encrypt_stream writes an authenticated versioned bundle, from a seekable input or by reading the output back. """
+    cleardata = bytes(range(256)) * 40 + b"tail"
+    input_stream = io.BytesIO(cleardata) if seekable else _Pipe(cleardata)
+    output_stream = io.BytesIO()
+    size = pyaescbc.encrypt_stream(input_stream, output_stream, bytearray(b"password"), 1000, chunk_size=1000, versioned=True, kdf=kdf)
+    encrypted_bundle = bytearray(output_stream.getvalue())
+    assert size == len(encrypted_bundle) == 24 + 80 + 16 * (len(cleardata) // 16 + 1)
+    assert pyaescbc.read_bundle_header(encrypted_bundle) == pyaescbc.BundleHeader(1, kdf, 1000, len(encrypted_bundle) - 104)
+    assert pyaescbc.verify_stream(io.BytesIO(bytes(encrypted_bundle)), bytearray(b"password"))
+    assert pyaescbc.decrypt(encrypted_bundle, bytearray(b"password")) == cleardata
+
+    # A pipe needs a readable output to compute the HMAC of the header
+    class WriteOnly(io.BytesIO):
+        def readable(self) -> bool:
+            return False
+    if not seekable:
+        with pytest.raises(ValueError):
+            pyaescbc.encrypt_stream(_Pipe(cleardata), WriteOnly(), bytearray(b"password"), 1000, versioned=True)
+    with pytest.raises(ValueError):
+        pyaescbc.encrypt_stream(io.BytesIO(cleardata), io.BytesIO(), bytearray(b"password"), 1000, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256)
+
+    (tmp_path / "clear").write_bytes(cleardata)
+    pyaescbc.encrypt_file(tmp_path / "clear", tmp_path / "bundle", bytearray(b"password"), 1000, versioned=True, kdf=kdf)
+    pyaescbc.decrypt_file(tmp_path / "bundle", tmp_path / "decrypted", bytearray(b"password"))
+    assert (tmp_path / "decrypted").read_bytes() == cleardata
@@ -0,0 +1,82 @@
+import json
+import os
+import importlib
+import pyaescbc
+import pytest
+from pyaescbc.__main__ import main
+
+def make_tree(root):
+    """ Creates a small tree with nested directories and a symbolic link. """
+    files = {}
+    for relative in ("a.txt", "sub/b.bin", "sub/deeper/c.bin", "empty.txt"):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = os.urandom(len(relative) * 5000) if relative != "empty.txt" else b""
+        path.write_bytes(data)
+        files[relative] = data
+    os.symlink(root / "a.txt", root / "link.txt")
+    return files
+
+def test_tree_round_trip(tmp_path, monkeypatch):
+    """ Test the encryption and decryption of a tree with a single key derivation per run. """
+    files = make_tree(tmp_path / "clear")
+    calls = []
+    key_cache_module = importlib.import_module("pyaescbc.key_cache")
+    derive_key = key_cache_module.derive_key
+    monkeypatch.setattr(key_cache_module, "derive_key", lambda *args: calls.append(1) or derive_key(*args))
+
+    manifest = pyaescbc.encrypt_tree(tmp_path / "clear", tmp_path / "encrypted", bytearray(b"password"), 1000, max_workers=3, manifest_path=tmp_path / "manifest.json")
+    assert (manifest["files"], manifest["failed"], manifest["skipped"]) == (4, 0, 1)
+    assert manifest["bytes"] == sum(len(data) for data in files.values())
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    assert len(calls) == 1
+    # Each file is a regular bundle
+    encrypted = bytearray((tmp_path / "encrypted" / "sub" / "b.bin.aes").read_bytes())
+    assert pyaescbc.decrypt(encrypted, bytearray(b"password"), 1000) == files["sub/b.bin"]
+
+    calls.clear()
+    manifest = pyaescbc.decrypt_tree(tmp_path / "encrypted", tmp_path / "decrypted", bytearray(b"password"), 1000, max_workers=3)
+    assert (manifest["files"], manifest["failed"], manifest["skipped"]) == (4, 0, 0)
+    assert len(calls) == 1
+    for relative, data in files.items():
+        assert (tmp_path / "decrypted" / relative).read_bytes() == data
+
+def test_tree_failures_and_skips(tmp_path):
+    """ Test that tampered files fail without output and existing outputs are skipped. """
+    make_tree(tmp_path / "tree")
+    manifest = pyaescbc.encrypt_tree(tmp_path / "tree", tmp_path / "tree", bytearray(b"password"), 1000)
+    assert manifest["files"] == 4
+    manifest = pyaescbc.encrypt_tree(tmp_path / "tree", tmp_path / "tree", bytearray(b"password"), 1000)
+    reasons = {entry["path"]: entry.get("reason") for entry in manifest["entries"]}
+    assert reasons["a.txt"] == "output already exists"
+    assert reasons["a.txt.aes"] == "already encrypted"
+
+    tampered = tmp_path / "tree" / "sub" / "b.bin.aes"
+    data = bytearray(tampered.read_bytes())
+    data[-1] ^= 1
+    tampered.write_bytes(data)
+    manifest = pyaescbc.decrypt_tree(tmp_path / "tree", tmp_path / "out", bytearray(b"password"), 1000)
+    assert manifest["failed"] == 1
+    assert not (tmp_path / "out" / "sub" / "b.bin").exists()
+    assert [name for name in os.listdir(tmp_path / "out" / "sub") if name.endswith(".tmp")] == []
+
+def test_tree_cli(tmp_path, monkeypatch, capsys):
+    """ Test the encrypt-tree and decrypt-tree commands. """
+    files = make_tree(tmp_path / "clear")
+    monkeypatch.setenv("PYAESCBC_PASSWORD", "password")
+    assert main(["encrypt-tree", "-n", "1000", "-j", "2", str(tmp_path / "clear"), str(tmp_path / "encrypted")]) == 0
+    assert main(["decrypt-tree", "-n", "1000", "--manifest", str(tmp_path / "m.json"), str(tmp_path / "encrypted"), str(tmp_path / "decrypted")]) == 0
+    assert "4 processed, 0 failed" in capsys.readouterr().err
+    assert (tmp_path / "decrypted" / "sub" / "deeper" / "c.bin").read_bytes() == files["sub/deeper/c.bin"]
+
+def test_tree_versioned(tmp_path):
+    """ Test that a versioned tree is decrypted without the iterations. """
+    files = make_tree(tmp_path / "clear")
+    manifest = pyaescbc.encrypt_tree(tmp_path / "clear", tmp_path / "encrypted", bytearray(b"password"), 1000, versioned=True, kdf=pyaescbc.KDF_PBKDF2_HKDF_SHA256)
+    assert manifest["failed"] == 0
+    encrypted = bytearray((tmp_path / "encrypted" / "a.txt.aes").read_bytes())
+    assert pyaescbc.read_bundle_header(encrypted).kdf == pyaescbc.KDF_PBKDF2_HKDF_SHA256
+    manifest = pyaescbc.decrypt_tree(tmp_path / "encrypted", tmp_path / "decrypted", bytearray(b"password"))
+    assert (manifest["files"], manifest["failed"]) == (4, 0)
+    for relative, data in files.items():
+        assert (tmp_path / "decrypted" / relative).read_bytes() == data
@@ -0,0 +1,51 @@
+import pyaescbc
+import pytest
+
+def test_verify_bundle():
+    """ Test the verification of legacy and versioned bundles without modifying them. """
+    for versioned in (False, True):
+        encrypted_bundle = pyaescbc.encrypt(bytearray(b"x" * 1000), bytearray("password", 'utf-8'), 1000, versioned=versioned)
+        copy = bytes(encrypted_bundle)
+        assert pyaescbc.verify_bundle(encrypted_bundle, bytearray("password", 'utf-8'), 1000)
+        assert bytes(encrypted_bundle) == copy  # The bundle is not deleted
+        assert not pyaescbc.verify_bundle(copy, bytearray("wrong", 'utf-8'), 1000)
+
+        encrypted_bundle[-1] ^= 1
+        assert not pyaescbc.verify_bundle(encrypted_bundle, bytearray("password", 'utf-8'), 1000)
+
+    with pytest.raises(ValueError):
+        pyaescbc.verify_bundle(bytearray(80), bytearray("password", 'utf-8'))  # Iterations required for a legacy bundle
+
+def test_verify_bundle_does_not_decrypt():
+    """ Test that AES is not run during the verification. """
+    encrypted_bundle = pyaescbc.encrypt(bytearray(b"x" * 1000), bytearray("password", 'utf-8'), 1000, versioned=True)
+    with pyaescbc.StageCollector() as collector:
+        assert pyaescbc.verify_bundle(encrypted_bundle, bytearray("password", 'utf-8'))
+    stages = set(collector.summary())
+    assert "create_hmac" in stages
+    assert not {"decrypt_AES_CBC", "decrypt_AES_CBC_into", "decrypt_AES_CBC_HMAC_into"} & stages
+
+def test_audit_bundles(tmp_path):
+    """ Test the parallel audit of files and buffers. """
+    password = bytearray("password", 'utf-8')
+    iterations = 1000
+    (tmp_path / "clear").mkdir()
+    for index in range(5):
+        (tmp_path / "clear" / f"file{index}").write_bytes(bytes([index]) * 10_000)
+    pyaescbc.encrypt_tree(tmp_path / "clear", tmp_path / "encrypted", password.copy(), iterations, max_workers=2)
+    paths = sorted((tmp_path / "encrypted").iterdir())
+    tampered = bytearray(paths[2].read_bytes())
+    tampered[100] ^= 1
+    paths[2].write_bytes(tampered)
+
+    bundle = pyaescbc.encrypt(bytearray(b"y" * 100), password.copy(), iterations)
+    report = pyaescbc.audit_bundles(paths + [tmp_path / "missing.aes", bundle], password, iterations, max_workers=3)
+
+    assert report["items"] == 7
+    assert report["passed"] == 5
+    assert report["failed"] == 1
+    assert report["errors"] == 1
+    assert [entry["status"] for entry in report["entries"]] == ["ok", "ok", "failed", "ok", "ok", "error", "ok"]
+    assert report["entries"][-1]["item"] == 6
+    assert len(bundle) > 0  # The buffers are not deleted
+    assert len(password) == 0